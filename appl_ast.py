@@ -1,253 +1,378 @@
+import weakref
 from typing import Union
 
-class TInt:
+class _InternedType:
+    """
+    Base class for hash-consed types.
+
+    Constructing a type returns the one canonical instance for its structure,
+    so structural equality reduces to identity and the hash is computed once.
+    Instances are immutable. The intern table holds them weakly, so a type is
+    dropped once nothing else refers to it.
+    """
+    __slots__ = ("_hash", "__weakref__")
+    _fields = ()
+    _instances = weakref.WeakValueDictionary()
+
+    def __new__(cls, *args):
+        if len(args) != len(cls._fields):
+            raise TypeError(f"{cls.__name__} expects {len(cls._fields)} argument(s), got {len(args)}")
+        key = (cls,) + args
+        instance = _InternedType._instances.get(key)
+        if instance is None:
+            instance = object.__new__(cls)
+            for field, value in zip(cls._fields, args):
+                object.__setattr__(instance, field, value)
+            object.__setattr__(instance, "_hash", hash(key))
+            instance = _InternedType._instances.setdefault(key, instance)
+        return instance
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __eq__(self, other):
+        return self is other
+
+    def __hash__(self):
+        return self._hash
+
+    def __reduce__(self):
+        return (type(self), tuple(getattr(self, field) for field in self._fields))
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+class TInt(_InternedType):
+    __slots__ = ()
     def __repr__(self):
         return "TInt"
-    def __eq__(self, other):
-        return isinstance(other, TInt)
 
-class TString:
+class TString(_InternedType):
+    __slots__ = ()
     def __repr__(self):
         return "TString"
-    def __eq__(self, other):
-        return isinstance(other, TString)
 
-class TBool:
+class TBool(_InternedType):
+    __slots__ = ()
     def __repr__(self):
         return "TBool"
-    def __eq__(self, other):
-        return isinstance(other, TBool)
 
-class TState:
+class TState(_InternedType):
+    __slots__ = ()
     def __repr__(self):
         return "TState"
-    def __eq__(self, other):
-        return isinstance(other, TState)
 
-class TAction:
+class TAction(_InternedType):
+    __slots__ = ()
     def __repr__(self):
         return "TAction"
-    def __eq__(self, other):
-        return isinstance(other, TAction)
 
-class TGoal:
+class TGoal(_InternedType):
+    __slots__ = ()
     def __repr__(self):
         return "TGoal"
-    def __eq__(self, other):
-        return isinstance(other, TGoal)
 
-class TUnit:
+class TUnit(_InternedType):
+    __slots__ = ()
     def __repr__(self):
         return "TUnit"
-    def __eq__(self, other):
-        return isinstance(other, TUnit)
 
-class TList:
-    def __init__(self, t):
-        self.t = t
+class TList(_InternedType):
+    __slots__ = ("t",)
+    _fields = ("t",)
     def __repr__(self):
         return f"TList({self.t})"
-    def __eq__(self, other):
-        return isinstance(other, TList) and self.t == other.t
 
-class TTerm:
+class TTerm(_InternedType):
+    __slots__ = ()
     def __repr__(self):
         return "TTerm"
-    def __eq__(self, other):
-        return isinstance(other, TTerm)
 
-class TProd:
-    def __init__(self, t1, t2):
-        self.t1 = t1
-        self.t2 = t2
+class TProd(_InternedType):
+    __slots__ = ("t1", "t2")
+    _fields = ("t1", "t2")
     def __repr__(self):
         return f"({self.t1} * {self.t2})"
-    def __eq__(self, other):
-        return isinstance(other, TProd) and self.t1 == other.t1 and self.t2 == other.t2
 
-class TSum:
-    def __init__(self, t1, t2):
-        self.t1 = t1
-        self.t2 = t2
+class TSum(_InternedType):
+    __slots__ = ("t1", "t2")
+    _fields = ("t1", "t2")
     def __repr__(self):
         return f"({self.t1} + {self.t2})"
-    def __eq__(self, other):
-        return isinstance(other, TSum) and self.t1 == other.t1 and self.t2 == other.t2
 
-class TFun:
-    def __init__(self, t1, t2):
-        self.t1 = t1
-        self.t2 = t2
+class TFun(_InternedType):
+    __slots__ = ("t1", "t2")
+    _fields = ("t1", "t2")
     def __repr__(self):
         return f"({self.t1} -> {self.t2})"
-    def __eq__(self, other):
-        return isinstance(other, TFun) and self.t1 == other.t1 and self.t2 == other.t2
 
-class TExponential:
-    def __init__(self, t):
-        self.t = t
+class TExponential(_InternedType):
+    __slots__ = ("t",)
+    _fields = ("t",)
     def __repr__(self):
         return f"!{self.t}"
-    def __eq__(self, other):
-        return isinstance(other, TExponential) and self.t == other.t
 
 Type = Union[TInt, TString, TBool, TState, TAction, TGoal, TUnit, TList, TTerm, TProd, TSum, TFun, TExponential]
 
-class Var:
+_set = object.__setattr__
+
+
+class _Node:
+    """
+    Base class for term nodes.
+
+    Nodes are immutable, which is what lets `parser.parse` hand the same
+    cached tree to every caller. Each class lists its fields in `__slots__`,
+    in constructor order, and its constructor sets them with `_set`.
+    """
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} terms are immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} terms are immutable")
+
+    def __reduce__(self):
+        return (type(self), tuple(getattr(self, field) for field in type(self).__slots__))
+
+
+class Var(_Node):
+    __slots__ = ("name",)
     def __init__(self, name):
-        self.name = name
+        _set(self, "name", name)
     def __repr__(self):
         return f"Var({self.name})"
     def __eq__(self, other):
         return isinstance(other, Var) and self.name == other.name
 
-class Int:
+class Int(_Node):
+    __slots__ = ("value",)
     def __init__(self, value):
-        self.value = value
+        _set(self, "value", value)
     def __repr__(self):
         return f"Int({self.value})"
     def __eq__(self, other):
         return isinstance(other, Int) and self.value == other.value
 
-class String:
+class String(_Node):
+    __slots__ = ("value",)
     def __init__(self, value):
-        self.value = value
+        _set(self, "value", value)
     def __repr__(self):
         return f"String({self.value})"
     def __eq__(self, other):
         return isinstance(other, String) and self.value == other.value
 
-class Bool:
+class Bool(_Node):
+    __slots__ = ("value",)
     def __init__(self, value):
-        self.value = value
+        _set(self, "value", value)
     def __repr__(self):
         return f"Bool({self.value})"
     def __eq__(self, other):
         return isinstance(other, Bool) and self.value == other.value
 
-class App:
+class App(_Node):
+    __slots__ = ("f", "arg")
     def __init__(self, f, arg):
-        self.f = f
-        self.arg = arg
+        _set(self, "f", f)
+        _set(self, "arg", arg)
     def __repr__(self):
         return f"App({self.f}, {self.arg})"
     def __eq__(self, other):
         return isinstance(other, App) and self.f == other.f and self.arg == other.arg
 
-class Fun:
+class Fun(_Node):
+    __slots__ = ("var", "type", "body")
     def __init__(self, var, type, body):
-        self.var = var
-        self.type = type
-        self.body = body
+        _set(self, "var", var)
+        _set(self, "type", type)
+        _set(self, "body", body)
     def __repr__(self):
         return f"Fun({self.var}: {self.type}, {self.body})"
     def __eq__(self, other):
         return isinstance(other, Fun) and self.var == other.var and self.type == other.type and self.body == other.body
 
-class Pair:
+class Pair(_Node):
+    __slots__ = ("e1", "e2")
     def __init__(self, e1, e2):
-        self.e1 = e1
-        self.e2 = e2
+        _set(self, "e1", e1)
+        _set(self, "e2", e2)
     def __repr__(self):
         return f"Pair({self.e1}, {self.e2})"
     def __eq__(self, other):
         return isinstance(other, Pair) and self.e1 == other.e1 and self.e2 == other.e2
 
-class Let:
+class Let(_Node):
+    __slots__ = ("var", "e1", "e2")
     def __init__(self, var, e1, e2):
-        self.var = var
-        self.e1 = e1
-        self.e2 = e2
+        _set(self, "var", var)
+        _set(self, "e1", e1)
+        _set(self, "e2", e2)
     def __repr__(self):
         return f"Let({self.var}, {self.e1}, {self.e2})"
     def __eq__(self, other):
         return isinstance(other, Let) and self.var == other.var and self.e1 == other.e1 and self.e2 == other.e2
 
-class LetPair:
+class LetPair(_Node):
+    __slots__ = ("v1", "v2", "e1", "e2")
     def __init__(self, v1, v2, e1, e2):
-        self.v1 = v1
-        self.v2 = v2
-        self.e1 = e1
-        self.e2 = e2
+        _set(self, "v1", v1)
+        _set(self, "v2", v2)
+        _set(self, "e1", e1)
+        _set(self, "e2", e2)
     def __repr__(self):
         return f"LetPair(({self.v1}, {self.v2}), {self.e1}, {self.e2})"
     def __eq__(self, other):
         return isinstance(other, LetPair) and self.v1 == other.v1 and self.v2 == other.v2 and self.e1 == other.e1 and self.e2 == other.e2
 
-class Inl:
+class Inl(_Node):
+    __slots__ = ("e", "t_right")
     def __init__(self, e, t_right):
-        self.e = e
-        self.t_right = t_right
+        _set(self, "e", e)
+        _set(self, "t_right", t_right)
     def __repr__(self):
         return f"Inl({self.e}, {self.t_right})"
     def __eq__(self, other):
         return isinstance(other, Inl) and self.e == other.e and self.t_right == other.t_right
 
-class Inr:
+class Inr(_Node):
+    __slots__ = ("e", "t_left")
     def __init__(self, e, t_left):
-        self.e = e
-        self.t_left = t_left
+        _set(self, "e", e)
+        _set(self, "t_left", t_left)
     def __repr__(self):
         return f"Inr({self.e}, {self.t_left})"
     def __eq__(self, other):
         return isinstance(other, Inr) and self.e == other.e and self.t_left == other.t_left
 
-class Case:
+class Case(_Node):
+    __slots__ = ("e", "v1", "e1", "v2", "e2")
     def __init__(self, e, v1, e1, v2, e2):
-        self.e = e
-        self.v1 = v1
-        self.e1 = e1
-        self.v2 = v2
-        self.e2 = e2
+        _set(self, "e", e)
+        _set(self, "v1", v1)
+        _set(self, "e1", e1)
+        _set(self, "v2", v2)
+        _set(self, "e2", e2)
     def __repr__(self):
         return f"Case({self.e}, inl({self.v1}) => {self.e1}, inr({self.v2}) => {self.e2})"
     def __eq__(self, other):
         return isinstance(other, Case) and self.e == other.e and self.v1 == other.v1 and self.e1 == other.e1 and self.v2 == other.v2 and self.e2 == other.e2
 
-class Promote:
+class Promote(_Node):
+    __slots__ = ("e",)
     def __init__(self, e):
-        self.e = e
+        _set(self, "e", e)
     def __repr__(self):
         return f"Promote({self.e})"
     def __eq__(self, other):
         return isinstance(other, Promote) and self.e == other.e
 
-class LetBang:
+class LetBang(_Node):
+    __slots__ = ("v", "e1", "e2")
     def __init__(self, v, e1, e2):
-        self.v = v
-        self.e1 = e1
-        self.e2 = e2
+        _set(self, "v", v)
+        _set(self, "e1", e1)
+        _set(self, "e2", e2)
     def __repr__(self):
         return f"LetBang(!{self.v}, {self.e1}, {self.e2})"
     def __eq__(self, other):
         return isinstance(other, LetBang) and self.v == other.v and self.e1 == other.e1 and self.e2 == other.e2
 
-class Unit:
+class Unit(_Node):
+    __slots__ = ()
     def __repr__(self):
         return "Unit"
     def __eq__(self, other):
         return isinstance(other, Unit)
 
-class Nil:
+class Nil(_Node):
+    __slots__ = ("type",)
     def __init__(self, type):
-        self.type = type
+        _set(self, "type", type)
     def __repr__(self):
         return f"Nil({self.type})"
     def __eq__(self, other):
         return isinstance(other, Nil) and self.type == other.type
 
-class Cons:
+class Cons(_Node):
+    __slots__ = ("head", "tail")
     def __init__(self, head, tail):
-        self.head = head
-        self.tail = tail
+        _set(self, "head", head)
+        _set(self, "tail", tail)
     def __repr__(self):
-        return f"Cons({self.head}, {self.tail})"
+        # Walk the spine iteratively so long lists do not exhaust the stack.
+        heads = []
+        node = self
+        while isinstance(node, Cons):
+            heads.append(f"Cons({node.head}, ")
+            node = node.tail
+        return "".join(heads) + repr(node) + ")" * len(heads)
     def __eq__(self, other):
-        return isinstance(other, Cons) and self.head == other.head and self.tail == other.tail
-
-class AST:
+        node = self
+        while isinstance(node, Cons):
+            if not isinstance(other, Cons) or node.head != other.head:
+                return False
+            node, other = node.tail, other.tail
+        return node == other
+
+class ListValue(Cons):
+    """
+    A non-empty list value backed by a tuple of Python values.
+
+    Primitives exchange lists with the planner as Python sequences; wrapping
+    them in a ListValue avoids building a Cons chain element by element. A
+    ListValue behaves exactly like the equivalent Cons chain: `head` converts
+    the first item to an APPL value on access and `tail` is an O(1) view of
+    the remaining items (or `Nil` at the end). Use `list_value` to build one,
+    since an empty list must be represented by `Nil`.
+    """
+    __slots__ = ("items", "element_type", "start")
+    def __init__(self, items: tuple, element_type, start: int = 0):
+        _set(self, "items", items)
+        _set(self, "element_type", element_type)
+        _set(self, "start", start)
+    @property
+    def head(self):
+        return _python_to_appl(self.items[self.start])
+    @property
+    def tail(self):
+        return list_value(self.items, self.element_type, self.start + 1)
+    def __len__(self):
+        return len(self.items) - self.start
+    def to_python(self) -> list:
+        """Returns the Python items of the list in order."""
+        return list(self.items[self.start:])
+    def __eq__(self, other):
+        if isinstance(other, ListValue):
+            return self.items[self.start:] == other.items[other.start:] and self.element_type == other.element_type
+        return Cons.__eq__(self, other)
+
+def _python_to_appl(value):
+    if isinstance(value, bool):
+        return Bool(value)
+    if isinstance(value, int):
+        return Int(value)
+    if isinstance(value, str):
+        return String(value)
+    return value
+
+def list_value(items, element_type, start: int = 0):
+    """Wraps a sequence of Python values as an APPL list, or `Nil` if it is empty."""
+    if not isinstance(items, tuple):
+        items = tuple(items)
+    if start >= len(items):
+        return Nil(element_type)
+    return ListValue(items, element_type, start)
+
+class AST(_Node):
+    __slots__ = ("term",)
     def __init__(self, term):
-        self.term = term
+        _set(self, "term", term)
     def __repr__(self):
         return f"AST({self.term})"
     def __eq__(self, other):
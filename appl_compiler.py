@@ -0,0 +1,191 @@
+"""
+A closure-compilation backend for APPL terms.
+
+`compile_term` walks a `Term` once and turns it into a tree of nested Python
+closures. Variable references are resolved to lexical addresses at compile
+time, so running the compiled program performs no `isinstance` dispatch and
+no name lookups for local variables. Free variables fall through to the
+global environment (the primitive prelude plus any user bindings).
+
+At run time a local environment is a linked tuple `(value, parent)` whose
+shape mirrors the compile-time scope, so a variable at depth `d` is reached
+by following `d` parent links.
+"""
+
+from appl_ast import (
+    Term,
+    Var,
+    Int,
+    String,
+    Bool,
+    Unit,
+    Fun,
+    App,
+    Pair,
+    LetPair,
+    Let,
+    Inl,
+    Inr,
+    Case,
+    Promote,
+    LetBang,
+    Nil,
+    Cons,
+    AST,
+    ListValue,
+)
+from interpreter import InterpError, Primitive, _default_env
+
+
+class CompiledClosure:
+    """A function value produced by compiled code."""
+
+    __slots__ = ("fun", "body", "env", "globals")
+
+    def __init__(self, fun, body, env, globals):
+        self.fun = fun
+        self.body = body
+        self.env = env
+        self.globals = globals
+
+    def apply(self, arg):
+        return self.body((arg, self.env), self.globals)
+
+
+class CompiledProgram:
+    """A compiled APPL term that can be run repeatedly."""
+
+    def __init__(self, term: Term, code):
+        self.term = term
+        self.code = code
+
+    def run(self, env: dict = None) -> Term:
+        """Runs the program with the primitive prelude and `env` as globals."""
+        return self.code(None, _default_env(env, compile_and_run))
+
+
+def _resolve(scope, name):
+    """Returns the lexical depth of `name` in `scope`, or None if it is free."""
+    depth = 0
+    while scope is not None:
+        if scope[0] == name:
+            return depth
+        scope = scope[1]
+        depth += 1
+    return None
+
+
+def _compile_var(name, depth):
+    if depth is None:
+        def global_var(env, g):
+            try:
+                return g[name]
+            except KeyError:
+                raise InterpError(f"Variable '{name}' not found in environment.")
+        return global_var
+    if depth == 0:
+        return lambda env, g: env[0]
+    if depth == 1:
+        return lambda env, g: env[1][0]
+    if depth == 2:
+        return lambda env, g: env[1][1][0]
+
+    def deep_var(env, g):
+        for _ in range(depth):
+            env = env[1]
+        return env[0]
+    return deep_var
+
+
+def _compile(term: Term, scope):
+    if isinstance(term, (Int, String, Bool, Unit, Nil, AST, ListValue)):
+        return lambda env, g: term
+    elif isinstance(term, Var):
+        return _compile_var(term.name, _resolve(scope, term.name))
+    elif isinstance(term, Fun):
+        fun = term
+        body = _compile(term.body, (term.var, scope))
+        return lambda env, g: CompiledClosure(fun, body, env, g)
+    elif isinstance(term, App):
+        f = _compile(term.f, scope)
+        a = _compile(term.arg, scope)
+
+        def app(env, g):
+            fun_val = f(env, g)
+            if type(fun_val) is CompiledClosure:
+                return fun_val.body((a(env, g), fun_val.env), fun_val.globals)
+            if isinstance(fun_val, Primitive):
+                # Handle arity 0 functions
+                if fun_val.arity == 0:
+                    return fun_val.fun()
+                return fun_val.apply(a(env, g))
+            raise InterpError("Cannot apply a non-function value.")
+        return app
+    elif isinstance(term, Pair):
+        e1 = _compile(term.e1, scope)
+        e2 = _compile(term.e2, scope)
+        return lambda env, g: Pair(e1(env, g), e2(env, g))
+    elif isinstance(term, LetPair):
+        e1 = _compile(term.e1, scope)
+        e2 = _compile(term.e2, (term.v2, (term.v1, scope)))
+
+        def let_pair(env, g):
+            pair_val = e1(env, g)
+            if not isinstance(pair_val, Pair):
+                raise InterpError("Expected a pair in let pair.")
+            return e2((pair_val.e2, (pair_val.e1, env)), g)
+        return let_pair
+    elif isinstance(term, Let):
+        e1 = _compile(term.e1, scope)
+        e2 = _compile(term.e2, (term.var, scope))
+        return lambda env, g: e2((e1(env, g), env), g)
+    elif isinstance(term, Inl):
+        e = _compile(term.e, scope)
+        t_right = term.t_right
+        return lambda env, g: Inl(e(env, g), t_right)
+    elif isinstance(term, Inr):
+        e = _compile(term.e, scope)
+        t_left = term.t_left
+        return lambda env, g: Inr(e(env, g), t_left)
+    elif isinstance(term, Case):
+        e = _compile(term.e, scope)
+        e1 = _compile(term.e1, (term.v1, scope))
+        e2 = _compile(term.e2, (term.v2, scope))
+
+        def case(env, g):
+            sum_val = e(env, g)
+            if isinstance(sum_val, Inl):
+                return e1((sum_val.e, env), g)
+            if isinstance(sum_val, Inr):
+                return e2((sum_val.e, env), g)
+            raise InterpError("Expected a sum in case.")
+        return case
+    elif isinstance(term, Promote):
+        return _compile(term.e, scope)
+    elif isinstance(term, LetBang):
+        e1 = _compile(term.e1, scope)
+        e2 = _compile(term.e2, (term.v, scope))
+        return lambda env, g: e2((e1(env, g), env), g)
+    elif isinstance(term, Cons):
+        head = _compile(term.head, scope)
+        tail = _compile(term.tail, scope)
+        return lambda env, g: Cons(head(env, g), tail(env, g))
+    else:
+        raise NotImplementedError(f"Compilation not implemented for {type(term).__name__}")
+
+
+def compile_term(term: Term) -> CompiledProgram:
+    """
+    Compiles a term into nested closures with pre-resolved variable slots.
+    """
+    return CompiledProgram(term, _compile(term, None))
+
+
+def compile_and_run(term: Term, env: dict = None) -> Term:
+    """
+    Compiles the given term and runs it in the provided environment.
+
+    This is a drop-in alternative to `interpreter.interpret`; use
+    `compile_term` directly to amortize compilation over repeated runs.
+    """
+    return compile_term(term).run(env)
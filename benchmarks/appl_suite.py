@@ -0,0 +1,216 @@
+"""
+Benchmark suite for the APPL toolchain with regression thresholds.
+
+Generates APPL programs of scaling size (let-chains, nested closures, list
+building and planner primitive calls) and measures `parse`, `type_check` and
+`interpret` on each. For every case the suite reports throughput in
+operations per second and the peak memory allocated by a single operation.
+Results are written as JSON. If a baseline file is given, the run fails when
+any case's throughput falls more than `--threshold` percent below it.
+
+Usage:
+    python -m benchmarks.appl_suite [--sizes N ...] [--output FILE]
+                                    [--baseline FILE] [--threshold PCT]
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+from interpreter import interpret
+from parser import parse, clear_parse_cache
+from type_checker import type_check
+
+
+DEFAULT_SIZES = [10, 50, 200]
+
+
+# --- Program generators ---
+
+def let_chain_source(n: int) -> str:
+    """let x0 = 0 in let x1 = x0 in ... x{n-1}"""
+    lines = ["let x0 = 0 in"]
+    lines += [f"let x{i} = x{i - 1} in" for i in range(1, n)]
+    lines.append(f"x{n - 1}")
+    return "\n".join(lines)
+
+
+def nested_closures_source(n: int) -> str:
+    """A chain of n functions, each calling the previous one."""
+    lines = ["let f0 = fn x : Int => x in"]
+    lines += [f"let f{i} = fn x : Int => f{i - 1} x in" for i in range(1, n)]
+    lines.append(f"f{n - 1} 1")
+    return "\n".join(lines)
+
+
+def list_build_source(n: int) -> str:
+    """A list literal of n strings."""
+    return " :: ".join(f'"item{i}"' for i in range(n)) + " :: Nil(String)"
+
+
+def chain_domain(n: int) -> str:
+    """An AAL domain in which reaching p{n} takes n actions."""
+    lines = [f"fluent p{i}" for i in range(n + 1)]
+    lines += [f"action step{i}" for i in range(n)]
+    lines += [f"step{i} causes p{i + 1} if p{i}" for i in range(n)]
+    return "\n".join(lines) + "\n"
+
+
+def planner_source(domain_path: str, n: int) -> str:
+    return (
+        f'let !domain = load_domain("{domain_path}") in\n'
+        f'let !state = create_state(Cons("p0", Nil(String))) in\n'
+        f'find_plan(Cons("p{n}", Nil(String)))'
+    )
+
+
+# --- Measurement ---
+
+def measure(operation: Callable[[], object], min_time: float) -> Dict[str, float]:
+    """Runs `operation` for at least `min_time` seconds and once under tracemalloc."""
+    operation()  # Warm up.
+
+    iterations = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < min_time:
+        operation()
+        iterations += 1
+        elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    try:
+        operation()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "ops_per_sec": iterations / elapsed,
+        "mean_s": elapsed / iterations,
+        "iterations": iterations,
+        "peak_bytes": peak,
+    }
+
+
+def _cold_parse(source: str) -> Callable[[], object]:
+    def operation():
+        clear_parse_cache()
+        return parse(source)
+    return operation
+
+
+def build_cases(sizes: List[int], workdir: str) -> Dict[str, Callable[[], object]]:
+    """Returns the benchmark operations keyed by 'operation/program/size'."""
+    cases = {}
+    for n in sizes:
+        for name, source in (
+            ("let_chain", let_chain_source(n)),
+            ("nested_closures", nested_closures_source(n)),
+            ("list_build", list_build_source(n)),
+        ):
+            term = parse(source)
+            cases[f"parse/{name}/{n}"] = _cold_parse(source)
+            cases[f"type_check/{name}/{n}"] = lambda term=term: type_check(term)
+            cases[f"interpret/{name}/{n}"] = lambda term=term: interpret(term)
+
+        domain_path = os.path.join(workdir, f"chain_{n}.aal")
+        with open(domain_path, "w") as f:
+            f.write(chain_domain(n))
+        term = parse(planner_source(domain_path, n))
+        cases[f"interpret/planner/{n}"] = lambda term=term: interpret(term)
+    return cases
+
+
+def run_suite(sizes: List[int] = None, min_time: float = 0.2, only: Optional[str] = None) -> dict:
+    """Runs every case whose key contains `only` and returns the JSON-ready report."""
+    sizes = sizes or DEFAULT_SIZES
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for key, operation in build_cases(sizes, workdir).items():
+            if only and only not in key:
+                continue
+            results[key] = measure(operation, min_time)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "min_time": min_time,
+        },
+        "results": results,
+    }
+
+
+def find_regressions(current: dict, baseline: dict, threshold: float) -> List[dict]:
+    """
+    Compares two reports and returns the cases whose throughput dropped by
+    more than `threshold` percent. Cases missing from either report are ignored.
+    """
+    regressions = []
+    for key, base in baseline.get("results", {}).items():
+        result = current.get("results", {}).get(key)
+        if result is None or base["ops_per_sec"] <= 0:
+            continue
+        change = (result["ops_per_sec"] - base["ops_per_sec"]) / base["ops_per_sec"] * 100
+        if change < -threshold:
+            regressions.append({
+                "case": key,
+                "baseline_ops_per_sec": base["ops_per_sec"],
+                "ops_per_sec": result["ops_per_sec"],
+                "change_pct": change,
+            })
+    return regressions
+
+
+def format_report(report: dict) -> str:
+    lines = [f"{'case':<32} {'ops/sec':>12} {'mean':>11} {'peak mem':>11}"]
+    for key, r in report["results"].items():
+        lines.append(
+            f"{key:<32} {r['ops_per_sec']:>12.1f} {r['mean_s'] * 1000:>9.3f}ms "
+            f"{r['peak_bytes'] / 1024:>9.1f}KB"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--min-time", type=float, default=0.2,
+                        help="Minimum seconds to run each case.")
+    parser.add_argument("--only", help="Only run cases whose name contains this string.")
+    parser.add_argument("--output", help="Write the JSON report to this file.")
+    parser.add_argument("--baseline", help="JSON report to compare against.")
+    parser.add_argument("--threshold", type=float, default=10.0,
+                        help="Allowed throughput drop against the baseline, in percent.")
+    args = parser.parse_args(argv)
+
+    report = run_suite(args.sizes, args.min_time, args.only)
+    print(format_report(report))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = find_regressions(report, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} case(s) regressed by more than {args.threshold}%:")
+            for r in regressions:
+                print(f"  {r['case']}: {r['baseline_ops_per_sec']:.1f} -> {r['ops_per_sec']:.1f} ops/sec ({r['change_pct']:+.1f}%)")
+            return 1
+        print(f"\nNo regressions beyond {args.threshold}% against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+"""
+Compares the closure-compilation backend against the tree-walking interpreter.
+
+The workload is a family of list-building programs: a helper function that
+prepends two copies of its argument is applied recursively to build a list
+of `2 * depth` cells, and each program is evaluated many times, as the
+`eval` primitive and repeated `run.py` invocations do.
+
+Usage:
+    python -m benchmarks.bench_compiler [--depth N] [--repeat N]
+"""
+
+import argparse
+import time
+
+from appl_ast import Var, String, Fun, App, Let, Cons, Nil, TString, TList
+from appl_compiler import compile_term
+from interpreter import interpret
+
+
+def build_list_program(depth: int):
+    """
+    let dup = fn x: String => fn xs: List(String) => Cons(x, Cons(x, xs)) in
+    dup "0" (dup "1" (... (dup "n" Nil(String))))
+    """
+    dup = Fun(
+        "x", TString(),
+        Fun("xs", TList(TString()), Cons(Var("x"), Cons(Var("x"), Var("xs")))),
+    )
+    body = Nil(TString())
+    for i in reversed(range(depth)):
+        body = App(App(Var("dup"), String(str(i))), body)
+    return Let("dup", dup, body)
+
+
+def _time(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return time.perf_counter() - start
+
+
+def run_benchmark(depth: int, repeat: int) -> dict:
+    program = build_list_program(depth)
+    compiled = compile_term(program)
+    assert compiled.run() == interpret(program)
+
+    tree_walk = _time(lambda: interpret(program), repeat)
+    compiled_run = _time(compiled.run, repeat)
+    compile_once = _time(lambda: compile_term(program).run(), repeat)
+    return {
+        "depth": depth,
+        "repeat": repeat,
+        "tree_walk_s": tree_walk,
+        "compiled_s": compiled_run,
+        "compile_and_run_s": compile_once,
+        "speedup": tree_walk / compiled_run,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--depth", type=int, nargs="+", default=[10, 50, 150])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'depth':>6} {'tree-walk':>10} {'compiled':>10} {'compile+run':>12} {'speedup':>8}")
+    for depth in args.depth:
+        r = run_benchmark(depth, args.repeat)
+        print(
+            f"{r['depth']:>6} {r['tree_walk_s']:>9.3f}s {r['compiled_s']:>9.3f}s "
+            f"{r['compile_and_run_s']:>11.3f}s {r['speedup']:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""
+Compares the planner's heuristics by the number of nodes A* generates.
+
+Each benchmark domain keeps fluents alive with frame laws (`a causes f if f`)
+so that states accumulate and the reachable state space grows exponentially
+with the number of distractor actions:
+
+- `ladder`: reach `p{n}` by climbing `n` steps while `k` toggle actions
+  switch irrelevant fluents on. The goal-count heuristic is 1 in every
+  non-goal state, so A* degenerates to breadth-first search.
+- `chains`: finish `m` independent chains of length `n`. Goal count sees how
+  many chains are finished but not how far along the others are.
+
+Nodes are counted as heuristic evaluations, one per node pushed on the open
+list. Every plan is replayed with `apply_action` to check that it is valid.
+
+With `--directions`, forward A* is instead compared with backward,
+bidirectional and automatically chosen search directions, counting the nodes
+each generates (states forward, regressed subgoals backward).
+
+With `--frontiers`, forward A* and bidirectional search are timed on
+`chains` problems of growing width, whose frontiers grow exponentially.
+Bidirectional search generates fewer nodes, and its total time shows
+whether finding where the two searches meet keeps up as the frontiers grow.
+
+Usage:
+    python -m benchmarks.bench_planner [--size N] [--distractors K] [--directions | --frontiers]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from typing import Dict, List
+
+import planning
+from tooling.aal.heuristics import HEURISTICS, get_heuristic
+from tooling.aal.parser import parse_aal
+
+
+def _with_frame_laws(fluents: List[str], actions: List[str], laws: List[str]) -> str:
+    lines = [f"fluent {f}" for f in fluents]
+    lines += [f"action {a}" for a in actions]
+    lines += laws
+    lines += [f"{a} causes {f} if {f}" for a in actions for f in fluents]
+    return "\n".join(lines) + "\n"
+
+
+def ladder_domain(n: int, k: int) -> str:
+    """Climb from p0 to p{n}; k toggles add irrelevant fluents."""
+    fluents = [f"p{i}" for i in range(n + 1)] + [f"d{j}" for j in range(k)]
+    actions = [f"step{i}" for i in range(n)] + [f"toggle{j}" for j in range(k)]
+    laws = [f"step{i} causes p{i + 1} if p{i}" for i in range(n)]
+    laws += [f"toggle{j} causes d{j}" for j in range(k)]
+    return _with_frame_laws(fluents, actions, laws)
+
+
+def chains_domain(m: int, n: int) -> str:
+    """m independent chains c{i}_0 -> ... -> c{i}_{n}."""
+    fluents = [f"c{i}_{j}" for i in range(m) for j in range(n + 1)]
+    actions = [f"advance{i}_{j}" for i in range(m) for j in range(n)]
+    laws = [
+        f"advance{i}_{j} causes c{i}_{j + 1} if c{i}_{j}"
+        for i in range(m) for j in range(n)
+    ]
+    return _with_frame_laws(fluents, actions, laws)
+
+
+def problems(size: int, distractors: int) -> Dict[str, tuple]:
+    """name -> (domain source, initial fluents, goal fluents)"""
+    chains = max(2, size // 3)
+    return {
+        f"ladder/{size}x{distractors}": (
+            ladder_domain(size, distractors), ["p0"], [f"p{size}"]
+        ),
+        f"chains/{chains}x{size}": (
+            chains_domain(chains, size),
+            [f"c{i}_0" for i in range(chains)],
+            [f"c{i}_{size}" for i in range(chains)],
+        ),
+    }
+
+
+def _replay(initial: List[str], plan: List[str], goal: List[str]) -> bool:
+    planning.create_state(initial)
+    for action in plan:
+        planning.apply_action(action)
+    return planning.is_goal(goal)
+
+
+def _load(workdir: str, source: str) -> None:
+    path = os.path.join(workdir, "domain.aal")
+    with open(path, "w") as f:
+        f.write(source)
+    planning.load_domain(path)
+
+
+def run_benchmark(size: int, distractors: int) -> List[dict]:
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for name, (source, initial, goal) in problems(size, distractors).items():
+            _load(workdir, source)
+
+            for heuristic_name in HEURISTICS:
+                heuristic = get_heuristic(heuristic_name, planning.compiled_domain)
+                evaluations = 0
+
+                def counted(state, goal_mask):
+                    nonlocal evaluations
+                    evaluations += 1
+                    return heuristic(state, goal_mask)
+
+                planning.create_state(initial)
+                start = time.perf_counter()
+                plan = planning.find_plan(goal, heuristic=counted)
+                elapsed = time.perf_counter() - start
+                if plan is None or not _replay(initial, plan, goal):
+                    raise AssertionError(f"{heuristic_name} returned an invalid plan for {name}")
+                results.append({
+                    "problem": name,
+                    "heuristic": heuristic_name,
+                    "plan_length": len(plan),
+                    "nodes": evaluations,
+                    "time_s": elapsed,
+                })
+    return results
+
+
+def run_direction_benchmark(size: int, distractors: int) -> List[dict]:
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for name, (source, initial, goal) in problems(size, distractors).items():
+            _load(workdir, source)
+            for heuristic_name in ("goal_count", "h_add"):
+                for direction in planning.SEARCH_DIRECTIONS:
+                    planning.create_state(initial)
+                    start = time.perf_counter()
+                    result = planning.search(
+                        goal, heuristic=heuristic_name, direction=direction, use_cache=False
+                    )
+                    elapsed = time.perf_counter() - start
+                    if not result.complete or not _replay(initial, result.plan, goal):
+                        raise AssertionError(
+                            f"{direction} search with {heuristic_name} returned an invalid plan for {name}"
+                        )
+                    results.append({
+                        "problem": name,
+                        "heuristic": heuristic_name,
+                        "direction": direction if direction != "auto" else f"auto:{result.direction}",
+                        "plan_length": len(result.plan),
+                        "nodes": result.nodes,
+                        "time_s": elapsed,
+                    })
+    return results
+
+
+def run_frontier_benchmark(widths: List[int], length: int = 4) -> List[dict]:
+    results = []
+    for width in widths:
+        name = f"chains/{width}x{length}"
+        session = planning.PlanningSession(parse_aal(chains_domain(width, length)))
+        initial = [f"c{i}_0" for i in range(width)]
+        goal = [f"c{i}_{length}" for i in range(width)]
+        for direction in ("forward", "bidirectional"):
+            session.create_state(initial)
+            start = time.perf_counter()
+            result = session.search(goal, direction=direction, use_cache=False, stats=True)
+            elapsed = time.perf_counter() - start
+            if not result.complete:
+                raise AssertionError(f"{direction} search found no plan for {name}")
+            results.append({
+                "problem": name,
+                "direction": direction,
+                "plan_length": len(result.plan),
+                "nodes": result.nodes,
+                "peak_open": result.stats.peak_open,
+                "time_s": elapsed,
+                "us_per_node": elapsed / result.nodes * 1e6,
+            })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=int, default=9)
+    parser.add_argument("--distractors", type=int, default=8)
+    modes = parser.add_mutually_exclusive_group()
+    modes.add_argument("--directions", action="store_true", help="compare search directions")
+    modes.add_argument("--frontiers", action="store_true", help="time bidirectional search on growing frontiers")
+    args = parser.parse_args()
+
+    if args.frontiers:
+        print(f"{'problem':<16} {'direction':<14} {'plan':>5} {'nodes':>8} {'peak open':>10} {'time':>9} {'us/node':>8}")
+        for r in run_frontier_benchmark(list(range(3, 7))):
+            print(
+                f"{r['problem']:<16} {r['direction']:<14} {r['plan_length']:>5} {r['nodes']:>8} "
+                f"{r['peak_open']:>10} {r['time_s']:>8.3f}s {r['us_per_node']:>8.1f}"
+            )
+        return
+
+    if args.directions:
+        print(f"{'problem':<16} {'heuristic':<11} {'direction':<19} {'plan':>5} {'nodes':>8} {'time':>9}")
+        for r in run_direction_benchmark(args.size, args.distractors):
+            print(
+                f"{r['problem']:<16} {r['heuristic']:<11} {r['direction']:<19} {r['plan_length']:>5} "
+                f"{r['nodes']:>8} {r['time_s']:>8.3f}s"
+            )
+        return
+
+    print(f"{'problem':<16} {'heuristic':<11} {'plan':>5} {'nodes':>8} {'time':>9}")
+    for r in run_benchmark(args.size, args.distractors):
+        print(
+            f"{r['problem']:<16} {r['heuristic']:<11} {r['plan_length']:>5} "
+            f"{r['nodes']:>8} {r['time_s']:>8.3f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Compares exhaustive and focused proof search on a corpus of ILL sequents.
+
+The corpus mixes provable and unprovable sequents:
+
+- small sequents exercising each connective, including the additives that
+  only the focused strategy has rules for;
+- parametric families of size `n`: chains of `n` linear implications, the
+  same chains under `!` (where exhaustive search can derelict, contract
+  and weaken every `!` formula at every step), towers of `n` tensors, and a
+  `!` function applied to `n` arguments;
+- sequents with no proof, which both strategies must search up to the
+  depth limit.
+
+Nodes are the sequents each strategy applies rules to (`stats()["nodes"]`),
+summed over the iterative-deepening passes. Every proof is checked to
+conclude its goal.
+
+Usage:
+    python -m benchmarks.bench_synthesizer [--size N] [--max-depth D]
+"""
+
+import argparse
+import functools
+import time
+from typing import Dict, List
+
+from logic_system.src.formulas import Prop, Tensor, LinImplies, OfCourse, With, Plus
+from logic_system.src.ill import ILLSequent
+from logic_system.src.synthesizer import STRATEGIES, Synthesizer
+
+
+def _atoms(n: int) -> List[Prop]:
+    return [Prop(f"A{i}") for i in range(n)]
+
+
+def corpus(size: int) -> Dict[str, ILLSequent]:
+    A, B, C = Prop("A"), Prop("B"), Prop("C")
+    sequents = {
+        "identity": ILLSequent([A], A),
+        "tensor swap": ILLSequent([Tensor(A, B)], Tensor(B, A)),
+        "curry": ILLSequent([LinImplies(Tensor(A, B), C)], LinImplies(A, LinImplies(B, C))),
+        "bang twice": ILLSequent([OfCourse(A), LinImplies(A, LinImplies(A, B))], B),
+        "promotion": ILLSequent([OfCourse(A), OfCourse(B)], OfCourse(Tensor(A, B))),
+        "with left": ILLSequent([With(A, B)], B),
+        "plus right": ILLSequent([A], Plus(B, A)),
+        "no contraction": ILLSequent([A], Tensor(A, A)),
+        "no weakening": ILLSequent([A, B], A),
+        "no derivation": ILLSequent([OfCourse(A), OfCourse(LinImplies(A, A))], B),
+    }
+
+    atoms = _atoms(size + 1)
+    implications = [LinImplies(atoms[i], atoms[i + 1]) for i in range(size)]
+    sequents[f"chain {size}"] = ILLSequent([atoms[0]] + implications, atoms[size])
+    sequents[f"bang chain {size}"] = ILLSequent(
+        [atoms[0]] + [OfCourse(f) for f in implications], atoms[size]
+    )
+    sequents[f"tower {size}"] = ILLSequent(
+        list(reversed(atoms[:size])), functools.reduce(Tensor, atoms[:size])
+    )
+    sequents[f"bang apply {size}"] = ILLSequent(
+        [OfCourse(LinImplies(A, B))] + [A] * size, functools.reduce(Tensor, [B] * size)
+    )
+    return sequents
+
+
+def run_benchmark(size: int, max_depth: int) -> List[dict]:
+    results = []
+    for name, goal in corpus(size).items():
+        for strategy in STRATEGIES:
+            synthesizer = Synthesizer(strategy=strategy)
+            start = time.perf_counter()
+            try:
+                proof = synthesizer.synthesize(goal, max_depth=max_depth)
+            except ValueError:
+                proof = None
+            elapsed = time.perf_counter() - start
+            if proof is not None and proof.conclusion != goal:
+                raise AssertionError(f"{strategy} search proved the wrong sequent for {name}")
+            results.append({
+                "sequent": name,
+                "strategy": strategy,
+                "proved": proof is not None,
+                "nodes": synthesizer.stats()["nodes"],
+                "time_s": elapsed,
+            })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=int, default=4)
+    parser.add_argument("--max-depth", type=int, default=8)
+    args = parser.parse_args()
+
+    print(f"{'sequent':<16} {'strategy':<11} {'proved':>6} {'nodes':>8} {'time':>9}")
+    for r in run_benchmark(args.size, args.max_depth):
+        print(
+            f"{r['sequent']:<16} {r['strategy']:<11} {str(r['proved']):>6} "
+            f"{r['nodes']:>8} {r['time_s']:>8.3f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Measures incremental type checking against full re-checking after small edits.
+
+The workload is a balanced tree of pairs whose leaves are `let v = i in v`
+bindings. Each edit replaces one leaf by rebuilding only the path from the
+root, which is how an agent edits a large program without copying it.
+
+Usage:
+    python -m benchmarks.bench_type_checker [--nodes N] [--edits N]
+"""
+
+import argparse
+import random
+import time
+
+from appl_ast import Int, String, Var, Pair, Let
+from type_checker import type_check, IncrementalTypeChecker
+
+
+def build_tree(leaves: int):
+    """Builds a balanced pair tree over `leaves` let-bindings (about 4 nodes per leaf)."""
+    level = [Let(f"v{i}", Int(i), Var(f"v{i}")) for i in range(leaves)]
+    while len(level) > 1:
+        paired = [Pair(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            paired.append(level[-1])
+        level = paired
+    return level[0]
+
+
+def count_nodes(term) -> int:
+    if isinstance(term, Pair):
+        return 1 + count_nodes(term.e1) + count_nodes(term.e2)
+    if isinstance(term, Let):
+        return 1 + count_nodes(term.e1) + count_nodes(term.e2)
+    return 1
+
+
+def edit_random_leaf(term, rng: random.Random):
+    """Returns a copy of `term` with one leaf replaced, sharing all other nodes."""
+    if not isinstance(term, Pair):
+        return String(f"edit{rng.random()}")
+    if rng.random() < 0.5:
+        return Pair(edit_random_leaf(term.e1, rng), term.e2)
+    return Pair(term.e1, edit_random_leaf(term.e2, rng))
+
+
+def run_benchmark(nodes: int, edits: int, seed: int = 0) -> dict:
+    rng = random.Random(seed)
+    term = build_tree(max(1, nodes // 4))
+    versions = [term]
+    for _ in range(edits):
+        versions.append(edit_random_leaf(versions[-1], rng))
+
+    start = time.perf_counter()
+    for version in versions[1:]:
+        type_check(version)
+    full = time.perf_counter() - start
+
+    checker = IncrementalTypeChecker()
+    start = time.perf_counter()
+    checker.check(term)
+    initial = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for old, new in zip(versions, versions[1:]):
+        checker.check_incremental(old, new)
+    incremental = time.perf_counter() - start
+
+    return {
+        "nodes": count_nodes(term),
+        "edits": edits,
+        "full_recheck_s": full,
+        "initial_check_s": initial,
+        "incremental_s": incremental,
+        "speedup": full / incremental,
+        "cache_hits": checker.hits,
+        "cache_misses": checker.misses,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--nodes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--edits", type=int, default=100)
+    args = parser.parse_args()
+
+    print(f"{'nodes':>7} {'full':>9} {'initial':>9} {'incremental':>12} {'speedup':>9}")
+    for nodes in args.nodes:
+        r = run_benchmark(nodes, args.edits)
+        print(
+            f"{r['nodes']:>7} {r['full_recheck_s']:>8.3f}s {r['initial_check_s']:>8.3f}s "
+            f"{r['incremental_s']:>11.4f}s {r['speedup']:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
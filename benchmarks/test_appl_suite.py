@@ -0,0 +1,65 @@
+import json
+import os
+import tempfile
+import unittest
+
+from appl_ast import Int, TList, TString
+from interpreter import interpret, _appl_list_to_python_list
+from parser import parse
+from planning import configure_domain_cache
+from type_checker import type_check
+from benchmarks.appl_suite import (
+    let_chain_source,
+    nested_closures_source,
+    list_build_source,
+    chain_domain,
+    planner_source,
+    find_regressions,
+    main,
+)
+
+
+class TestAPPLSuite(unittest.TestCase):
+    def setUp(self):
+        configure_domain_cache(enabled=False)
+
+    def test_generated_programs_are_valid(self):
+        for source in (let_chain_source(5), nested_closures_source(5)):
+            term = parse(source)
+            type_check(term)
+            self.assertEqual(interpret(term), Int(0) if source.startswith("let x0") else Int(1))
+        term = parse(list_build_source(3))
+        self.assertEqual(type_check(term), TList(TString()))
+        self.assertEqual(_appl_list_to_python_list(interpret(term)), ["item0", "item1", "item2"])
+
+    def test_planner_program(self):
+        with tempfile.TemporaryDirectory() as workdir:
+            path = os.path.join(workdir, "chain.aal")
+            with open(path, "w") as f:
+                f.write(chain_domain(3))
+            plan = interpret(parse(planner_source(path, 3)))
+            self.assertEqual(_appl_list_to_python_list(plan), ["step0", "step1", "step2"])
+
+    def test_find_regressions(self):
+        baseline = {"results": {"a": {"ops_per_sec": 100.0}, "b": {"ops_per_sec": 100.0}, "gone": {"ops_per_sec": 1.0}}}
+        current = {"results": {"a": {"ops_per_sec": 95.0}, "b": {"ops_per_sec": 80.0}}}
+        regressions = find_regressions(current, baseline, threshold=10)
+        self.assertEqual([r["case"] for r in regressions], ["b"])
+        self.assertAlmostEqual(regressions[0]["change_pct"], -20.0)
+        self.assertEqual(find_regressions(current, baseline, threshold=25), [])
+
+    def test_main_fails_on_regression(self):
+        with tempfile.TemporaryDirectory() as workdir:
+            baseline_path = os.path.join(workdir, "baseline.json")
+            output_path = os.path.join(workdir, "out.json")
+            with open(baseline_path, "w") as f:
+                json.dump({"results": {"interpret/let_chain/2": {"ops_per_sec": 1e12}}}, f)
+            args = ["--sizes", "2", "--min-time", "0.001", "--only", "interpret/let_chain",
+                    "--output", output_path, "--baseline", baseline_path]
+            self.assertEqual(main(args), 1)
+            with open(output_path) as f:
+                self.assertIn("interpret/let_chain/2", json.load(f)["results"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,3 +1,5 @@
+from types import MappingProxyType
+
 from appl_ast import (
     Term,
     Var,
@@ -18,6 +20,9 @@ from appl_ast import (
     Nil,
     Cons,
     AST,
+    TString,
+    ListValue,
+    list_value,
 )
 from planning import (
     load_domain,
@@ -26,6 +31,8 @@ from planning import (
     is_goal,
     get_current_state,
     find_plan,
+    parse_search_options,
+    last_search_stats,
 )
 from parser import parse
 
@@ -34,6 +41,45 @@ class InterpError(Exception):
     pass
 
 
+class Environment:
+    """
+    A persistent environment made of linked frames.
+
+    Each frame either binds a single name or wraps a base dict of bindings.
+    Extending an environment is O(1) and shares structure with its parent,
+    so closures capture their environment without copying it.
+    """
+
+    __slots__ = ("name", "value", "bindings", "parent")
+
+    def __init__(self, bindings=None, parent=None, name=None, value=None):
+        self.bindings = bindings
+        self.parent = parent
+        self.name = name
+        self.value = value
+
+    def extend(self, name, value):
+        return Environment(parent=self, name=name, value=value)
+
+    def lookup(self, name):
+        env = self
+        while env is not None:
+            if env.bindings is None:
+                if env.name == name:
+                    return env.value
+            elif name in env.bindings:
+                return env.bindings[name]
+            env = env.parent
+        raise InterpError(f"Variable '{name}' not found in environment.")
+
+    def __contains__(self, name):
+        try:
+            self.lookup(name)
+        except InterpError:
+            return False
+        return True
+
+
 class Closure:
     def __init__(self, fun, env):
         self.fun = fun
@@ -55,122 +101,127 @@ def _appl_to_python(val):
 def _appl_list_to_python_list(appl_list):
     py_list = []
     while isinstance(appl_list, Cons):
+        if isinstance(appl_list, ListValue):
+            # Array-backed lists already hold Python values.
+            py_list.extend(appl_list.items[appl_list.start:])
+            break
         py_list.append(_appl_to_python(appl_list.head))
         appl_list = appl_list.tail
     return py_list
 
-from appl_ast import TString
 def _python_list_to_appl_list(py_list: list) -> Term:
-    """Converts a Python list of strings to an APPL list of strings."""
-    result = Nil(TString())
-    for item in reversed(py_list):
-        result = Cons(String(item), result)
-    return result
+    """Wraps a Python list of strings as an APPL list of strings without copying it cell by cell."""
+    return list_value(py_list, TString())
 
 
 class Primitive:
-    def __init__(self, fun, arity):
+    """
+    An immutable, curried primitive function value.
+
+    Applying a primitive to fewer than `arity` arguments returns a new partial
+    application, so primitives and their partial applications can be shared
+    and reused freely.
+    """
+
+    __slots__ = ("fun", "arity", "args")
+
+    def __init__(self, fun, arity, args=()):
         self.fun = fun
         self.arity = arity
-        self.args = []
+        self.args = args
 
     def apply(self, arg):
-        self.args.append(_appl_to_python(arg))
-        if len(self.args) == self.arity:
-            # Special handling for arity 0
-            if self.arity == 0:
-                return self.fun()
-            return self.fun(*self.args)
-        return self
+        # Special handling for arity 0
+        if self.arity == 0:
+            return self.fun()
+        args = self.args + (_appl_to_python(arg),)
+        if len(args) == self.arity:
+            return self.fun(*args)
+        return Primitive(self.fun, self.arity, args)
+
+
+# Continuation tags for `Interpreter.interpret_iterative`.
+_K_APP_FUN = "app-fun"
+_K_APP_ARG = "app-arg"
+_K_PAIR_FIRST = "pair-first"
+_K_PAIR_SECOND = "pair-second"
+_K_LET_PAIR = "let-pair"
+_K_LET = "let"
+_K_INJECT = "inject"
+_K_CASE = "case"
+_K_LET_BANG = "let-bang"
+_K_CONS_HEAD = "cons-head"
+_K_CONS_TAIL = "cons-tail"
 
 
 class Interpreter:
     def __init__(self, env):
+        if not isinstance(env, Environment):
+            env = Environment(bindings=env)
         self.env = env
 
-    def interpret(self, term: Term) -> Term:
-        if isinstance(term, (Int, String, Bool, Unit)):
+    def interpret(self, term: Term, env: Environment = None) -> Term:
+        if env is None:
+            env = self.env
+
+        if isinstance(term, (Int, String, Bool, Unit, ListValue)):
             return term
         elif isinstance(term, Var):
-            if term.name in self.env:
-                return self.env[term.name]
-            else:
-                raise InterpError(f"Variable '{term.name}' not found in environment.")
+            return env.lookup(term.name)
         elif isinstance(term, Fun):
-            return Closure(term, self.env)
+            return Closure(term, env)
         elif isinstance(term, App):
-            fun_val = self.interpret(term.f)
+            fun_val = self.interpret(term.f, env)
             # Handle arity 0 functions
             if isinstance(fun_val, Primitive) and fun_val.arity == 0:
                  return fun_val.fun()
 
-            arg_val = self.interpret(term.arg)
+            arg_val = self.interpret(term.arg, env)
 
             if isinstance(fun_val, Primitive):
                 return fun_val.apply(arg_val)
             elif isinstance(fun_val, Closure):
                 closure = fun_val
-                new_env = closure.env.copy()
-                new_env[closure.fun.var] = arg_val
-
-                new_interpreter = Interpreter(new_env)
-                return new_interpreter.interpret(closure.fun.body)
+                return self.interpret(closure.fun.body, closure.env.extend(closure.fun.var, arg_val))
             else:
                 raise InterpError("Cannot apply a non-function value.")
         elif isinstance(term, Pair):
-            e1 = self.interpret(term.e1)
-            e2 = self.interpret(term.e2)
+            e1 = self.interpret(term.e1, env)
+            e2 = self.interpret(term.e2, env)
             return Pair(e1, e2)
         elif isinstance(term, LetPair):
-            pair_val = self.interpret(term.e1)
+            pair_val = self.interpret(term.e1, env)
             if not isinstance(pair_val, Pair):
                 raise InterpError("Expected a pair in let pair.")
 
-            new_env = self.env.copy()
-            new_env[term.v1] = pair_val.e1
-            new_env[term.v2] = pair_val.e2
-
-            new_interpreter = Interpreter(new_env)
-            return new_interpreter.interpret(term.e2)
+            new_env = env.extend(term.v1, pair_val.e1).extend(term.v2, pair_val.e2)
+            return self.interpret(term.e2, new_env)
         elif isinstance(term, Let):
-            val = self.interpret(term.e1)
-            new_env = self.env.copy()
-            new_env[term.var] = val
-            new_interpreter = Interpreter(new_env)
-            return new_interpreter.interpret(term.e2)
+            val = self.interpret(term.e1, env)
+            return self.interpret(term.e2, env.extend(term.var, val))
         elif isinstance(term, Inl):
-            return Inl(self.interpret(term.e), term.t_right)
+            return Inl(self.interpret(term.e, env), term.t_right)
         elif isinstance(term, Inr):
-            return Inr(self.interpret(term.e), term.t_left)
+            return Inr(self.interpret(term.e, env), term.t_left)
         elif isinstance(term, Case):
-            sum_val = self.interpret(term.e)
+            sum_val = self.interpret(term.e, env)
             if not isinstance(sum_val, (Inl, Inr)):
                 raise InterpError("Expected a sum in case.")
 
-            new_env = self.env.copy()
             if isinstance(sum_val, Inl):
-                new_env[term.v1] = sum_val.e
-                new_interpreter = Interpreter(new_env)
-                return new_interpreter.interpret(term.e1)
+                return self.interpret(term.e1, env.extend(term.v1, sum_val.e))
             else:  # Inr
-                new_env[term.v2] = sum_val.e
-                new_interpreter = Interpreter(new_env)
-                return new_interpreter.interpret(term.e2)
+                return self.interpret(term.e2, env.extend(term.v2, sum_val.e))
         elif isinstance(term, Promote):
-            return self.interpret(term.e)
+            return self.interpret(term.e, env)
         elif isinstance(term, LetBang):
-            val = self.interpret(term.e1)
-
-            new_env = self.env.copy()
-            new_env[term.v] = val
-
-            new_interpreter = Interpreter(new_env)
-            return new_interpreter.interpret(term.e2)
+            val = self.interpret(term.e1, env)
+            return self.interpret(term.e2, env.extend(term.v, val))
         elif isinstance(term, Nil):
             return term
         elif isinstance(term, Cons):
-            head = self.interpret(term.head)
-            tail = self.interpret(term.tail)
+            head = self.interpret(term.head, env)
+            tail = self.interpret(term.tail, env)
             return Cons(head, tail)
         elif isinstance(term, AST):
             return term
@@ -178,28 +229,205 @@ class Interpreter:
             raise NotImplementedError(f"Interpretation not implemented for {type(term).__name__}")
 
 
+    def interpret_iterative(self, term: Term, env: Environment = None) -> Term:
+        """
+        Evaluates `term` with an explicit continuation stack.
+
+        This has the same semantics as `interpret`, but uses a bounded amount
+        of Python stack regardless of how deeply the term or the lists it
+        builds are nested. Tail positions (let bodies, case branches and
+        function bodies) do not grow the continuation stack.
+        """
+        if env is None:
+            env = self.env
+        konts = []
+
+        while True:
+            # Descend into the term until it yields a value.
+            while True:
+                if isinstance(term, (Int, String, Bool, Unit, Nil, AST, ListValue)):
+                    value = term
+                    break
+                elif isinstance(term, Var):
+                    value = env.lookup(term.name)
+                    break
+                elif isinstance(term, Fun):
+                    value = Closure(term, env)
+                    break
+                elif isinstance(term, App):
+                    konts.append((_K_APP_FUN, term, env))
+                    term = term.f
+                elif isinstance(term, Pair):
+                    konts.append((_K_PAIR_FIRST, term, env))
+                    term = term.e1
+                elif isinstance(term, LetPair):
+                    konts.append((_K_LET_PAIR, term, env))
+                    term = term.e1
+                elif isinstance(term, Let):
+                    konts.append((_K_LET, term, env))
+                    term = term.e1
+                elif isinstance(term, (Inl, Inr)):
+                    konts.append((_K_INJECT, term, env))
+                    term = term.e
+                elif isinstance(term, Case):
+                    konts.append((_K_CASE, term, env))
+                    term = term.e
+                elif isinstance(term, Promote):
+                    term = term.e
+                elif isinstance(term, LetBang):
+                    konts.append((_K_LET_BANG, term, env))
+                    term = term.e1
+                elif isinstance(term, Cons):
+                    konts.append((_K_CONS_HEAD, term, env))
+                    term = term.head
+                else:
+                    raise NotImplementedError(f"Interpretation not implemented for {type(term).__name__}")
+
+            # Feed the value to pending continuations until one of them
+            # needs another sub-term evaluated.
+            while True:
+                if not konts:
+                    return value
+                kind, data, kont_env = konts.pop()
+                if kind is _K_APP_FUN:
+                    # Handle arity 0 functions
+                    if isinstance(value, Primitive) and value.arity == 0:
+                        value = value.fun()
+                        continue
+                    konts.append((_K_APP_ARG, value, None))
+                    term, env = data.arg, kont_env
+                    break
+                elif kind is _K_APP_ARG:
+                    if isinstance(data, Primitive):
+                        value = data.apply(value)
+                        continue
+                    elif isinstance(data, Closure):
+                        term, env = data.fun.body, data.env.extend(data.fun.var, value)
+                        break
+                    raise InterpError("Cannot apply a non-function value.")
+                elif kind is _K_PAIR_FIRST:
+                    konts.append((_K_PAIR_SECOND, value, None))
+                    term, env = data.e2, kont_env
+                    break
+                elif kind is _K_PAIR_SECOND:
+                    value = Pair(data, value)
+                elif kind is _K_LET_PAIR:
+                    if not isinstance(value, Pair):
+                        raise InterpError("Expected a pair in let pair.")
+                    term = data.e2
+                    env = kont_env.extend(data.v1, value.e1).extend(data.v2, value.e2)
+                    break
+                elif kind is _K_LET:
+                    term, env = data.e2, kont_env.extend(data.var, value)
+                    break
+                elif kind is _K_INJECT:
+                    if isinstance(data, Inl):
+                        value = Inl(value, data.t_right)
+                    else:
+                        value = Inr(value, data.t_left)
+                elif kind is _K_CASE:
+                    if isinstance(value, Inl):
+                        term, env = data.e1, kont_env.extend(data.v1, value.e)
+                    elif isinstance(value, Inr):
+                        term, env = data.e2, kont_env.extend(data.v2, value.e)
+                    else:
+                        raise InterpError("Expected a sum in case.")
+                    break
+                elif kind is _K_LET_BANG:
+                    term, env = data.e2, kont_env.extend(data.v, value)
+                    break
+                elif kind is _K_CONS_HEAD:
+                    konts.append((_K_CONS_TAIL, value, None))
+                    term, env = data.tail, kont_env
+                    break
+                else:  # _K_CONS_TAIL
+                    value = Cons(data, value)
+
+
 def _unparse(term: Term) -> str:
     # This is a simplified unparser. A more complete implementation would be needed for full homoiconicity.
     return repr(term)
 
 
-def interpret(term: Term, env: dict = None) -> Term:
-    """
-    Interprets the given term in the provided environment.
-    """
-    default_env = {
+def _plan_stats() -> list:
+    stats = last_search_stats()
+    if stats is None:
+        return []
+    return [f"{name}={value}" for name, value in stats.as_dict().items()]
+
+
+def _build_prelude(evaluate) -> MappingProxyType:
+    return MappingProxyType({
         'load_domain': Primitive(load_domain, 1),
         'create_state': Primitive(create_state, 1),
         'apply_action': Primitive(apply_action, 1),
         'is_goal': Primitive(lambda l: Bool(is_goal(l)), 1),
         'get_current_state': Primitive(lambda: _python_list_to_appl_list(get_current_state()), 0),
         'find_plan': Primitive(lambda l: _python_list_to_appl_list(find_plan(l) or []), 1),
+        # find_plan_with ["max_nodes=500", "partial=true", "stats=true", ...] goal
+        'find_plan_with': Primitive(
+            lambda options, l: _python_list_to_appl_list(find_plan(l, **parse_search_options(options)) or []),
+            2,
+        ),
+        # The stats of the last find_plan_with "stats=true", as ["generated=42", "expanded=17", ...].
+        'plan_stats': Primitive(lambda: _python_list_to_appl_list(_plan_stats()), 0),
         'parse': Primitive(lambda s: AST(parse(s)), 1),
         'unparse': Primitive(lambda t: String(_unparse(t)), 1),
-        'eval': Primitive(lambda t: interpret(t.term, env), 1),
-    }
-    if env:
-        default_env.update(env)
+        'eval': Primitive(lambda t: evaluate(t.term), 1),
+    })
+
+
+# Prelude mappings and the interpreters over them, built once per evaluator.
+_PRELUDES = {}
+
 
-    interpreter = Interpreter(default_env)
+def _prelude(evaluate):
+    entry = _PRELUDES.get(evaluate)
+    if entry is None:
+        prelude = _build_prelude(evaluate)
+        entry = _PRELUDES[evaluate] = (prelude, Interpreter(prelude))
+    return entry
+
+
+def _default_env(env: dict = None, evaluate=None):
+    """
+    Returns the primitive environment, with `env` layered on top.
+
+    `evaluate` is the entry point used by the `eval` primitive; it defaults to
+    the tree-walking `interpret`. Without `env` the shared, read-only prelude
+    is returned as is.
+    """
+    if evaluate is None:
+        evaluate = interpret
+    prelude = _prelude(evaluate)[0]
+    if not env:
+        return prelude
+    default_env = dict(prelude)
+    default_env['eval'] = Primitive(lambda t: evaluate(t.term, env), 1)
+    default_env.update(env)
+    return default_env
+
+
+def _interpret_stack_safe(term: Term, env: dict = None) -> Term:
+    return interpret(term, env, stack_safe=True)
+
+
+def interpret(term: Term, env: dict = None, stack_safe: bool = False) -> Term:
+    """
+    Interprets the given term in the provided environment.
+
+    With `stack_safe=True` evaluation uses an explicit continuation stack, so
+    arbitrarily deep terms and long lists do not raise `RecursionError`.
+    """
+    evaluate = _interpret_stack_safe if stack_safe else interpret
+    if env:
+        interpreter = Interpreter(_default_env(env, evaluate))
+    else:
+        interpreter = _prelude(evaluate)[1]
+    if stack_safe:
+        return interpreter.interpret_iterative(term)
     return interpreter.interpret(term)
+
+
+# The primitives available to every APPL program.
+PRELUDE = _default_env()
@@ -99,4 +99,122 @@ class Zero(Formula):
 
 class Top(Formula):
     def __repr__(self):
-        return "Top"
\ No newline at end of file
+        return "Top"
+
+# Term node classes, produced by the APPL-to-LFI-ILL compiler
+class Term:
+    pass
+
+class Var(Term):
+    def __init__(self, name):
+        self.name = name
+    def __repr__(self):
+        return f"Var({self.name})"
+
+class Int(Term):
+    def __init__(self, value):
+        self.value = value
+    def __repr__(self):
+        return f"Int({self.value})"
+
+class String(Term):
+    def __init__(self, value):
+        self.value = value
+    def __repr__(self):
+        return f"String({self.value})"
+
+class Bool(Term):
+    def __init__(self, value):
+        self.value = value
+    def __repr__(self):
+        return f"Bool({self.value})"
+
+class Unit(Term):
+    def __repr__(self):
+        return "Unit"
+
+class Fun(Term):
+    def __init__(self, var, type, body):
+        self.var = var
+        self.type = type
+        self.body = body
+    def __repr__(self):
+        return f"fn {self.var} : {self.type} => {self.body}"
+
+class App(Term):
+    def __init__(self, f, arg):
+        self.f = f
+        self.arg = arg
+    def __repr__(self):
+        return f"({self.f} {self.arg})"
+
+class TensorPair(Term):
+    def __init__(self, e1, e2):
+        self.e1 = e1
+        self.e2 = e2
+    def __repr__(self):
+        return f"({self.e1} * {self.e2})"
+
+class LetTensor(Term):
+    def __init__(self, v1, v2, e1, e2):
+        self.v1 = v1
+        self.v2 = v2
+        self.e1 = e1
+        self.e2 = e2
+    def __repr__(self):
+        return f"let ({self.v1} * {self.v2}) = {self.e1} in {self.e2}"
+
+class WithPair(Term):
+    def __init__(self, e1, e2):
+        self.e1 = e1
+        self.e2 = e2
+    def __repr__(self):
+        return f"<{self.e1}, {self.e2}>"
+
+class Fst(Term):
+    def __init__(self, e):
+        self.e = e
+    def __repr__(self):
+        return f"fst({self.e})"
+
+class Snd(Term):
+    def __init__(self, e):
+        self.e = e
+    def __repr__(self):
+        return f"snd({self.e})"
+
+class Promotion(Term):
+    def __init__(self, e):
+        self.e = e
+    def __repr__(self):
+        return f"!{self.e}"
+
+class Dereliction(Term):
+    def __init__(self, v, e1, e2):
+        self.v = v
+        self.e1 = e1
+        self.e2 = e2
+    def __repr__(self):
+        return f"let !{self.v} = {self.e1} in {self.e2}"
+
+class Inl(Term):
+    def __init__(self, e):
+        self.e = e
+    def __repr__(self):
+        return f"inl({self.e})"
+
+class Inr(Term):
+    def __init__(self, e):
+        self.e = e
+    def __repr__(self):
+        return f"inr({self.e})"
+
+class Case(Term):
+    def __init__(self, e, v1, e1, v2, e2):
+        self.e = e
+        self.v1 = v1
+        self.e1 = e1
+        self.v2 = v2
+        self.e2 = e2
+    def __repr__(self):
+        return f"case {self.e} of inl {self.v1} => {self.e1} | inr {self.v2} => {self.e2}"
@@ -0,0 +1,339 @@
+"""
+A compact bytecode for LFI-ILL terms and a stack VM that executes it.
+
+`assemble` flattens a term AST into a `CodeObject`, a tuple of
+`(opcode, operand)` pairs in postfix order. Binding forms (functions, `let`
+eliminators and `case`) carry their bodies as nested code objects, because a
+`case` on a BOTH value has to run both branches. The `VM` executes
+instructions through a dispatch table indexed by opcode, so running a program
+does no per-node name formatting or attribute lookup.
+
+The VM gives the same results as `lfi_ill.interpreter.Interpreter` and uses
+the same environment model: a single mutable dict shared by every binder.
+"""
+
+from lfi_ill.ast import (
+    Atom,
+    Var,
+    Int,
+    String,
+    Bool,
+    Unit,
+    Fun,
+    App,
+    TensorPair,
+    LetTensor,
+    WithPair,
+    Fst,
+    Snd,
+    Promotion,
+    Dereliction,
+    Inl,
+    Inr,
+    Case,
+    Negation,
+    CoNegation,
+    Consistency,
+    Completeness,
+    Undeterminedness,
+)
+from lfi_ill.interpreter import ParaconsistentTruth, ParaconsistentState
+
+# --- Opcodes ---
+LOAD_CONST = 0      # operand: (truth value, concrete value)
+LOAD_VAR = 1        # operand: variable name
+MAKE_FUN = 2        # operand: FunctionCode
+APPLY = 3
+MAKE_PAIR = 4
+FST = 5
+SND = 6
+PROMOTE = 7
+BIND_PROMOTED = 8   # operand: (name, body code)
+UNPAIR = 9          # operand: (name1, name2, body code)
+INJECT_LEFT = 10
+INJECT_RIGHT = 11
+CASE = 12           # operand: (name1, code1, name2, code2)
+NEGATE = 13
+CONSISTENCY = 14
+COMPLETENESS = 15
+UNDETERMINED = 16
+
+OPCODE_NAMES = [
+    "LOAD_CONST", "LOAD_VAR", "MAKE_FUN", "APPLY", "MAKE_PAIR", "FST", "SND",
+    "PROMOTE", "BIND_PROMOTED", "UNPAIR", "INJECT_LEFT", "INJECT_RIGHT", "CASE",
+    "NEGATE", "CONSISTENCY", "COMPLETENESS", "UNDETERMINED",
+]
+
+T = ParaconsistentTruth
+
+
+class CodeObject:
+    """An assembled sequence of `(opcode, operand)` instructions."""
+
+    __slots__ = ("instructions",)
+
+    def __init__(self, instructions):
+        self.instructions = tuple(instructions)
+
+    def __len__(self):
+        return len(self.instructions)
+
+    def __repr__(self):
+        return "\n".join(
+            f"{i:4} {OPCODE_NAMES[op]}" + ("" if arg is None else f" {arg!r}")
+            for i, (op, arg) in enumerate(self.instructions)
+        )
+
+
+class FunctionCode:
+    """The compiled form of a `Fun` node: its parameter name and body code."""
+
+    __slots__ = ("var", "code")
+
+    def __init__(self, var, code):
+        self.var = var
+        self.code = code
+
+    def __repr__(self):
+        return f"<function {self.var}>"
+
+
+# --- Assembler ---
+
+def _bool_constant(value):
+    if value == "Both":
+        return (T.BOTH, None)
+    elif value == "Neither":
+        return (T.NEITHER, None)
+    elif value:
+        return (T.TRUE, None)
+    return (T.FALSE, None)
+
+
+_UNARY_OPCODES = {
+    Negation: NEGATE,
+    CoNegation: NEGATE,
+    Consistency: CONSISTENCY,
+    Completeness: COMPLETENESS,
+    Undeterminedness: UNDETERMINED,
+}
+
+
+def _emit(node, out):
+    node_type = type(node)
+    if node_type in (Int, String):
+        out.append((LOAD_CONST, (T.TRUE, node.value)))
+    elif node_type is Bool:
+        out.append((LOAD_CONST, _bool_constant(node.value)))
+    elif node_type is Unit:
+        out.append((LOAD_CONST, (T.TRUE, None)))
+    elif node_type in (Var, Atom):
+        out.append((LOAD_VAR, node.name))
+    elif node_type is Fun:
+        out.append((MAKE_FUN, assemble_function(node)))
+    elif node_type is App:
+        _emit(node.f, out)
+        _emit(node.arg, out)
+        out.append((APPLY, None))
+    elif node_type in (TensorPair, WithPair):
+        _emit(node.e1, out)
+        _emit(node.e2, out)
+        out.append((MAKE_PAIR, None))
+    elif node_type is Fst:
+        _emit(node.e, out)
+        out.append((FST, None))
+    elif node_type is Snd:
+        _emit(node.e, out)
+        out.append((SND, None))
+    elif node_type is Promotion:
+        _emit(node.e, out)
+        out.append((PROMOTE, None))
+    elif node_type is Dereliction:
+        _emit(node.e1, out)
+        out.append((BIND_PROMOTED, (node.v.name, assemble(node.e2))))
+    elif node_type is LetTensor:
+        _emit(node.e1, out)
+        out.append((UNPAIR, (node.v1.name, node.v2.name, assemble(node.e2))))
+    elif node_type is Inl:
+        _emit(node.e, out)
+        out.append((INJECT_LEFT, None))
+    elif node_type is Inr:
+        _emit(node.e, out)
+        out.append((INJECT_RIGHT, None))
+    elif node_type is Case:
+        _emit(node.e, out)
+        out.append((CASE, (node.v1.name, assemble(node.e1), node.v2.name, assemble(node.e2))))
+    elif node_type in _UNARY_OPCODES:
+        _emit(node.formula, out)
+        out.append((_UNARY_OPCODES[node_type], None))
+    else:
+        raise NotImplementedError(f"Cannot assemble {node_type.__name__} nodes")
+
+
+def assemble(node) -> CodeObject:
+    """Compiles an LFI-ILL term into bytecode."""
+    out = []
+    _emit(node, out)
+    return CodeObject(out)
+
+
+def assemble_function(node: Fun) -> FunctionCode:
+    return FunctionCode(node.var.name, assemble(node.body))
+
+
+# --- Virtual machine ---
+
+_NEGATED = {T.TRUE: T.FALSE, T.FALSE: T.TRUE, T.BOTH: T.BOTH, T.NEITHER: T.NEITHER}
+
+
+def _truth(flag):
+    return ParaconsistentState(T.TRUE if flag else T.FALSE)
+
+
+def _load_const(vm, stack, arg):
+    stack.append(ParaconsistentState(arg[0], arg[1]))
+
+
+def _load_var(vm, stack, name):
+    environment = vm.environment
+    # Unbound variables are NEITHER
+    stack.append(environment[name] if name in environment else ParaconsistentState(T.NEITHER))
+
+
+def _make_fun(vm, stack, function):
+    stack.append(ParaconsistentState(T.TRUE, function))
+
+
+def _apply(vm, stack, arg):
+    argument = stack.pop()
+    fun = stack.pop()
+    if fun.is_true():
+        function = fun.concrete_value
+        if isinstance(function, Fun):
+            # A function value created by the tree-walking interpreter.
+            function = assemble_function(function)
+        vm.environment[function.var] = argument
+        stack.append(vm.run(function.code))
+    else:
+        stack.append(ParaconsistentState(T.FALSE))
+
+
+def _make_pair(vm, stack, arg):
+    e2 = stack.pop()
+    e1 = stack.pop()
+    stack.append(ParaconsistentState(T.TRUE, (e1, e2)))
+
+
+def _projection(index):
+    def project(vm, stack, arg):
+        pair = stack.pop()
+        if pair.is_true():
+            stack.append(pair.concrete_value[index])
+        else:
+            stack.append(ParaconsistentState(T.FALSE))
+    return project
+
+
+def _promote(vm, stack, arg):
+    stack.append(ParaconsistentState(T.TRUE, stack.pop()))
+
+
+def _bind_promoted(vm, stack, arg):
+    name, body = arg
+    promoted = stack.pop()
+    if promoted.is_true():
+        vm.environment[name] = promoted.concrete_value
+        stack.append(vm.run(body))
+    else:
+        stack.append(ParaconsistentState(T.FALSE))
+
+
+def _unpair(vm, stack, arg):
+    name1, name2, body = arg
+    pair = stack.pop()
+    if pair.is_true():
+        vm.environment[name1] = pair.concrete_value[0]
+        vm.environment[name2] = pair.concrete_value[1]
+        stack.append(vm.run(body))
+    else:
+        stack.append(ParaconsistentState(T.FALSE))
+
+
+def _injection(tag):
+    def inject(vm, stack, arg):
+        stack.append(ParaconsistentState(T.TRUE, {"tag": tag, "value": stack.pop()}))
+    return inject
+
+
+def _case(vm, stack, arg):
+    name1, code1, name2, code2 = arg
+    value = stack.pop()
+    is_true, is_false = value.is_true(), value.is_false()
+
+    if is_true and not is_false:
+        if value.concrete_value["tag"] == "inl":
+            vm.environment[name1] = value.concrete_value["value"]
+            stack.append(vm.run(code1))
+        else:
+            vm.environment[name2] = value.concrete_value["value"]
+            stack.append(vm.run(code2))
+    elif is_false and not is_true:
+        stack.append(ParaconsistentState(T.FALSE))
+    elif is_true and is_false:
+        # BOTH: explore both paths and combine the results.
+        vm.environment[name1] = value.concrete_value["value"]
+        res1 = vm.run(code1)
+        vm.environment[name2] = value.concrete_value["value"]
+        res2 = vm.run(code2)
+        stack.append(res1 if res1 == res2 else ParaconsistentState(T.BOTH))
+    else:
+        stack.append(ParaconsistentState(T.NEITHER))
+
+
+def _negate(vm, stack, arg):
+    value = stack.pop()
+    stack.append(ParaconsistentState(_NEGATED[value.value], value.concrete_value))
+
+
+def _consistency(vm, stack, arg):
+    stack.append(_truth(stack.pop().value != T.BOTH))
+
+
+def _completeness(vm, stack, arg):
+    stack.append(_truth(stack.pop().value != T.NEITHER))
+
+
+# The dispatch table, indexed by opcode.
+DISPATCH = [None] * len(OPCODE_NAMES)
+DISPATCH[LOAD_CONST] = _load_const
+DISPATCH[LOAD_VAR] = _load_var
+DISPATCH[MAKE_FUN] = _make_fun
+DISPATCH[APPLY] = _apply
+DISPATCH[MAKE_PAIR] = _make_pair
+DISPATCH[FST] = _projection(0)
+DISPATCH[SND] = _projection(1)
+DISPATCH[PROMOTE] = _promote
+DISPATCH[BIND_PROMOTED] = _bind_promoted
+DISPATCH[UNPAIR] = _unpair
+DISPATCH[INJECT_LEFT] = _injection("inl")
+DISPATCH[INJECT_RIGHT] = _injection("inr")
+DISPATCH[CASE] = _case
+DISPATCH[NEGATE] = _negate
+DISPATCH[CONSISTENCY] = _consistency
+DISPATCH[COMPLETENESS] = _completeness
+# Undeterminedness is TRUE unless the value is BOTH, like consistency.
+DISPATCH[UNDETERMINED] = _consistency
+
+
+class VM:
+    """A stack machine for LFI-ILL bytecode."""
+
+    def __init__(self, environment: dict = None):
+        self.environment = environment if environment is not None else {}
+
+    def run(self, code: CodeObject) -> ParaconsistentState:
+        stack = []
+        dispatch = DISPATCH
+        for op, arg in code.instructions:
+            dispatch[op](self, stack, arg)
+        return stack.pop()
@@ -28,6 +28,13 @@ class ParaconsistentState:
         return f"ParaconsistentState({self.value}, {self.concrete_value})"
 
 class Interpreter:
+    # Visitor functions keyed by node class, filled in on first visit.
+    _dispatch = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._dispatch = {}
+
     def __init__(self, parser):
         self.parser = parser
         self.environment = {}
@@ -37,9 +44,20 @@ class Interpreter:
         return self.visit(tree)
 
     def visit(self, node):
-        method_name = f'visit_{type(node).__name__}'
-        visitor = getattr(self, method_name, self.generic_visit)
-        return visitor(node)
+        node_type = type(node)
+        visitor = self._dispatch.get(node_type)
+        if visitor is None:
+            visitor = getattr(type(self), f'visit_{node_type.__name__}', type(self).generic_visit)
+            self._dispatch[node_type] = visitor
+        return visitor(self, node)
+
+    def run_code(self, code):
+        """
+        Executes a bytecode `CodeObject` (see `lfi_ill.bytecode`) against this
+        interpreter's environment.
+        """
+        from lfi_ill.bytecode import VM
+        return VM(self.environment).run(code)
 
     def generic_visit(self, node):
         raise Exception(f'No visit_{type(node).__name__} method for {node}')
@@ -176,6 +194,12 @@ class Interpreter:
         else:
             return ParaconsistentState(ParaconsistentTruth.FALSE)
 
+    def visit_Unit(self, node):
+        return ParaconsistentState(ParaconsistentTruth.TRUE)
+
+    def visit_Var(self, node):
+        return self.visit_Atom(node)
+
     def visit_Atom(self, node):
         if node.name in self.environment:
             return self.environment[node.name]
@@ -0,0 +1,93 @@
+import unittest
+import appl_ast
+from lfi_ill.parser import parser
+from lfi_ill.interpreter import Interpreter, ParaconsistentTruth, ParaconsistentState
+from lfi_ill.ast import *
+from lfi_ill.bytecode import assemble, VM, CodeObject, LOAD_CONST, PROMOTE, BIND_PROMOTED
+from tooling.appl_to_lfi_ill_logic import ApplToLfiIllCompiler
+
+
+def _flatten(state):
+    """Renders a state and its nested concrete values for comparison."""
+    value = state.concrete_value
+    if isinstance(value, tuple):
+        value = tuple(_flatten(v) for v in value)
+    elif isinstance(value, dict):
+        value = (value["tag"], _flatten(value["value"]))
+    elif isinstance(value, ParaconsistentState):
+        value = _flatten(value)
+    elif isinstance(value, Fun) or type(value).__name__ == "FunctionCode":
+        value = "<function>"
+    return (state.value, value)
+
+
+class TestBytecodeVM(unittest.TestCase):
+    def setUp(self):
+        self.both = ParaconsistentState(ParaconsistentTruth.BOTH, {"tag": "inl", "value": ParaconsistentState(ParaconsistentTruth.TRUE, 1)})
+        self.env = {
+            'p_true': ParaconsistentState(ParaconsistentTruth.TRUE),
+            'p_false': ParaconsistentState(ParaconsistentTruth.FALSE),
+            'p_both': ParaconsistentState(ParaconsistentTruth.BOTH),
+            'p_neither': ParaconsistentState(ParaconsistentTruth.NEITHER),
+            'sum_both': self.both,
+        }
+
+    def _assert_same_as_interpreter(self, node):
+        interpreter = Interpreter(parser)
+        interpreter.environment = dict(self.env)
+        expected = interpreter.visit(node)
+        actual = VM(dict(self.env)).run(assemble(node))
+        self.assertEqual(_flatten(actual), _flatten(expected), repr(node))
+
+    def test_agrees_with_interpreter(self):
+        identity = Fun(Var('x'), 'Int', Var('x'))
+        nodes = [
+            Int(1),
+            String("s"),
+            Bool(True),
+            Bool("Both"),
+            Unit(),
+            Var('unbound'),
+            App(identity, Int(3)),
+            Dereliction(Var('x'), Promotion(Int(5)), TensorPair(Var('x'), Var('x'))),
+            LetTensor(Var('a'), Var('b'), TensorPair(Int(1), Int(2)), TensorPair(Var('b'), Var('a'))),
+            Fst(WithPair(Int(1), Int(2))),
+            Snd(WithPair(Int(1), Int(2))),
+            Case(Inl(Int(1)), Var('l'), Var('l'), Var('r'), Int(0)),
+            Case(Inr(Int(2)), Var('l'), Int(0), Var('r'), Var('r')),
+            Case(Var('sum_both'), Var('l'), Int(0), Var('r'), Int(1)),
+            Case(Var('p_false'), Var('l'), Int(0), Var('r'), Int(1)),
+            Case(Var('p_neither'), Var('l'), Int(0), Var('r'), Int(1)),
+        ]
+        for name in ('p_true', 'p_false', 'p_both', 'p_neither'):
+            for op in (Negation, CoNegation, Consistency, Completeness, Undeterminedness):
+                nodes.append(op(Atom(name)))
+        for node in nodes:
+            self._assert_same_as_interpreter(node)
+
+    def test_encoding(self):
+        code = assemble(Dereliction(Var('x'), Promotion(Int(5)), Var('x')))
+        self.assertIsInstance(code, CodeObject)
+        self.assertEqual([op for op, _ in code.instructions], [LOAD_CONST, PROMOTE, BIND_PROMOTED])
+
+    def test_interpreter_runs_code_in_its_environment(self):
+        interpreter = Interpreter(parser)
+        interpreter.environment = {'p': ParaconsistentState(ParaconsistentTruth.BOTH)}
+        result = interpreter.run_code(assemble(Consistency(Atom('p'))))
+        self.assertEqual(result.value, ParaconsistentTruth.FALSE)
+
+    def test_appl_pipeline(self):
+        program = appl_ast.LetBang('x', appl_ast.Promote(appl_ast.Int(5)),
+                                   appl_ast.Pair(appl_ast.Var('x'), appl_ast.Var('x')))
+        code = ApplToLfiIllCompiler().compile_to_bytecode(program)
+        result = VM().run(code)
+        self.assertEqual(_flatten(result), (ParaconsistentTruth.TRUE, ((ParaconsistentTruth.TRUE, 5), (ParaconsistentTruth.TRUE, 5))))
+
+    def test_appl_function_application(self):
+        program = appl_ast.App(appl_ast.Fun('y', appl_ast.TInt(), appl_ast.Var('y')), appl_ast.Int(7))
+        result = VM().run(ApplToLfiIllCompiler().compile_to_bytecode(program))
+        self.assertEqual(result.concrete_value, 7)
+
+
+if __name__ == '__main__':
+    unittest.main()
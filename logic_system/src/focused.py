@@ -0,0 +1,285 @@
+"""
+Focused (Andreoli-style) proof search for ILL.
+
+Sequents are searched in dyadic form Γ; Δ ⊢ C, where Γ is the set of
+formulas A that are available as !A and Δ is the linear context. The
+search alternates two phases:
+
+- Inversion applies the invertible rules eagerly, in a fixed order and
+  without backtracking: ⊸-R and &-R on the right, then ⊗-L, ⊕-L and moving
+  !A from Δ into Γ on the left.
+- When nothing is left to invert the sequent is stable, and the search
+  decides on a single formula to focus on: the succedent, a formula of Δ,
+  or a copy of a formula of Γ. Focus stays on the chosen formula through
+  the non-invertible rules (⊗-R, ⊕-R and !-R on the right, ⊸-L and &-L on
+  the left) until it reaches an atom or a formula of the opposite polarity.
+
+Atoms are positive: a right focus on an atom must close it by the axiom at
+once, and atoms on the left are never focused on. When the formula that
+takes the first part of a ⊗-R or ⊸-L split is a ⊗ of atoms, only splits
+into those atoms are tried.
+
+Contraction and weakening are never searched: Γ is only copied by a focus
+decision and is dropped at the axioms, so `!` formulas cannot make the
+search loop without using up depth, which counts focus decisions. Stable
+sequents are tabled and cut on the current branch like the goals of
+`Synthesizer._prove`. Proofs are built with the ordinary `ill` rules,
+adding the dereliction, contraction and weakening steps that the dyadic
+form leaves implicit.
+"""
+import math
+from typing import Dict, FrozenSet, Optional, Set, Tuple
+from . import ill
+from .proof import ProofTree
+from .sequents import Multiset
+from .formulas import Formula, LinImplies, OfCourse, With, Plus, Tensor
+
+# Connectives whose right rules are invertible; the others are focused on.
+RIGHT_INVERTIBLE = (LinImplies, With)
+# Connectives whose left rules are invertible; the others are focused on.
+LEFT_INVERTIBLE = (Tensor, Plus, OfCourse)
+
+def _is_atom(formula: Formula) -> bool:
+    return not isinstance(formula, RIGHT_INVERTIBLE + LEFT_INVERTIBLE)
+
+
+def _atoms(formula: Formula) -> Optional[Multiset]:
+    """The atoms of `formula` if it is built from atoms with ⊗ alone, else None."""
+    if isinstance(formula, Tensor):
+        left, right = _atoms(formula.left), _atoms(formula.right)
+        return None if left is None or right is None else left + right
+    return Multiset([formula]) if _is_atom(formula) else None
+
+
+def _splits(delta: Multiset, formula: Formula):
+    """The parts of `delta` that could prove `formula` under focus, smallest first."""
+    atoms = _atoms(formula)
+    if atoms is None:
+        return delta.sub_multisets()
+    # Each atom closes by the axiom on one copy from `delta` or on !Γ.
+    return Multiset({f: min(n, delta[f]) for f, n in atoms.items()}).sub_multisets()
+
+
+# A stable sequent Γ; Δ ⊢ C.
+Stable = Tuple[FrozenSet[Formula], Multiset, Formula]
+
+
+class FocusedSearch:
+    """
+    Focused proof search over `ill` sequents, with the same table and
+    counters as `Synthesizer`. `nodes` counts the sequents the search
+    applies rules to.
+    """
+
+    def __init__(self, logic_module=ill, tabling: bool = True):
+        self.logic = logic_module
+        self.tabling = tabling
+        # Each proof and the focus decisions it needs on its longest branch, at most.
+        self._proofs: Dict[Stable, Tuple[ProofTree, int]] = {}
+        # The deepest search that failed for each stable sequent; infinite
+        # when the search failed without reaching the depth limit.
+        self._failures: Dict[Stable, float] = {}
+        # The depth needed by the proofs found so far under the current decision.
+        self._needed = 0
+        self._cuts = 0
+        self._cutoffs = 0
+        self.proof_hits = 0
+        self.failure_hits = 0
+        self.misses = 0
+        self.nodes = 0
+
+    def prove(self, goal: ill.ILLSequent, depth: int) -> Optional[ProofTree]:
+        """A proof of `goal` making at most `depth` focus decisions on any branch, or None."""
+        return self._invert(frozenset(), goal.antecedent, goal.succedent_formula, depth, set())
+
+    def _contract(self, proof: ProofTree, gamma: FrozenSet[Formula]) -> ProofTree:
+        """Merges the copies of !Γ that a two-premise rule gave to both premises."""
+        for formula in gamma:
+            proof = self.logic.contraction(proof, OfCourse(formula))
+        return proof
+
+    def _weaken(self, proof: ProofTree, gamma: FrozenSet[Formula]) -> ProofTree:
+        """Adds the unused formulas of !Γ to an axiom."""
+        for formula in gamma:
+            proof = self.logic.weakening(proof, OfCourse(formula))
+        return proof
+
+    # --- Inversion ---
+
+    def _invert(self, gamma, delta: Multiset, goal: Formula, depth: int, path: Set[Stable]) -> Optional[ProofTree]:
+        """A proof of !Γ, Δ ⊢ C: applies the invertible rules, then decides."""
+        self.nodes += 1
+
+        if isinstance(goal, LinImplies):
+            premise = self._invert(gamma, delta.plus(goal.left), goal.right, depth, path)
+            return None if premise is None else self.logic.lin_implies_right(premise, goal)
+
+        if isinstance(goal, With):
+            left = self._invert(gamma, delta, goal.left, depth, path)
+            if left is None:
+                return None
+            right = self._invert(gamma, delta, goal.right, depth, path)
+            return None if right is None else self.logic.with_right(left, right)
+
+        for formula in delta:
+            if not isinstance(formula, LEFT_INVERTIBLE):
+                continue
+            rest = delta.minus(formula)
+
+            if isinstance(formula, Tensor):
+                premise = self._invert(gamma, rest.plus(formula.left, formula.right), goal, depth, path)
+                return None if premise is None else self.logic.tensor_left(premise, formula)
+
+            if isinstance(formula, Plus):
+                left = self._invert(gamma, rest.plus(formula.left), goal, depth, path)
+                if left is None:
+                    return None
+                right = self._invert(gamma, rest.plus(formula.right), goal, depth, path)
+                return None if right is None else self.logic.plus_left(left, right, formula)
+
+            # !A joins Γ. A second copy of a formula already there is weakened away.
+            premise = self._invert(gamma | {formula.operand}, rest, goal, depth, path)
+            if premise is None or formula.operand not in gamma:
+                return premise
+            return self.logic.weakening(premise, formula)
+
+        return self._decide(gamma, delta, goal, depth, path)
+
+    # --- Decision ---
+
+    def _decide(self, gamma, delta: Multiset, goal: Formula, depth: int, path: Set[Stable]) -> Optional[ProofTree]:
+        """A proof of the stable sequent !Γ, Δ ⊢ C, tabled like `Synthesizer._prove`."""
+        key = (gamma, delta, goal)
+        if self.tabling:
+            entry = self._proofs.get(key)
+            if entry is not None and entry[1] <= depth:
+                self.proof_hits += 1
+                self._needed = max(self._needed, entry[1])
+                return entry[0]
+            failed = self._failures.get(key, 0)
+            if failed >= depth:
+                self.failure_hits += 1
+                if failed != math.inf:
+                    self._cutoffs += 1
+                return None
+            self.misses += 1
+
+        if key in path:
+            self._cuts += 1
+            return None
+        if depth <= 0:
+            self._cutoffs += 1
+            return None
+
+        cuts, cutoffs, outer = self._cuts, self._cutoffs, self._needed
+        self._needed = 0
+        path.add(key)
+        try:
+            proof = self._choose_focus(gamma, delta, goal, depth - 1, path)
+        finally:
+            path.discard(key)
+            needed, self._needed = self._needed + 1, outer
+        if proof is not None:
+            self._needed = max(outer, needed)
+
+        if self.tabling:
+            if proof is not None:
+                self._proofs[key] = (proof, needed)
+            elif self._cuts == cuts:
+                self._failures[key] = depth if self._cutoffs != cutoffs else math.inf
+        return proof
+
+    def _choose_focus(self, gamma, delta: Multiset, goal: Formula, depth: int, path: Set[Stable]) -> Optional[ProofTree]:
+        if not isinstance(goal, RIGHT_INVERTIBLE):
+            proof = self._focus_right(gamma, delta, goal, depth, path)
+            if proof is not None:
+                return proof
+
+        for formula in delta:
+            if not isinstance(formula, RIGHT_INVERTIBLE):
+                continue
+            proof = self._focus_left(gamma, delta.minus(formula), formula, goal, depth, path)
+            if proof is not None:
+                return proof
+
+        for formula in sorted(gamma, key=lambda f: f._id):
+            if _is_atom(formula):
+                continue
+            proof = self._focus_left(gamma, delta, formula, goal, depth, path)
+            if proof is not None:
+                # Copy !A out of Γ: dereliction, then contraction with the copy kept in Γ.
+                bang = OfCourse(formula)
+                return self.logic.contraction(self.logic.dereliction(proof, bang), bang)
+        return None
+
+    # --- Focusing ---
+
+    def _focus_right(self, gamma, delta: Multiset, formula: Formula, depth: int, path: Set[Stable]) -> Optional[ProofTree]:
+        """A proof of !Γ, Δ ⊢ [F], with the focus on F."""
+        self.nodes += 1
+
+        if isinstance(formula, Tensor):
+            for used in _splits(delta, formula.left):
+                left = self._focus_right(gamma, used, formula.left, depth, path)
+                if left is None:
+                    continue
+                right = self._focus_right(gamma, delta - used, formula.right, depth, path)
+                if right is not None:
+                    return self._contract(self.logic.tensor_right(left, right), gamma)
+            return None
+
+        if isinstance(formula, Plus):
+            premise = self._focus_right(gamma, delta, formula.left, depth, path)
+            if premise is not None:
+                return self.logic.plus_right_1(premise, formula)
+            premise = self._focus_right(gamma, delta, formula.right, depth, path)
+            return None if premise is None else self.logic.plus_right_2(premise, formula)
+
+        if isinstance(formula, OfCourse):
+            if delta:
+                return None
+            premise = self._invert(gamma, delta, formula.operand, depth, path)
+            return None if premise is None else self.logic.of_course_right(premise)
+
+        if isinstance(formula, RIGHT_INVERTIBLE):
+            # The focus is released.
+            return self._invert(gamma, delta, formula, depth, path)
+
+        # An atom: the axiom, on the one linear formula or on a copy from Γ.
+        if delta.size == 1 and formula in delta:
+            return self._weaken(self.logic.axiom(formula), gamma)
+        if not delta and formula in gamma:
+            proof = self.logic.dereliction(self.logic.axiom(formula), OfCourse(formula))
+            return self._weaken(proof, gamma - {formula})
+        return None
+
+    def _focus_left(self, gamma, delta: Multiset, formula: Formula, goal: Formula, depth: int,
+                    path: Set[Stable]) -> Optional[ProofTree]:
+        """A proof of !Γ, Δ, [F] ⊢ C, with the focus on F."""
+        self.nodes += 1
+
+        if isinstance(formula, LinImplies):
+            for used in _splits(delta, formula.left):
+                left = self._focus_right(gamma, used, formula.left, depth, path)
+                if left is None:
+                    continue
+                right = self._focus_left(gamma, delta - used, formula.right, goal, depth, path)
+                if right is not None:
+                    return self._contract(self.logic.lin_implies_left(left, right, formula), gamma)
+            return None
+
+        if isinstance(formula, With):
+            premise = self._focus_left(gamma, delta, formula.left, goal, depth, path)
+            if premise is not None:
+                return self.logic.with_left_1(premise, formula)
+            premise = self._focus_left(gamma, delta, formula.right, goal, depth, path)
+            return None if premise is None else self.logic.with_left_2(premise, formula)
+
+        # A positive formula or an atom: the focus is released.
+        return self._invert(gamma, delta.plus(formula), goal, depth, path)
+
+    def clear(self) -> None:
+        """Forgets every tabled result and resets the counters."""
+        self._proofs.clear()
+        self._failures.clear()
+        self.proof_hits = self.failure_hits = self.misses = self.nodes = 0
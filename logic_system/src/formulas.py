@@ -1,72 +1,142 @@
+"""
+Formulas are immutable and hash-consed: constructing a formula that already
+exists returns the existing object, so structurally equal formulas are the
+same object. Equality is identity and the hash is computed once, when the
+formula is built, from its connective and its (already hashed) subformulas.
+Each formula also gets a serial `_id`, in order of construction, which
+gives multisets of formulas a canonical order (see `sequents.Multiset`).
+"""
+import itertools
+import threading
+import weakref
 from abc import ABC, abstractmethod
 
+
 class Formula(ABC):
+    __slots__ = ("_hash", "_id", "__weakref__")
+
+    # The names of the constructor arguments, in order; set by each connective class.
+    _fields = ()
+
+    # Every live formula, keyed by (class, *arguments).
+    _table = weakref.WeakValueDictionary()
+    _lock = threading.Lock()
+    _ids = itertools.count()
+
+    def __new__(cls, *args, **kwargs):
+        if kwargs:
+            args += tuple(kwargs.pop(name) for name in cls._fields[len(args):] if name in kwargs)
+            if kwargs:
+                raise TypeError(f"{cls.__name__}() got unexpected arguments {', '.join(kwargs)}")
+        if len(args) != len(cls._fields):
+            raise TypeError(f"{cls.__name__}() takes {len(cls._fields)} arguments ({len(args)} given)")
+        key = (cls,) + args
+        formula = Formula._table.get(key)
+        if formula is None:
+            with Formula._lock:
+                formula = Formula._table.get(key)
+                if formula is None:
+                    formula = super().__new__(cls)
+                    for name, value in zip(cls._fields, args):
+                        object.__setattr__(formula, name, value)
+                    # Hashing the class name rather than the class keeps the hash structural.
+                    object.__setattr__(formula, "_hash", hash((cls.__name__,) + args))
+                    object.__setattr__(formula, "_id", next(Formula._ids))
+                    Formula._table[key] = formula
+        return formula
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} formulas are immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} formulas are immutable")
+
+    def __reduce__(self):
+        # Unpickling and copying go through the constructor, so they are interned too.
+        return type(self), tuple(getattr(self, name) for name in self._fields)
+
     @abstractmethod
     def __repr__(self):
         pass
 
     def __eq__(self, other):
-        return repr(self) == repr(other)
+        return self is other
 
     def __hash__(self):
-        return hash(repr(self))
+        return self._hash
 
 class Prop(Formula):
-    def __init__(self, name: str):
-        self.name = name
+    __slots__ = _fields = ("name",)
 
     def __repr__(self):
         return self.name
 
 class UnaryOp(Formula):
-    def __init__(self, operand: Formula):
-        self.operand = operand
+    __slots__ = _fields = ("operand",)
 
 class Not(UnaryOp):
+    __slots__ = ()
+
     def __repr__(self):
         return f"¬({self.operand})"
 
 class BinaryOp(Formula):
-    def __init__(self, left: Formula, right: Formula):
-        self.left = left
-        self.right = right
+    __slots__ = _fields = ("left", "right")
 
 class And(BinaryOp):
+    __slots__ = ()
+
     def __repr__(self):
         return f"({self.left} ∧ {self.right})"
 
 class Or(BinaryOp):
+    __slots__ = ()
+
     def __repr__(self):
         return f"({self.left} ∨ {self.right})"
 
 class Implies(BinaryOp):
+    __slots__ = ()
+
     def __repr__(self):
         return f"({self.left} → {self.right})"
 
 # --- Linear Logic Connectives ---
 
 class Tensor(BinaryOp):
+    __slots__ = ()
+
     def __repr__(self):
         return f"({self.left} ⊗ {self.right})"
 
 class Par(BinaryOp):
+    __slots__ = ()
+
     def __repr__(self):
         return f"({self.left} ⅋ {self.right})"
 
 class LinImplies(BinaryOp):
+    __slots__ = ()
+
     def __repr__(self):
         return f"({self.left} ⊸ {self.right})"
 
 class OfCourse(UnaryOp):
+    __slots__ = ()
+
     def __repr__(self):
         return f"!({self.operand})"
 
 class With(BinaryOp):
     """Additive Conjunction"""
+    __slots__ = ()
+
     def __repr__(self):
         return f"({self.left} & {self.right})"
 
 class Plus(BinaryOp):
     """Additive Disjunction"""
+    __slots__ = ()
+
     def __repr__(self):
-        return f"({self.left} ⊕ {self.right})"
\ No newline at end of file
+        return f"({self.left} ⊕ {self.right})"
@@ -12,24 +12,25 @@ The use of this work is subject to the terms of the BSD license, a copy of
 which is included in this project as ISABELLE_LICENSE.
 """
 from typing import Iterable, Optional
-from collections import Counter
 from .formulas import Formula, Tensor, LinImplies, OfCourse, With, Plus
 from .sequents import Sequent
 from .proof import ProofTree, Rule
 
 class ILLSequent(Sequent):
+    __slots__ = ("succedent_formula",)
+
     def __init__(self, antecedent: Iterable[Formula], succedent: Formula):
-        super().__init__(antecedent, [succedent])
-        if len(self.succedent) != 1:
+        if not isinstance(succedent, Formula):
             raise ValueError("ILL sequents must have exactly one formula in the succedent.")
+        super().__init__(antecedent, (succedent,))
+        object.__setattr__(self, "succedent_formula", succedent)
 
-    @property
-    def succedent_formula(self) -> Formula:
-        return list(self.succedent.elements())[0]
+    def _arguments(self):
+        return self.antecedent, self.succedent_formula
 
     def __repr__(self):
         # Overriding for custom representation
-        ant_str = ", ".join(map(str, sorted(list(self.antecedent.elements()), key=str)))
+        ant_str = ", ".join(map(str, sorted(self.antecedent.elements(), key=str)))
         suc_str = str(self.succedent_formula)
         return f"{ant_str} ⊢ {suc_str}"
 
@@ -49,7 +50,7 @@ def cut(left_proof: ProofTree, right_proof: ProofTree) -> ProofTree:
     if cut_formula not in right_proof.conclusion.antecedent:
         raise ValueError("Cut formula not found in the antecedent of the right premise.")
 
-    antecedent = left_proof.conclusion.antecedent + (right_proof.conclusion.antecedent - Counter([cut_formula]))
+    antecedent = left_proof.conclusion.antecedent + right_proof.conclusion.antecedent.minus(cut_formula)
     succedent = right_proof.conclusion.succedent_formula
     conclusion = ILLSequent(antecedent, succedent)
     return ProofTree(conclusion, Rule("Cut"), [left_proof, right_proof])
@@ -72,7 +73,7 @@ def tensor_left(proof: ProofTree, formula: Tensor) -> ProofTree:
     """
     if formula.left not in proof.conclusion.antecedent or formula.right not in proof.conclusion.antecedent:
         raise ValueError("Premise does not contain subformulas for ⊗-L")
-    new_antecedent = (proof.conclusion.antecedent - Counter([formula.left, formula.right])) + Counter([formula])
+    new_antecedent = proof.conclusion.antecedent.minus(formula.left, formula.right).plus(formula)
     conclusion = ILLSequent(new_antecedent, proof.conclusion.succedent_formula)
     return ProofTree(conclusion, Rule("⊗-L"), [proof])
 
@@ -83,7 +84,7 @@ def lin_implies_right(proof: ProofTree, formula: LinImplies) -> ProofTree:
     """
     if formula.left not in proof.conclusion.antecedent or formula.right != proof.conclusion.succedent_formula:
         raise ValueError("Premise does not support conclusion for ⊸-R")
-    new_antecedent = proof.conclusion.antecedent - Counter([formula.left])
+    new_antecedent = proof.conclusion.antecedent.minus(formula.left)
     conclusion = ILLSequent(new_antecedent, formula)
     return ProofTree(conclusion, Rule("⊸-R"), [proof])
 
@@ -94,7 +95,7 @@ def lin_implies_left(left_proof: ProofTree, right_proof: ProofTree, formula: Lin
     """
     if left_proof.conclusion.succedent_formula != formula.left or formula.right not in right_proof.conclusion.antecedent:
         raise ValueError("Premises do not support conclusion for ⊸-L")
-    antecedent = (left_proof.conclusion.antecedent + (right_proof.conclusion.antecedent - Counter([formula.right]))) + Counter([formula])
+    antecedent = (left_proof.conclusion.antecedent + right_proof.conclusion.antecedent.minus(formula.right)).plus(formula)
     succedent = right_proof.conclusion.succedent_formula
     conclusion = ILLSequent(antecedent, succedent)
     return ProofTree(conclusion, Rule("⊸-L"), [left_proof, right_proof])
@@ -119,7 +120,7 @@ def with_left_1(proof: ProofTree, formula: With) -> ProofTree:
     if formula.left not in proof.conclusion.antecedent:
         raise ValueError("Premise does not contain the chosen subformula.")
 
-    new_antecedent = (proof.conclusion.antecedent - Counter([formula.left])) + Counter([formula])
+    new_antecedent = proof.conclusion.antecedent.minus(formula.left).plus(formula)
     conclusion = ILLSequent(new_antecedent, proof.conclusion.succedent_formula)
     return ProofTree(conclusion, Rule("&-L1"), [proof])
 
@@ -131,7 +132,7 @@ def with_left_2(proof: ProofTree, formula: With) -> ProofTree:
     if formula.right not in proof.conclusion.antecedent:
         raise ValueError("Premise does not contain the chosen subformula.")
 
-    new_antecedent = (proof.conclusion.antecedent - Counter([formula.right])) + Counter([formula])
+    new_antecedent = proof.conclusion.antecedent.minus(formula.right).plus(formula)
     conclusion = ILLSequent(new_antecedent, proof.conclusion.succedent_formula)
     return ProofTree(conclusion, Rule("&-L2"), [proof])
 
@@ -166,10 +167,10 @@ def plus_left(left_proof: ProofTree, right_proof: ProofTree, formula: Plus) -> P
         raise ValueError("Premises do not contain the correct subformulas for ⊕-L")
 
     # Contexts must be the same except for the formula being replaced
-    if (left_proof.conclusion.antecedent - Counter([formula.left])) != (right_proof.conclusion.antecedent - Counter([formula.right])):
+    if left_proof.conclusion.antecedent.minus(formula.left) != right_proof.conclusion.antecedent.minus(formula.right):
         raise ValueError("Contexts must be the same for ⊕-L")
 
-    antecedent = (left_proof.conclusion.antecedent - Counter([formula.left])) + Counter([formula])
+    antecedent = left_proof.conclusion.antecedent.minus(formula.left).plus(formula)
     conclusion = ILLSequent(antecedent, left_proof.conclusion.succedent_formula)
     return ProofTree(conclusion, Rule("⊕-L"), [left_proof, right_proof])
 
@@ -194,7 +195,7 @@ def dereliction(proof: ProofTree, formula: OfCourse) -> ProofTree:
     """
     if formula.operand not in proof.conclusion.antecedent:
         raise ValueError("Premise does not contain the derelicted formula.")
-    new_antecedent = (proof.conclusion.antecedent - Counter([formula.operand])) + Counter([formula])
+    new_antecedent = proof.conclusion.antecedent.minus(formula.operand).plus(formula)
     conclusion = ILLSequent(new_antecedent, proof.conclusion.succedent_formula)
     return ProofTree(conclusion, Rule("Dereliction"), [proof])
 
@@ -206,7 +207,7 @@ def contraction(proof: ProofTree, formula: OfCourse) -> ProofTree:
     if proof.conclusion.antecedent[formula] < 2:
          raise ValueError("Premise does not contain two instances of the contracted formula.")
 
-    new_antecedent = proof.conclusion.antecedent - Counter([formula])
+    new_antecedent = proof.conclusion.antecedent.minus(formula)
     conclusion = ILLSequent(new_antecedent, proof.conclusion.succedent_formula)
     return ProofTree(conclusion, Rule("Contraction"), [proof])
 
@@ -215,6 +216,6 @@ def weakening(proof: ProofTree, formula: OfCourse) -> ProofTree:
     ------------
     Γ, !A ⊢ B
     """
-    new_antecedent = proof.conclusion.antecedent + Counter([formula])
+    new_antecedent = proof.conclusion.antecedent.plus(formula)
     conclusion = ILLSequent(new_antecedent, proof.conclusion.succedent_formula)
     return ProofTree(conclusion, Rule("Weakening"), [proof])
\ No newline at end of file
@@ -1,20 +1,19 @@
 from typing import Optional, Iterable
-from collections import Counter
 from .formulas import Formula, And, Or, Implies, Not
 from .sequents import Sequent
 from .proof import ProofTree, Rule
 
 class LJSequent(Sequent):
+    __slots__ = ("succedent_formula",)
+
     def __init__(self, antecedent: Iterable[Formula], succedent: Optional[Formula] = None):
-        super().__init__(antecedent, [succedent] if succedent else [])
-        if len(self.succedent) > 1:
+        if succedent is not None and not isinstance(succedent, Formula):
             raise ValueError("LJ sequents can have at most one formula in the succedent.")
+        super().__init__(antecedent, (succedent,) if succedent is not None else ())
+        object.__setattr__(self, "succedent_formula", succedent)
 
-    @property
-    def succedent_formula(self) -> Optional[Formula]:
-        if not self.succedent:
-            return None
-        return list(self.succedent.elements())[0]
+    def _arguments(self):
+        return self.antecedent, self.succedent_formula
 
     def __repr__(self):
         # Overriding for custom representation
@@ -31,12 +30,12 @@ def axiom(A: Formula) -> ProofTree:
 # Structural Rules
 def weak_left(proof: ProofTree, formula: Formula) -> ProofTree:
     """Γ ⊢ Δ  /  Γ, A ⊢ Δ"""
-    conclusion = LJSequent(proof.conclusion.antecedent + Counter([formula]), proof.conclusion.succedent_formula)
+    conclusion = LJSequent(proof.conclusion.antecedent.plus(formula), proof.conclusion.succedent_formula)
     return ProofTree(conclusion, Rule("Weak-L"), [proof])
 
 def cut(left_proof: ProofTree, right_proof: ProofTree, formula: Formula) -> ProofTree:
     """Γ ⊢ A   and   A, Γ' ⊢ B / Γ, Γ' ⊢ B"""
-    antecedent = (left_proof.conclusion.antecedent + right_proof.conclusion.antecedent) - Counter([formula])
+    antecedent = (left_proof.conclusion.antecedent + right_proof.conclusion.antecedent).minus(formula)
     succedent = right_proof.conclusion.succedent_formula
     conclusion = LJSequent(antecedent, succedent)
     return ProofTree(conclusion, Rule("Cut"), [left_proof, right_proof])
@@ -45,7 +44,7 @@ def cut(left_proof: ProofTree, right_proof: ProofTree, formula: Formula) -> Proo
 # Logical Rules
 def and_left(proof: ProofTree, formula: And) -> ProofTree:
     """Γ, A, B ⊢ Δ / Γ, A ∧ B ⊢ Δ"""
-    new_antecedent = (proof.conclusion.antecedent - Counter([formula.left, formula.right])) + Counter([formula])
+    new_antecedent = proof.conclusion.antecedent.minus(formula.left, formula.right).plus(formula)
     conclusion = LJSequent(new_antecedent, proof.conclusion.succedent_formula)
     return ProofTree(conclusion, Rule("∧-L"), [proof])
 
@@ -58,7 +57,7 @@ def and_right(left_proof: ProofTree, right_proof: ProofTree) -> ProofTree:
 
 def or_left(left_proof: ProofTree, right_proof: ProofTree, formula: Or) -> ProofTree:
     """Γ, A ⊢ Δ   and   Γ, B ⊢ Δ / Γ, A ∨ B ⊢ Δ"""
-    antecedent = (left_proof.conclusion.antecedent - Counter([formula.left])) + (right_proof.conclusion.antecedent - Counter([formula.right])) + Counter([formula])
+    antecedent = left_proof.conclusion.antecedent.minus(formula.left) + right_proof.conclusion.antecedent.minus(formula.right).plus(formula)
     succedent = left_proof.conclusion.succedent_formula # Should be the same in both proofs
     conclusion = LJSequent(antecedent, succedent)
     return ProofTree(conclusion, Rule("∨-L"), [left_proof, right_proof])
@@ -71,25 +70,25 @@ def or_right(proof: ProofTree, formula: Or) -> ProofTree:
 
 def implies_left(left_proof: ProofTree, right_proof: ProofTree, formula: Implies) -> ProofTree:
     """Γ ⊢ A   and   B, Γ' ⊢ C / A → B, Γ, Γ' ⊢ C"""
-    antecedent = (left_proof.conclusion.antecedent + right_proof.conclusion.antecedent) + Counter([formula])
+    antecedent = (left_proof.conclusion.antecedent + right_proof.conclusion.antecedent).plus(formula)
     succedent = right_proof.conclusion.succedent_formula
     conclusion = LJSequent(antecedent, succedent)
     return ProofTree(conclusion, Rule("→-L"), [left_proof, right_proof])
 
 def implies_right(proof: ProofTree, formula: Implies) -> ProofTree:
     """A, Γ ⊢ B / Γ ⊢ A → B"""
-    new_antecedent = proof.conclusion.antecedent - Counter([formula.left])
+    new_antecedent = proof.conclusion.antecedent.minus(formula.left)
     conclusion = LJSequent(new_antecedent, formula)
     return ProofTree(conclusion, Rule("→-R"), [proof])
 
 def not_left(proof: ProofTree, formula: Not) -> ProofTree:
     """Γ ⊢ A / ¬A, Γ ⊢"""
-    new_antecedent = proof.conclusion.antecedent + Counter([formula])
+    new_antecedent = proof.conclusion.antecedent.plus(formula)
     conclusion = LJSequent(new_antecedent, None)
     return ProofTree(conclusion, Rule("¬-L"), [proof])
 
 def not_right(proof: ProofTree, formula: Not) -> ProofTree:
     """A, Γ ⊢ / Γ ⊢ ¬A"""
-    new_antecedent = proof.conclusion.antecedent - Counter([formula.operand])
+    new_antecedent = proof.conclusion.antecedent.minus(formula.operand)
     conclusion = LJSequent(new_antecedent, formula)
     return ProofTree(conclusion, Rule("¬-R"), [proof])
\ No newline at end of file
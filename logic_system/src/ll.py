@@ -1,4 +1,3 @@
-from collections import Counter
 from .formulas import Formula, Tensor, Par
 from .sequents import Sequent
 from .proof import ProofTree, Rule
@@ -22,7 +21,7 @@ def tensor_right(left_proof: ProofTree, right_proof: ProofTree, formula: Tensor)
         raise ValueError("Premises do not support the conclusion for ⊗-R")
 
     antecedent = left_proof.conclusion.antecedent + right_proof.conclusion.antecedent
-    succedent = (left_proof.conclusion.succedent - Counter([A])) + (right_proof.conclusion.succedent - Counter([B])) + Counter([formula])
+    succedent = left_proof.conclusion.succedent.minus(A) + right_proof.conclusion.succedent.minus(B).plus(formula)
     conclusion = Sequent(antecedent, succedent)
     return ProofTree(conclusion, Rule("⊗-R"), [left_proof, right_proof])
 
@@ -33,7 +32,7 @@ def tensor_left(proof: ProofTree, formula: Tensor) -> ProofTree:
     """
     if formula.left not in proof.conclusion.antecedent or formula.right not in proof.conclusion.antecedent:
         raise ValueError("Premises do not support the conclusion for ⊗-L")
-    new_antecedent = (proof.conclusion.antecedent - Counter([formula.left, formula.right])) + Counter([formula])
+    new_antecedent = proof.conclusion.antecedent.minus(formula.left, formula.right).plus(formula)
     conclusion = Sequent(new_antecedent, proof.conclusion.succedent)
     return ProofTree(conclusion, Rule("⊗-L"), [proof])
 
@@ -44,7 +43,7 @@ def par_right(proof: ProofTree, formula: Par) -> ProofTree:
     """
     if formula.left not in proof.conclusion.succedent or formula.right not in proof.conclusion.succedent:
         raise ValueError("Premises do not support the conclusion for ⅋-R")
-    new_succedent = (proof.conclusion.succedent - Counter([formula.left, formula.right])) + Counter([formula])
+    new_succedent = proof.conclusion.succedent.minus(formula.left, formula.right).plus(formula)
     conclusion = Sequent(proof.conclusion.antecedent, new_succedent)
     return ProofTree(conclusion, Rule("⅋-R"), [proof])
 
@@ -58,7 +57,7 @@ def par_left(left_proof: ProofTree, right_proof: ProofTree, formula: Par) -> Pro
     if A not in left_proof.conclusion.antecedent or B not in right_proof.conclusion.antecedent:
         raise ValueError("Premises do not support the conclusion for ⅋-L")
 
-    antecedent = (left_proof.conclusion.antecedent - Counter([A])) + (right_proof.conclusion.antecedent - Counter([B])) + Counter([formula])
+    antecedent = left_proof.conclusion.antecedent.minus(A) + right_proof.conclusion.antecedent.minus(B).plus(formula)
     succedent = left_proof.conclusion.succedent + right_proof.conclusion.succedent
     conclusion = Sequent(antecedent, succedent)
     return ProofTree(conclusion, Rule("⅋-L"), [left_proof, right_proof])
@@ -73,7 +72,7 @@ def cut(left_proof: ProofTree, right_proof: ProofTree) -> ProofTree:
         raise ValueError(f"Cut rule requires exactly one common formula, but found {len(cut_formulas)}")
     cut_formula = list(cut_formulas)[0]
 
-    antecedent = (left_proof.conclusion.antecedent + right_proof.conclusion.antecedent) - Counter([cut_formula])
-    succedent = (left_proof.conclusion.succedent + right_proof.conclusion.succedent) - Counter([cut_formula])
+    antecedent = (left_proof.conclusion.antecedent + right_proof.conclusion.antecedent).minus(cut_formula)
+    succedent = (left_proof.conclusion.succedent + right_proof.conclusion.succedent).minus(cut_formula)
     conclusion = Sequent(antecedent, succedent)
     return ProofTree(conclusion, Rule("Cut"), [left_proof, right_proof])
\ No newline at end of file
@@ -1,11 +1,207 @@
-from collections import Counter
-from typing import Iterable
+from collections.abc import Mapping
+from typing import Iterable, Tuple
 from .formulas import Formula
 
+
+def _by_id(item):
+    return item[0]._id
+
+
+class Multiset(Mapping):
+    """
+    An immutable multiset of formulas in canonical form.
+
+    `key` is the tuple of (formula id, multiplicity) pairs sorted by id (see
+    `Formula._id`), so two multisets are equal exactly when their keys are,
+    and the hash is computed once. Multisets are used like `Counter`s: `+`
+    and `-` follow Counter semantics and accept Counters, `m[formula]` is 0
+    for absent formulas, `len` counts distinct formulas and `elements()`
+    repeats each formula by its multiplicity. A multiset equals a Counter
+    with the same counts.
+    """
+
+    __slots__ = ("key", "_counts", "_hash")
+
+    def __init__(self, formulas=()):
+        if isinstance(formulas, Mapping):
+            counts = {f: n for f, n in formulas.items() if n > 0}
+        else:
+            counts = {}
+            for f in formulas:
+                counts[f] = counts.get(f, 0) + 1
+        self._build(counts)
+
+    @classmethod
+    def of(cls, formulas) -> "Multiset":
+        """`formulas` itself if it is already a multiset, else its multiset."""
+        return formulas if isinstance(formulas, Multiset) else cls(formulas)
+
+    @classmethod
+    def _from_counts(cls, counts: dict) -> "Multiset":
+        multiset = object.__new__(cls)
+        multiset._build(counts)
+        return multiset
+
+    def _build(self, counts: dict) -> None:
+        ordered = sorted(counts.items(), key=_by_id)
+        key = tuple((f._id, n) for f, n in ordered)
+        object.__setattr__(self, "_counts", dict(ordered))
+        object.__setattr__(self, "key", key)
+        object.__setattr__(self, "_hash", hash(key))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Multisets are immutable")
+
+    def __reduce__(self):
+        return Multiset, (self._counts,)
+
+    # --- Mapping protocol, with Counter semantics ---
+
+    def __getitem__(self, formula) -> int:
+        return self._counts.get(formula, 0)
+
+    def get(self, formula, default=None):
+        return self._counts.get(formula, default)
+
+    def __contains__(self, formula) -> bool:
+        return formula in self._counts
+
+    def __iter__(self):
+        return iter(self._counts)
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def elements(self) -> Tuple[Formula, ...]:
+        """Every formula, repeated by its multiplicity, in canonical order."""
+        return tuple(f for f, n in self._counts.items() for _ in range(n))
+
+    @property
+    def size(self) -> int:
+        """The number of formulas, counting multiplicity."""
+        return sum(self._counts.values())
+
+    def sub_multisets(self):
+        """
+        Generates every sub-multiset exactly once, smallest first: one per
+        choice of how many copies of each distinct formula to take, so n
+        copies of a formula give n + 1 choices rather than 2^n subsets.
+        """
+        items = tuple(self._counts.items())
+        # capacity[i]: how many formulas items[i:] hold in total.
+        capacity = [0] * (len(items) + 1)
+        for i in range(len(items) - 1, -1, -1):
+            capacity[i] = capacity[i + 1] + items[i][1]
+
+        def choose(i, size):
+            if size > capacity[i]:
+                return
+            if i == len(items):
+                yield {}
+                return
+            formula, count = items[i]
+            for taken in range(min(count, size) + 1):
+                for rest in choose(i + 1, size - taken):
+                    if taken:
+                        rest[formula] = taken
+                    yield rest
+
+        for size in range(capacity[0] + 1):
+            for counts in choose(0, size):
+                yield Multiset._from_counts(counts)
+
+    # --- Arithmetic ---
+
+    def plus(self, *formulas: Formula) -> "Multiset":
+        """This multiset with one more occurrence of each of `formulas`."""
+        counts = dict(self._counts)
+        for f in formulas:
+            counts[f] = counts.get(f, 0) + 1
+        return Multiset._from_counts(counts)
+
+    def minus(self, *formulas: Formula) -> "Multiset":
+        """This multiset with one occurrence fewer of each of `formulas` that it contains."""
+        counts = dict(self._counts)
+        for f in formulas:
+            n = counts.get(f, 0)
+            if n > 1:
+                counts[f] = n - 1
+            elif n:
+                del counts[f]
+        return Multiset._from_counts(counts)
+
+    def __add__(self, other):
+        if not isinstance(other, Mapping):
+            return NotImplemented
+        counts = dict(self._counts)
+        for f, n in other.items():
+            total = counts.get(f, 0) + n
+            if total > 0:
+                counts[f] = total
+            else:
+                counts.pop(f, None)
+        return Multiset._from_counts(counts)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        if not isinstance(other, Mapping):
+            return NotImplemented
+        counts = dict(self._counts)
+        for f, n in other.items():
+            remaining = counts.get(f, 0) - n
+            if remaining > 0:
+                counts[f] = remaining
+            else:
+                counts.pop(f, None)
+        return Multiset._from_counts(counts)
+
+    def __rsub__(self, other):
+        if not isinstance(other, Mapping):
+            return NotImplemented
+        return Multiset(other) - self
+
+    # --- Comparison ---
+
+    def __eq__(self, other):
+        if isinstance(other, Multiset):
+            return self._hash == other._hash and self.key == other.key
+        if isinstance(other, Mapping):
+            return self._counts == {f: n for f, n in other.items() if n > 0}
+        return NotImplemented
+
+    def __hash__(self):
+        return self._hash
+
+    def __repr__(self):
+        items = ", ".join(f"{f}: {n}" for f, n in self._counts.items())
+        return f"Multiset({{{items}}})"
+
+
 class Sequent:
+    """
+    An immutable sequent Γ ⊢ Δ. Both sides are `Multiset`s and the hash is
+    computed once, from their cached hashes. Sequents of different classes,
+    such as an `ILLSequent` and a `Sequent` with the same sides, are never
+    equal.
+    """
+
+    __slots__ = ("antecedent", "succedent", "_hash")
+
     def __init__(self, antecedent: Iterable[Formula], succedent: Iterable[Formula]):
-        self.antecedent = Counter(antecedent)
-        self.succedent = Counter(succedent)
+        object.__setattr__(self, "antecedent", Multiset.of(antecedent))
+        object.__setattr__(self, "succedent", Multiset.of(succedent))
+        object.__setattr__(self, "_hash", hash((type(self), self.antecedent, self.succedent)))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Sequents are immutable")
+
+    def _arguments(self):
+        """The constructor arguments that rebuild this sequent."""
+        return self.antecedent, self.succedent
+
+    def __reduce__(self):
+        return type(self), self._arguments()
 
     def __repr__(self):
         def format_multiset(multiset):
@@ -22,10 +218,13 @@ class Sequent:
         return f"{ant_str} ⊢ {suc_str}"
 
     def __eq__(self, other):
-        return self.antecedent == other.antecedent and self.succedent == other.succedent
+        if not isinstance(other, Sequent):
+            return NotImplemented
+        return (
+            type(self) is type(other)
+            and self._hash == other._hash
+            and self._arguments() == other._arguments()
+        )
 
     def __hash__(self):
-        # Counter is not hashable, so we convert to a frozenset of items
-        ant_items = frozenset(self.antecedent.items())
-        suc_items = frozenset(self.succedent.items())
-        return hash((ant_items, suc_items))
\ No newline at end of file
+        return self._hash
@@ -1,118 +1,233 @@
+from typing import Dict, Optional, Set, Tuple
 from . import ill
 from .proof import ProofTree, Rule
-from .sequents import Sequent
+from .sequents import Multiset, Sequent
 from .formulas import Formula, LinImplies, OfCourse, With, Plus, Tensor
-from collections import Counter
-from itertools import combinations
+from .focused import FocusedSearch
+
+STRATEGIES = ("exhaustive", "focused")
 
 class Synthesizer:
-    def __init__(self, logic_module=ill):
+    """
+    Backward proof search with tabling.
+
+    Results are tabled by sequent and shared by every branch and every call
+    on the same synthesizer. A proof is recorded with the depth it needs and
+    reused wherever its sequent comes up again with at least that depth, so
+    results do not depend on what earlier searches found. A failure is
+    recorded with the depth it was searched to, which also settles the
+    sequent for any smaller depth.
+    `synthesize` deepens the search one level at a time up to `max_depth`,
+    so shallow proofs are found first and each iteration starts from the
+    failures of the previous ones.
+
+    A goal that reappears on its own branch is cut. Failures below such a
+    cut are not tabled, since they may only hold because of it.
+
+    `strategy` selects the search. "exhaustive" tries every rule that
+    applies to every goal, with depth counting rules. "focused" runs the
+    focused search of `focused.FocusedSearch` on `ill` sequents, with depth
+    counting focus decisions; it also covers the additive rules and never
+    tries contraction or weakening on its own. `nodes` counts the sequents
+    either strategy applies rules to.
+    """
+
+    def __init__(self, logic_module=ill, tabling: bool = True, strategy: str = "exhaustive"):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown strategy {strategy!r}; expected one of {', '.join(STRATEGIES)}")
+        if strategy == "focused" and logic_module is not ill:
+            raise ValueError("The focused strategy only searches ILL sequents")
         self.logic = logic_module
-
-    def _get_partitions(self, multiset):
-        """Generator for all 2-partitions of a multiset."""
-        elements = list(multiset.elements())
-        for i in range(len(elements) // 2 + 1):
-            for combo1 in combinations(elements, i):
-                c1 = Counter(combo1)
-                c2 = multiset - c1
-                yield c1, c2
-
-    def synthesize(self, goal: Sequent, max_depth=10, visited=None) -> ProofTree:
-        if visited is None:
-            visited = set()
-
-        if goal in visited:
-            raise RecursionError("Already visited this goal")
-
-        visited.add(goal)
-
+        self.tabling = tabling
+        self.strategy = strategy
+        self._focused = FocusedSearch(logic_module, tabling) if strategy == "focused" else None
+        # Each proof and the depth it needs: an upper bound on the rules on its branches.
+        self._proofs: Dict[Sequent, Tuple[ProofTree, int]] = {}
+        # The deepest search that failed for each sequent.
+        self._failures: Dict[Sequent, int] = {}
+        # The depth needed by the proofs found so far under the current goal.
+        self._needed = 0
+        self._cuts = 0
+        self.proof_hits = 0
+        self.failure_hits = 0
+        self.misses = 0
+        self.nodes = 0
+
+    def _distribute(self, context: Multiset, formula: Formula, depth: int, path: Set[Sequent]):
+        """
+        Lazily splits `context` for a two-premise rule whose first premise
+        must prove `formula`, yielding `(proof, leftover)` for each split
+        that proves it; the leftover context goes to the second premise.
+
+        Only the linear part of the context is split. The `!` formulas go to
+        both premises, since either can weaken away what it does not use;
+        `_contract` merges the copies again in the conclusion.
+        """
+        linear = Multiset({f: n for f, n in context.items() if not isinstance(f, OfCourse)})
+        shared = context - linear
+        for used in linear.sub_multisets():
+            proof = self._prove(self.logic.ILLSequent(used + shared, formula), depth, path)
+            if proof is not None:
+                yield proof, (linear - used) + shared
+
+    def _contract(self, proof: ProofTree, context: Multiset) -> ProofTree:
+        """Contracts the `!` formulas of `context` that `_distribute` gave to both premises."""
+        for formula, count in context.items():
+            if isinstance(formula, OfCourse):
+                for _ in range(count):
+                    proof = self.logic.contraction(proof, formula)
+        return proof
+
+    def synthesize(self, goal: Sequent, max_depth=10) -> ProofTree:
         if max_depth <= 0:
             raise RecursionError("Max depth reached during synthesis")
 
+        for depth in range(1, max_depth + 1):
+            if self._focused is not None:
+                proof = self._focused.prove(goal, depth)
+            else:
+                proof = self._prove(goal, depth, set())
+            if proof is not None:
+                return proof
+
+        raise ValueError(f"Could not synthesize a proof for goal: {goal}")
+
+    def _prove(self, goal: Sequent, depth: int, path: Set[Sequent]) -> Optional[ProofTree]:
+        """A proof of `goal` using at most `depth` rules on any branch, or None."""
+        if self.tabling:
+            entry = self._proofs.get(goal)
+            if entry is not None and entry[1] <= depth:
+                self.proof_hits += 1
+                self._needed = max(self._needed, entry[1])
+                return entry[0]
+            if self._failures.get(goal, 0) >= depth:
+                self.failure_hits += 1
+                return None
+            self.misses += 1
+
+        if goal in path:
+            self._cuts += 1
+            return None
+        if depth <= 0:
+            return None
+
+        cuts, outer = self._cuts, self._needed
+        self._needed = 0
+        path.add(goal)
+        try:
+            proof = self._expand(goal, depth, path)
+        finally:
+            path.discard(goal)
+            needed, self._needed = self._needed + 1, outer
+        if proof is not None:
+            self._needed = max(outer, needed)
+
+        if self.tabling:
+            if proof is not None:
+                self._proofs[goal] = (proof, needed)
+            elif self._cuts == cuts:
+                self._failures[goal] = depth
+        return proof
+
+    def _expand(self, goal: Sequent, depth: int, path: Set[Sequent]) -> Optional[ProofTree]:
+        self.nodes += 1
+        depth -= 1
+
         # --- Axiom Rule ---
-        if len(goal.antecedent) == 1 and len(goal.succedent) == 1:
-            ant = list(goal.antecedent.elements())[0]
-            suc = list(goal.succedent.elements())[0]
-            if ant == suc:
-                return self.logic.axiom(ant)
+        antecedent = goal.antecedent.elements()
+        if len(antecedent) == 1 and antecedent[0] == goal.succedent_formula:
+            return self.logic.axiom(antecedent[0])
 
         # --- Right Rules ---
         succedent_formula = goal.succedent_formula
 
         if isinstance(succedent_formula, LinImplies):
             formula = succedent_formula
-            new_goal = self.logic.ILLSequent(goal.antecedent + Counter([formula.left]), formula.right)
-            try:
-                premise_proof = self.synthesize(new_goal, max_depth - 1, visited)
-                return self.logic.lin_implies_right(premise_proof, formula)
-            except (ValueError, RecursionError):
-                pass
+            new_goal = self.logic.ILLSequent(goal.antecedent.plus(formula.left), formula.right)
+            premise_proof = self._prove(new_goal, depth, path)
+            if premise_proof is not None:
+                try:
+                    return self.logic.lin_implies_right(premise_proof, formula)
+                except ValueError:
+                    pass
 
         if isinstance(succedent_formula, Tensor):
             formula = succedent_formula
-            for ant_part1, ant_part2 in self._get_partitions(goal.antecedent):
+            for premise1, leftover in self._distribute(goal.antecedent, formula.left, depth, path):
+                premise2 = self._prove(self.logic.ILLSequent(leftover, formula.right), depth, path)
+                if premise2 is None:
+                    continue
                 try:
-                    goal1 = self.logic.ILLSequent(ant_part1, formula.left)
-                    goal2 = self.logic.ILLSequent(ant_part2, formula.right)
-                    premise1 = self.synthesize(goal1, max_depth - 1, visited)
-                    premise2 = self.synthesize(goal2, max_depth - 1, visited)
-                    return self.logic.tensor_right(premise1, premise2)
-                except (ValueError, RecursionError):
+                    return self._contract(self.logic.tensor_right(premise1, premise2), goal.antecedent)
+                except ValueError:
                     continue
 
         if isinstance(succedent_formula, OfCourse):
             formula = succedent_formula
             if all(isinstance(f, OfCourse) for f in goal.antecedent):
                 new_goal = self.logic.ILLSequent(goal.antecedent, formula.operand)
-                try:
-                    premise_proof = self.synthesize(new_goal, max_depth - 1, visited)
-                    return self.logic.of_course_right(premise_proof)
-                except (ValueError, RecursionError):
-                    pass
+                premise_proof = self._prove(new_goal, depth, path)
+                if premise_proof is not None:
+                    try:
+                        return self.logic.of_course_right(premise_proof)
+                    except ValueError:
+                        pass
 
         # --- Left Rules ---
-        for ant_formula in list(goal.antecedent.elements()):
+        for ant_formula in goal.antecedent:
             if isinstance(ant_formula, OfCourse):
-                # Dereliction
-                new_antecedent = (goal.antecedent - Counter([ant_formula])) + Counter([ant_formula.operand])
-                new_goal = self.logic.ILLSequent(new_antecedent, succedent_formula)
-                try:
-                    premise_proof = self.synthesize(new_goal, max_depth - 1, visited)
-                    return self.logic.dereliction(premise_proof, ant_formula)
-                except (ValueError, RecursionError):
-                    pass
-
-                # Contraction
-                new_antecedent = goal.antecedent + Counter([ant_formula])
-                new_goal = self.logic.ILLSequent(new_antecedent, succedent_formula)
-                try:
-                    premise_proof = self.synthesize(new_goal, max_depth - 1, visited)
-                    return self.logic.contraction(premise_proof, ant_formula)
-                except (ValueError, RecursionError):
-                    pass
-
-                # Weakening
-                new_antecedent = goal.antecedent - Counter([ant_formula])
-                new_goal = self.logic.ILLSequent(new_antecedent, succedent_formula)
-                try:
-                    premise_proof = self.synthesize(new_goal, max_depth - 1, visited)
-                    return self.logic.weakening(premise_proof, ant_formula)
-                except (ValueError, RecursionError):
-                    pass
-
+                for rule, new_antecedent in (
+                    # Dereliction
+                    (self.logic.dereliction, goal.antecedent.minus(ant_formula).plus(ant_formula.operand)),
+                    # Contraction
+                    (self.logic.contraction, goal.antecedent.plus(ant_formula)),
+                    # Weakening
+                    (self.logic.weakening, goal.antecedent.minus(ant_formula)),
+                ):
+                    new_goal = self.logic.ILLSequent(new_antecedent, succedent_formula)
+                    premise_proof = self._prove(new_goal, depth, path)
+                    if premise_proof is not None:
+                        try:
+                            return rule(premise_proof, ant_formula)
+                        except ValueError:
+                            pass
 
             if isinstance(ant_formula, LinImplies):
                 formula = ant_formula
-                remaining_antecedent = goal.antecedent - Counter([formula])
-                for part1, part2 in self._get_partitions(remaining_antecedent):
+                remaining_antecedent = goal.antecedent.minus(formula)
+                for premise1, leftover in self._distribute(remaining_antecedent, formula.left, depth, path):
+                    goal2 = self.logic.ILLSequent(leftover.plus(formula.right), succedent_formula)
+                    premise2 = self._prove(goal2, depth, path)
+                    if premise2 is None:
+                        continue
                     try:
-                        goal1 = self.logic.ILLSequent(part1, formula.left)
-                        goal2 = self.logic.ILLSequent(part2 + Counter([formula.right]), succedent_formula)
-                        premise1 = self.synthesize(goal1, max_depth - 1, visited)
-                        premise2 = self.synthesize(goal2, max_depth - 1, visited)
-                        return self.logic.lin_implies_left(premise1, premise2, formula)
-                    except (ValueError, RecursionError):
+                        proof = self.logic.lin_implies_left(premise1, premise2, formula)
+                        return self._contract(proof, remaining_antecedent)
+                    except ValueError:
                         continue
 
-        raise ValueError(f"Could not synthesize a proof for goal: {goal}")
\ No newline at end of file
+        return None
+
+    # --- Table management ---
+
+    def clear(self) -> None:
+        """Forgets every tabled result and resets the counters."""
+        self._proofs.clear()
+        self._failures.clear()
+        self.proof_hits = self.failure_hits = self.misses = self.nodes = 0
+        if self._focused is not None:
+            self._focused.clear()
+
+    def stats(self) -> Dict[str, float]:
+        """The table's size, hit counters and node count."""
+        search = self._focused or self
+        lookups = search.proof_hits + search.failure_hits + search.misses
+        return {
+            "proofs": len(search._proofs),
+            "failures": len(search._failures),
+            "proof_hits": search.proof_hits,
+            "failure_hits": search.failure_hits,
+            "misses": search.misses,
+            "nodes": search.nodes,
+            "hit_rate": (search.proof_hits + search.failure_hits) / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,49 @@
+import copy
+import pickle
+import unittest
+from collections import Counter
+from logic_system.src.formulas import Prop, Tensor, LinImplies, OfCourse, With, Plus
+
+class TestFormulas(unittest.TestCase):
+
+    def test_structurally_equal_formulas_are_identical(self):
+        A = Prop("A")
+        self.assertIs(Prop("A"), A)
+        self.assertIs(Prop(name="A"), A)
+        self.assertIs(LinImplies(Prop("A"), Tensor(Prop("B"), Prop("A"))),
+                      LinImplies(A, Tensor(Prop("B"), A)))
+        self.assertIsNot(With(A, A), Plus(A, A))
+        self.assertNotEqual(With(A, A), Plus(A, A))
+
+    def test_hash_is_structural(self):
+        A, B = Prop("A"), Prop("B")
+        self.assertEqual(hash(A), hash(("Prop", "A")))
+        self.assertEqual(hash(Tensor(A, B)), hash(("Tensor", A, B)))
+
+    def test_formulas_are_immutable(self):
+        A = Prop("A")
+        with self.assertRaises(AttributeError):
+            A.name = "B"
+        with self.assertRaises(AttributeError):
+            del OfCourse(A).operand
+        with self.assertRaises(AttributeError):
+            A.extra = 1
+
+    def test_copies_are_interned(self):
+        formula = LinImplies(OfCourse(Prop("A")), Prop("B"))
+        self.assertIs(pickle.loads(pickle.dumps(formula)), formula)
+        self.assertIs(copy.deepcopy(formula), formula)
+
+    def test_counter_multisets(self):
+        A = Prop("A")
+        self.assertEqual(Counter([A, Prop("A"), OfCourse(A)]), Counter({A: 2, OfCourse(A): 1}))
+
+    def test_wrong_arguments(self):
+        with self.assertRaises(TypeError):
+            Tensor(Prop("A"))
+        with self.assertRaises(TypeError):
+            Prop(label="A")
+
+
+if __name__ == '__main__':
+    unittest.main()
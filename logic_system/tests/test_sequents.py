@@ -0,0 +1,67 @@
+import pickle
+import unittest
+from collections import Counter
+from logic_system.src.formulas import Prop, LinImplies, OfCourse
+from logic_system.src.sequents import Multiset, Sequent
+from logic_system.src.ill import ILLSequent
+from logic_system.src.lj import LJSequent
+
+class TestSequents(unittest.TestCase):
+
+    def setUp(self):
+        self.A, self.B = Prop("A"), Prop("B")
+
+    def test_multiset_is_canonical(self):
+        A, B = self.A, self.B
+        first, second = Multiset([A, B, A]), Multiset([B, A, A])
+        self.assertEqual(first.key, second.key)
+        self.assertEqual(first.key, tuple(sorted([(A._id, 2), (B._id, 1)])))
+        self.assertEqual(hash(first), hash(second))
+        self.assertEqual(first, Counter({A: 2, B: 1}))
+        self.assertEqual(Multiset(Counter({A: 2, B: 0})), Multiset([A, A]))
+
+    def test_multiset_arithmetic(self):
+        A, B = self.A, self.B
+        multiset = Multiset([A, B])
+        self.assertEqual(multiset.plus(A), Multiset([A, A, B]))
+        self.assertEqual(multiset.minus(A, A), Multiset([B]))
+        self.assertEqual(multiset + Counter([A]), Multiset([A, A, B]))
+        self.assertEqual(Counter([A]) + multiset, Multiset([A, A, B]))
+        self.assertEqual(multiset - Counter([B, B]), Multiset([A]))
+        self.assertEqual(Counter([A, A]) - multiset, Multiset([A]))
+        self.assertEqual((multiset[A], multiset[LinImplies(A, B)]), (1, 0))
+        self.assertNotIn(LinImplies(A, B), multiset)
+        self.assertEqual(multiset.plus(A).size, 3)
+        self.assertEqual(len(multiset.plus(A)), 2)
+        self.assertEqual(Multiset([B, A, A]).elements(), (A, A, B))
+        with self.assertRaises(AttributeError):
+            multiset.key = ()
+
+    def test_sequents_share_multisets(self):
+        A, B = self.A, self.B
+        sequent = ILLSequent([A, OfCourse(B)], B)
+        self.assertIs(sequent.succedent_formula, B)
+        self.assertIs(ILLSequent(sequent.antecedent, A).antecedent, sequent.antecedent)
+        self.assertEqual(sequent, ILLSequent([OfCourse(B), A], B))
+        self.assertEqual(hash(sequent), hash(ILLSequent([OfCourse(B), A], B)))
+        # The same sides in a sequent of another class are a different sequent.
+        for other in (Sequent([OfCourse(B), A], [B]), LJSequent([OfCourse(B), A], B)):
+            self.assertNotEqual(sequent, other)
+            self.assertNotEqual(other, sequent)
+        self.assertEqual(len({sequent, Sequent([OfCourse(B), A], [B])}), 2)
+        self.assertIsNone(LJSequent([A]).succedent_formula)
+        with self.assertRaises(AttributeError):
+            sequent.succedent_formula = A
+        with self.assertRaises(ValueError):
+            ILLSequent([A], None)
+
+    def test_sequents_pickle(self):
+        sequent = ILLSequent([self.A, self.A], LinImplies(self.A, self.B))
+        copy = pickle.loads(pickle.dumps(sequent))
+        self.assertIsInstance(copy, ILLSequent)
+        self.assertEqual(copy, sequent)
+        self.assertIs(copy.succedent_formula, sequent.succedent_formula)
+
+
+if __name__ == '__main__':
+    unittest.main()
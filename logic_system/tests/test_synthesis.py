@@ -1,9 +1,10 @@
 import unittest
 from collections import Counter
-from logic_system.src.formulas import Prop, LinImplies, OfCourse, Tensor
+from logic_system.src.formulas import Prop, LinImplies, OfCourse, Tensor, With, Plus
 from logic_system.src.ill import ILLSequent, axiom
 from logic_system.src.synthesizer import Synthesizer
 from logic_system.src.proof import ProofTree
+from logic_system.src.sequents import Multiset
 
 class TestSynthesis(unittest.TestCase):
 
@@ -47,6 +48,162 @@ class TestSynthesis(unittest.TestCase):
         self.assertEqual(proof.premises[0].conclusion, ILLSequent([A], A))
         self.assertEqual(proof.premises[1].conclusion, ILLSequent([B], B))
 
+    def test_sibling_branches_reuse_subgoals(self):
+        """!A ⊢ A ⊗ A proves !A ⊢ A in both branches of ⊗-R."""
+        A = Prop("A")
+        proof = self.synthesizer.synthesize(ILLSequent([OfCourse(A)], Tensor(A, A)))
+        self.assertEqual(proof.rule.name, "Contraction")
+        tensor = proof.premises[0]
+        self.assertEqual(tensor.rule.name, "⊗-R")
+        self.assertIs(tensor.premises[0], tensor.premises[1])
+
+    def test_table_is_reused_across_calls(self):
+        A = Prop("A")
+        goal = ILLSequent([OfCourse(A), LinImplies(A, LinImplies(A, Prop("B")))], Prop("B"))
+        proof = self.synthesizer.synthesize(goal)
+        misses = self.synthesizer.stats()["misses"]
+        self.assertIs(self.synthesizer.synthesize(goal), proof)
+        stats = self.synthesizer.stats()
+        self.assertEqual(stats["misses"], misses)
+        self.assertGreater(stats["proof_hits"], 0)
+        self.assertGreater(stats["failure_hits"], 0)
+        self.assertGreater(stats["hit_rate"], 0.5)
+
+        self.synthesizer.clear()
+        self.assertEqual(self.synthesizer.stats()["proofs"], 0)
+
+    def test_failures_are_tabled_by_depth(self):
+        A, B = Prop("A"), Prop("B")
+        goal = ILLSequent([OfCourse(A)], Tensor(A, B))
+        with self.assertRaises(ValueError):
+            self.synthesizer.synthesize(goal, max_depth=3)
+        self.assertEqual(self.synthesizer._failures[goal], 3)
+        misses = self.synthesizer.misses
+        with self.assertRaises(ValueError):
+            self.synthesizer.synthesize(goal, max_depth=3)
+        self.assertEqual(self.synthesizer.misses, misses)
+        # A deeper search is not answered from the shallower failure.
+        with self.assertRaises(ValueError):
+            self.synthesizer.synthesize(goal, max_depth=4)
+        self.assertEqual(self.synthesizer._failures[goal], 4)
+
+    def test_tabled_proofs_respect_depth(self):
+        A, B, C = Prop("A"), Prop("B"), Prop("C")
+        goal = ILLSequent([A, LinImplies(A, B), LinImplies(B, C)], C)
+        for strategy in ("exhaustive", "focused"):
+            needed = next(
+                depth for depth in range(1, 10)
+                if self._proves(Synthesizer(strategy=strategy), goal, depth)
+            )
+            synthesizer = Synthesizer(strategy=strategy)
+            self.assertTrue(self._proves(synthesizer, goal, needed))
+            # The tabled proof needs more depth than a shallower search allows.
+            self.assertFalse(self._proves(synthesizer, goal, needed - 1))
+            self.assertTrue(self._proves(synthesizer, goal, needed))
+
+    @staticmethod
+    def _proves(synthesizer, goal, max_depth):
+        try:
+            return synthesizer.synthesize(goal, max_depth=max_depth).conclusion == goal
+        except ValueError:
+            return False
+
+    def test_iterative_deepening_finds_shallowest_proof(self):
+        A = Prop("A")
+        goal = ILLSequent([A], A)
+        untabled = Synthesizer(tabling=False)
+        for synthesizer in (self.synthesizer, untabled):
+            self.assertEqual(synthesizer.synthesize(goal, max_depth=5).rule.name, "Axiom")
+        self.assertEqual(untabled.stats()["proofs"], 0)
+        with self.assertRaises(RecursionError):
+            self.synthesizer.synthesize(goal, max_depth=0)
+
+    def test_sub_multisets_are_distinct(self):
+        A, B = Prop("A"), Prop("B")
+        context = Multiset([A, A, A, B])
+        subs = list(context.sub_multisets())
+        # (3 + 1) choices for A times (1 + 1) for B, each once, smallest first.
+        self.assertEqual(len(subs), 8)
+        self.assertEqual(len(set(subs)), 8)
+        self.assertEqual([sub.size for sub in subs], sorted(sub.size for sub in subs))
+        self.assertEqual(subs[0], Multiset())
+        self.assertEqual(subs[-1], context)
+
+    def test_context_splits(self):
+        A, B, C = Prop("A"), Prop("B"), Prop("C")
+        goals = [
+            # The first premise of ⊸-L needs more than half of the context.
+            ILLSequent([A, LinImplies(A, B), LinImplies(B, C)], C),
+            ILLSequent([A, B, C], Tensor(Tensor(A, B), C)),
+            # The ! formula is needed by both premises.
+            ILLSequent([OfCourse(A), B], Tensor(Tensor(A, B), A)),
+            ILLSequent([OfCourse(A), LinImplies(A, LinImplies(A, B))], B),
+        ]
+        for goal in goals:
+            self.assertEqual(self.synthesizer.synthesize(goal).conclusion, goal)
+
+    def test_repeated_atoms_branch_polynomially(self):
+        A = Prop("A")
+        tower = A
+        for _ in range(9):
+            tower = Tensor(A, tower)
+        goal = ILLSequent([A] * 10, tower)
+        self.assertEqual(self.synthesizer.synthesize(goal, max_depth=11).conclusion, goal)
+        stats = self.synthesizer.stats()
+        # Enumerating every subset of the ten copies took over 8000 lookups.
+        self.assertLess(stats["proof_hits"] + stats["failure_hits"] + stats["misses"], 500)
+
+    def test_focused_strategy_agrees_with_exhaustive(self):
+        A, B, C = Prop("A"), Prop("B"), Prop("C")
+        goals = [
+            (ILLSequent([A], LinImplies(B, Tensor(A, B))), True),
+            (ILLSequent([A, LinImplies(A, B), LinImplies(B, C)], C), True),
+            (ILLSequent([OfCourse(A), B], Tensor(Tensor(A, B), A)), True),
+            (ILLSequent([OfCourse(A), OfCourse(B)], OfCourse(Tensor(A, B))), True),
+            (ILLSequent([OfCourse(A), OfCourse(A)], A), True),
+            (ILLSequent([A], Tensor(A, A)), False),
+            (ILLSequent([A, B], A), False),
+            (ILLSequent([OfCourse(LinImplies(A, A))], B), False),
+        ]
+        for goal, provable in goals:
+            for strategy in ("exhaustive", "focused"):
+                synthesizer = Synthesizer(strategy=strategy)
+                if provable:
+                    self.assertEqual(synthesizer.synthesize(goal, max_depth=6).conclusion, goal)
+                else:
+                    with self.assertRaises(ValueError):
+                        synthesizer.synthesize(goal, max_depth=6)
+
+    def test_focused_strategy_uses_invertible_and_additive_rules(self):
+        A, B = Prop("A"), Prop("B")
+        synthesizer = Synthesizer(strategy="focused")
+        for goal in [
+            ILLSequent([Tensor(A, B)], Tensor(B, A)),
+            ILLSequent([With(A, B)], B),
+            ILLSequent([A], Plus(B, A)),
+            ILLSequent([Plus(A, B)], Plus(B, A)),
+            ILLSequent([A], With(A, Plus(A, B))),
+        ]:
+            self.assertEqual(synthesizer.synthesize(goal).conclusion, goal)
+        proof = synthesizer.synthesize(ILLSequent([Tensor(A, B)], Tensor(B, A)))
+        self.assertEqual(proof.rule.name, "⊗-L")
+
+    def test_focused_strategy_does_not_loop_on_bangs(self):
+        atoms = [Prop(f"A{i}") for i in range(4)]
+        banged = [OfCourse(LinImplies(atoms[i], atoms[i + 1])) for i in range(3)]
+        goal = ILLSequent([atoms[0]] + banged, atoms[3])
+        nodes = {}
+        for strategy in ("exhaustive", "focused"):
+            synthesizer = Synthesizer(strategy=strategy)
+            self.assertEqual(synthesizer.synthesize(goal).conclusion, goal)
+            nodes[strategy] = synthesizer.stats()["nodes"]
+        # Dereliction, contraction and weakening on every ! formula take hundreds of nodes.
+        self.assertLess(nodes["focused"] * 5, nodes["exhaustive"])
+
+    def test_unknown_strategy(self):
+        with self.assertRaises(ValueError):
+            Synthesizer(strategy="random")
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -1,6 +1,66 @@
 import re
+from functools import lru_cache
+from typing import Iterator, NamedTuple
 from appl_ast import *
 
+# Token kinds produced by `tokenize`.
+INT = "INT"
+STRING = "STRING"
+NAME = "NAME"
+SYMBOL = "SYMBOL"
+
+# A single compiled scanner. Alternatives are tried in order at each position,
+# so multi-character symbols must precede their prefixes.
+_TOKEN_RE = re.compile(r"""
+    (?P<SKIP>\s+|//[^\n]*)
+  | (?P<STRING>"[^"]*")
+  | (?P<SYMBOL>::|:|\(|\)|,|=>|->|=|\*|\+|!|\|)
+  | (?P<WORD>\w+)
+  | (?P<ERROR>.)
+""", re.VERBOSE)
+
+# Tokens that end an application spine.
+STOP_TOKENS = frozenset([
+    ',', ')', 'in', 'of', '|', '=>', 'EOF', '=',
+    'let', 'case', 'fn', 'inl', 'inr', '::', ':',
+])
+
+# Tokens that can never be parsed as a variable.
+RESERVED_TOKENS = frozenset([
+    'let', 'in', 'case', 'of', 'inl', 'inr', 'fn',
+    '(', ')', ',', '=>', '|', '!', '=', '*', '+', '->', '::', ':',
+])
+
+
+class Token(NamedTuple):
+    kind: str
+    value: str
+    line: int
+    column: int
+
+
+def tokenize(s: str) -> Iterator[Token]:
+    """Scans `s` in a single pass, yielding typed tokens with 1-based positions."""
+    line = 1
+    line_start = 0
+    for match in _TOKEN_RE.finditer(s):
+        kind = match.lastgroup
+        value = match.group()
+        start = match.start()
+        if kind == 'SKIP':
+            newlines = value.count('\n')
+            if newlines:
+                line += newlines
+                line_start = start + value.rindex('\n') + 1
+            continue
+        column = start - line_start + 1
+        if kind == 'WORD':
+            kind = INT if value.isdigit() else NAME
+        elif kind == 'ERROR':
+            raise ValueError(f"Unexpected character '{value}' at line {line}, column {column}")
+        yield Token(kind, value, line, column)
+
+
 class Parser:
     def __init__(self, tokens):
         self.tokens = tokens
@@ -8,26 +68,36 @@ class Parser:
 
     def peek(self):
         if self.pos < len(self.tokens):
-            return self.tokens[self.pos]
+            return self.tokens[self.pos].value
+        return None
+
+    def peek_kind(self):
+        if self.pos < len(self.tokens):
+            return self.tokens[self.pos].kind
         return None
 
     def consume(self, expected=None):
         if self.pos < len(self.tokens):
             token = self.tokens[self.pos]
-            if expected and token != expected:
-                raise ValueError(f"Expected '{expected}' but got '{token}' at position {self.pos}. Remaining tokens: {self.tokens[self.pos:]}")
+            if expected and token.value != expected:
+                remaining = [t.value for t in self.tokens[self.pos:]]
+                raise ValueError(
+                    f"Expected '{expected}' but got '{token.value}' at position {self.pos}. "
+                    f"Remaining tokens: {remaining} (line {token.line}, column {token.column})"
+                )
             self.pos += 1
-            return token
+            return token.value
         if expected:
             raise ValueError(f"Expected '{expected}' but got end of input")
         return None
 
     def parse_atom(self):
         token = self.peek()
-        if token.isdigit():
+        kind = self.peek_kind()
+        if kind == INT:
             self.consume()
             return Int(int(token))
-        elif token.startswith('"'):
+        elif kind == STRING:
             self.consume()
             return String(token[1:-1])
         elif token == 'true':
@@ -53,7 +123,7 @@ class Parser:
             t = self.parse_expr()
             self.consume(')')
             return Cons(h, t)
-        elif token and token not in ['let', 'in', 'case', 'of', 'inl', 'inr', 'fn', '(', ')', ',', '=>', '|', '!', '=', '*', '+', '->', '::', ':']:
+        elif token and token not in RESERVED_TOKENS:
             self.consume()
             return Var(token)
         elif token == '(':
@@ -73,11 +143,7 @@ class Parser:
     def parse_app(self):
         left = self.parse_atom()
         # Application stops at keywords or tokens that delimit expressions.
-        stop_tokens = [
-            ',', ')', 'in', 'of', '|', '=>', 'EOF', '=',  # existing
-            'let', 'case', 'fn', 'inl', 'inr', '::', ':'  # new keywords
-        ]
-        while self.peek() is not None and self.peek() not in stop_tokens:
+        while self.peek() is not None and self.peek() not in STOP_TOKENS:
             left = App(left, self.parse_atom())
         return left
 
@@ -221,13 +287,29 @@ class Parser:
             raise ValueError(f"Unknown type: {token}")
 
 def parse(s: str) -> Term:
-    # Remove single-line comments
-    s = re.sub(r'//.*', '', s)
-    s = s.strip()
-    tokens = re.findall(r'::|:|\(|\)|,|=>|->|=|\*|\+|!|\||\b(?:let|in|case|of|inl|inr|fn|unit|Int|String|Bool|State|Action|Goal|Unit|List|Cons|Nil)\b|\w+|"[^"]*"', s)
-    tokens = [t for t in tokens if t]
-    parser = Parser(tokens)
+    """
+    Parses APPL source text into a term.
+
+    Results are memoized on the source text, so re-parsing a hot string (as the
+    `parse` and `eval` primitives do) returns the previously built term. Terms
+    are immutable, so the cached term is safe to share between callers.
+    """
+    return _parse_cached(s)
+
+
+@lru_cache(maxsize=512)
+def _parse_cached(s: str) -> Term:
+    parser = Parser(list(tokenize(s)))
     result = parser.parse_expr()
     if parser.peek() is not None:
-        raise ValueError(f"Did not consume all tokens. Remaining: {parser.tokens[parser.pos:]}")
-    return result
\ No newline at end of file
+        raise ValueError(f"Did not consume all tokens. Remaining: {[t.value for t in parser.tokens[parser.pos:]]}")
+    return result
+
+
+def parse_cache_info():
+    """Returns hit/miss statistics for the parse cache."""
+    return _parse_cached.cache_info()
+
+
+def clear_parse_cache() -> None:
+    _parse_cached.cache_clear()
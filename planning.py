@@ -1,83 +1,73 @@
 # planning.py - AAL Integration Layer
 
-from typing import Set, List
+import functools
+import heapq
+import math
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Sequence, Set, Union
 from tooling.aal.parser import parse_aal
-from tooling.aal.domain import Domain, Fluent, Action
+from tooling.aal.domain import CompiledDomain, Domain, Fluent, Action, bit_indices
 from tooling.aal.interpreter import Interpreter as AALInterpreter
+from tooling.aal.heuristics import HEURISTICS, Heuristic, get_heuristic, regression_heuristic
+from tooling.aal.regression import regression_tables
+from tooling.aal.plan_cache import PlanCache, plan_key
+from tooling.aal.domain_cache import DEFAULT_MAX_ENTRIES, DomainCache
+from tooling.aal.state_space import StateSpace, StateSpaceTooLarge
 
 # --- Module-level state ---
-# This will hold the loaded AAL domain and the current world state.
+# The module-level functions below operate on a default `PlanningSession`
+# whose domain and state are mirrored in these globals, so existing callers
+# can keep reading and assigning them. Use `PlanningSession` directly to plan
+# for several domains at once or from several threads.
 domain: Domain = None
 current_state: Set[Fluent] = set()
 aal_interpreter = AALInterpreter()
+# The transition tables of `domain`, rebuilt whenever `domain` is replaced.
+compiled_domain: CompiledDomain = None
+# Results of earlier searches, shared by every session; see `configure_plan_cache`.
+plan_cache = PlanCache()
+# Compiled domains of AAL files; off unless turned on with `configure_domain_cache`.
+domain_cache: Optional[DomainCache] = None
 # -------------------------
 
 class PlanningError(Exception):
     pass
 
-def load_domain(filepath: str) -> None:
-    """Loads an AAL domain from a file."""
-    global domain
-    try:
-        with open(filepath, 'r') as f:
-            aal_string = f.read()
-        domain = parse_aal(aal_string)
-    except FileNotFoundError:
-        raise PlanningError(f"AAL domain file not found: {filepath}")
-    except Exception as e:
-        raise PlanningError(f"Failed to parse AAL domain: {e}")
-
-def create_state(initial_facts: List[str]) -> Set[Fluent]:
-    """Initializes the current world state from a list of fluent names."""
-    global current_state, domain
-    if domain is None:
-        raise PlanningError("Cannot create state before loading a domain.")
-
-    # Validate that the initial facts are defined as fluents in the domain
-    domain_fluent_names = {f.name for f in domain.fluents}
-    for fact in initial_facts:
-        if fact not in domain_fluent_names:
-            raise PlanningError(f"Initial fact '{fact}' is not a declared fluent in the domain.")
-
-    current_state = {Fluent(name=fact) for fact in initial_facts}
-    return current_state
-
-def apply_action(action_name: str) -> Set[Fluent]:
+def configure_plan_cache(capacity: int = 1024, path: str = None) -> PlanCache:
     """
-    Applies an action to the current state using the AAL interpreter
-    and updates the current state.
+    Replaces the plan cache with an empty one holding up to `capacity` plans
+    in memory, backed by the SQLite file at `path` if one is given.
     """
-    global current_state, domain
-    if domain is None:
-        raise PlanningError("Cannot apply action before loading a domain.")
-
-    # Find the action object in the domain
-    action_to_apply = next((a for a in domain.actions if a.name == action_name), None)
-    if action_to_apply is None:
-        raise PlanningError(f"Action '{action_name}' not found in the AAL domain.")
-
-    # Use the AAL interpreter to get the next state
-    next_state = aal_interpreter.get_next_state(current_state, action_to_apply, domain)
+    global plan_cache
+    plan_cache.close()
+    plan_cache = PlanCache(capacity, path)
+    return plan_cache
 
-    # Update the global state
-    current_state = next_state
-    return current_state
-
-def is_goal(goal_conditions: List[str]) -> bool:
-    """Checks if the current state satisfies a set of goal conditions."""
-    if domain is None:
-        raise PlanningError("Cannot check goal before loading a domain.")
+def configure_domain_cache(
+    directory: str = None, enabled: bool = True, max_entries: int = DEFAULT_MAX_ENTRIES
+) -> Optional[DomainCache]:
+    """
+    Turns on caching of compiled domains by `load_domain` in `directory` (by
+    default `tooling.aal.domain_cache.default_cache_dir()`), keeping at most
+    `max_entries` of them, or turns caching off.
+    """
+    global domain_cache
+    domain_cache = DomainCache(directory, max_entries) if enabled else None
+    return domain_cache
 
-    goal_fluents = {Fluent(name=cond) for cond in goal_conditions}
-    return goal_fluents.issubset(current_state)
 
-def get_current_state() -> List[str]:
-    """Returns the names of the fluents in the current state."""
-    return [fluent.name for fluent in sorted(list(current_state), key=lambda f: f.name)]
+class Node:
+    """
+    A node in a search tree for planning.
 
+    `state` is the bitset encoding of the node's world state (see
+    `CompiledDomain.encode`).
+    """
+    __slots__ = ("state", "parent", "action", "g", "h", "f")
 
-class Node:
-    """A node in a search tree for planning."""
     def __init__(self, state, parent=None, action=None, g=0, h=0):
         self.state = state
         self.parent = parent
@@ -90,65 +80,1014 @@ class Node:
         return isinstance(other, Node) and self.state == other.state
 
     def __hash__(self):
-        return hash(frozenset(self.state))
+        return hash(self.state)
 
     def __lt__(self, other):
         return self.f < other.f
 
+    def plan(self) -> List[str]:
+        """The names of the actions on the path from the root to this node."""
+        plan = []
+        node = self
+        while node.parent is not None:
+            plan.append(node.action.name)
+            node = node.parent
+        plan.reverse()
+        return plan
 
-import heapq
 
 def calculate_heuristic(state: Set[Fluent], goal: Set[Fluent]) -> int:
     """Estimates the cost to reach the goal from the current state."""
     return len(goal.difference(state))
 
 
-def find_plan(goal_conditions: List[str]) -> List[str]:
+SOLVED = "solved"
+NO_PLAN = "no_plan"
+BUDGET_EXHAUSTED = "budget_exhausted"
+
+SEARCH_ALGORITHMS = ("astar", "idastar")
+SEARCH_DIRECTIONS = ("forward", "backward", "bidirectional", "auto")
+
+
+class SearchStats:
     """
-    Finds a sequence of actions to achieve a goal using A* Search.
+    Counters and timings of one `search` call.
+
+    - `generated`: nodes created, as counted against `max_nodes`.
+    - `expanded`: nodes whose successors were generated.
+    - `duplicates`: states (or subgoals) found again after they were closed,
+      or, in IDA*, that were already on the current path.
+    - `peak_open`: the largest open list. For IDA* this is the deepest path;
+      for bidirectional search it is both frontiers together.
+    - `heuristic_calls`, `heuristic_time`, `successor_time`: calls to the
+      heuristic and seconds spent in it and in generating successors.
+    - `total_time`: the seconds the whole call took.
+    - `source`: "search", or where the answer came from without searching:
+      "goal" (already satisfied), "unknown_fluent", "state_space" or "cache".
+    """
+
+    FIELDS = (
+        "source", "status", "algorithm", "direction", "plan_length",
+        "generated", "expanded", "duplicates", "peak_open",
+        "heuristic_calls", "heuristic_time", "successor_time", "total_time",
+    )
+
+    def __init__(self, algorithm: str = None, direction: str = None):
+        self.source = "search"
+        self.status = None
+        self.algorithm = algorithm
+        self.direction = direction
+        self.plan_length = None
+        self.generated = 0
+        self.expanded = 0
+        self.duplicates = 0
+        self.peak_open = 0
+        self.heuristic_calls = 0
+        self.heuristic_time = 0.0
+        self.successor_time = 0.0
+        self.total_time = 0.0
+
+    def timed_heuristic(self, heuristic):
+        """Wraps `heuristic` to count its calls and the time spent in them."""
+        clock = time.perf_counter
+
+        def timed(*args):
+            started = clock()
+            h = heuristic(*args)
+            self.heuristic_time += clock() - started
+            self.heuristic_calls += 1
+            return h
+        return timed
+
+    def timed_expand(self, expand):
+        """Wraps a successor function to time it; successors are listed eagerly."""
+        clock = time.perf_counter
+
+        def timed(state):
+            started = clock()
+            successors = list(expand(state))
+            self.successor_time += clock() - started
+            return successors
+        return timed
+
+    def as_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+    def log(self, logger, task_id: str = "aal-planner", phase: str = "Phase 4") -> None:
+        """Writes the stats as an INFO entry through a `utils.logger.Logger`."""
+        logger.log(
+            phase,
+            task_id,
+            -1,
+            "INFO",
+            {"planner_stats": self.as_dict()},
+            "SUCCESS",
+            outcome_message=f"Planner search {self.status} after generating {self.generated} nodes.",
+        )
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.FIELDS)
+        return f"SearchStats({fields})"
+
+
+class SearchResult:
+    """
+    The outcome of a `search` call.
+
+    `status` is SOLVED, NO_PLAN or BUDGET_EXHAUSTED. When the budget runs out,
+    `plan` is the best partial plan found so far: the path to the generated
+    node with the lowest heuristic value (the shortest such path on ties).
+    `stats` is a `SearchStats` when the search was asked to collect them.
     """
-    if domain is None:
-        raise PlanningError("Cannot find plan before loading a domain.")
 
-    goal_fluents = {Fluent(name=cond) for cond in goal_conditions}
+    def __init__(self, status: str, plan: List[str] = None, nodes: int = 0, direction: str = None,
+                 stats: "SearchStats" = None):
+        self.status = status
+        self.plan = plan
+        self.nodes = nodes
+        # The direction that was searched, when a search ran.
+        self.direction = direction
+        self.stats = stats
+
+    @property
+    def complete(self) -> bool:
+        return self.status == SOLVED
+
+    def __repr__(self):
+        return f"SearchResult({self.status!r}, {self.plan!r}, nodes={self.nodes})"
+
+
+class _Budget:
+    """Counts generated nodes against an optional node and time limit."""
+
+    # How many nodes to generate between clock reads.
+    TIME_CHECK_INTERVAL = 256
 
-    initial_h = calculate_heuristic(current_state, goal_fluents)
-    initial_node = Node(current_state, g=0, h=initial_h)
+    def __init__(self, max_nodes: int = None, time_limit: float = None):
+        self.max_nodes = max_nodes
+        self.deadline = None if time_limit is None else time.perf_counter() + time_limit
+        self.nodes = 0
+        self.exhausted = False
+        self.best = None
 
-    if not goal_fluents.difference(initial_node.state):
-        return []  # Goal is already satisfied
+    def spend(self, node: "Node", forward: bool = True) -> bool:
+        """
+        Records a generated node, or returns False if the budget is used up.
+        Only forward nodes are candidates for the best partial plan.
+        """
+        if self.max_nodes is not None and self.nodes >= self.max_nodes:
+            self.exhausted = True
+        elif (self.deadline is not None and self.nodes % self.TIME_CHECK_INTERVAL == 0
+              and time.perf_counter() > self.deadline):
+            self.exhausted = True
+        if self.exhausted:
+            return False
+        self.nodes += 1
+        best = self.best
+        if forward and (best is None or (node.h, node.g) < (best.h, best.g)):
+            self.best = node
+        return True
 
-    open_set = [initial_node]
+
+def _successors(tables, state: int):
+    for action, table in tables:
+        next_state = 0
+        for conditions, effects in table:
+            if state & conditions == conditions:
+                next_state |= effects
+        yield action, next_state
+
+
+def _astar(expand, start: int, goal: int, heuristic: Heuristic, weight: float, budget: _Budget,
+           stats: SearchStats):
+    """
+    Weighted A*: orders the open list by g + weight * h. `expand(state)`
+    yields `(action, next state)` pairs.
+    """
+    initial_h = heuristic(start, goal)
+    if initial_h is None:
+        return None
+    root = Node(start, h=initial_h)
+    if not budget.spend(root):
+        return None
+
+    # Entries are (f, h, insertion order, node): ties on f go to the node
+    # closest to the goal, then first in, first out.
+    counter = 0
+    open_set = [(weight * initial_h, initial_h, counter, root)]
     closed_set = set()
+    peak_open = 1
+
+    try:
+        while open_set:
+            current_node = heapq.heappop(open_set)[-1]
+            state = current_node.state
+
+            if state in closed_set:
+                stats.duplicates += 1
+                continue
+            closed_set.add(state)
+
+            if state & goal == goal:
+                return current_node
+
+            stats.expanded += 1
+            g = current_node.g + 1
+            for action, next_state in expand(state):
+                if next_state in closed_set:
+                    stats.duplicates += 1
+                    continue
+
+                h = heuristic(next_state, goal)
+                if h is None:
+                    continue  # Dead end: the goal is unreachable even when relaxed.
+                node = Node(next_state, current_node, action, g, h)
+                if not budget.spend(node):
+                    return None
+                counter += 1
+                heapq.heappush(open_set, (g + weight * h, h, counter, node))
+            if len(open_set) > peak_open:
+                peak_open = len(open_set)
+        return None
+    finally:
+        stats.peak_open = peak_open
+
+
+def _idastar(expand, start: int, goal: int, heuristic: Heuristic, weight: float, budget: _Budget,
+             stats: SearchStats):
+    """
+    Iterative-deepening A*: repeated depth-first searches bounded by
+    g + weight * h. Only the current path is kept in memory.
+    """
+    initial_h = heuristic(start, goal)
+    if initial_h is None:
+        return None
+    root = Node(start, h=initial_h)
+    if not budget.spend(root):
+        return None
 
-    while open_set:
-        current_node = heapq.heappop(open_set)
+    if start & goal == goal:
+        return root
 
-        if frozenset(current_node.state) in closed_set:
-            continue
+    bound = weight * initial_h
+    while True:
+        next_bound = math.inf
+        on_path = {start}
+        # Each frame is (node, iterator over its successors).
+        stack = [(root, iter(expand(start)))]
+        stats.expanded += 1
+        while stack:
+            node, successors = stack[-1]
+            for action, next_state in successors:
+                if next_state in on_path:
+                    stats.duplicates += 1
+                    continue
+                h = heuristic(next_state, goal)
+                if h is None:
+                    continue
+                child = Node(next_state, node, action, node.g + 1, h)
+                if not budget.spend(child):
+                    return None
+                f = child.g + weight * h
+                if f > bound:
+                    next_bound = min(next_bound, f)
+                    continue
+                if next_state & goal == goal:
+                    return child
+                on_path.add(next_state)
+                stack.append((child, iter(expand(next_state))))
+                stats.expanded += 1
+                if len(stack) > stats.peak_open:
+                    stats.peak_open = len(stack)
+                break
+            else:
+                stack.pop()
+                on_path.discard(node.state)
+        if next_bound == math.inf:
+            return None
+        bound = next_bound
 
-        closed_set.add(frozenset(current_node.state))
 
-        if not goal_fluents.difference(current_node.state):
-            # Goal found, reconstruct the plan
-            plan = []
-            while current_node.parent is not None:
-                plan.insert(0, current_node.action.name)
-                current_node = current_node.parent
-            return plan
+def _backward_astar(expand, start: int, goal: int, estimate, weight: float, budget: _Budget,
+                    stats: SearchStats):
+    """
+    Weighted A* from the goal over regressed subgoals, until one holds in
+    `start`. `expand(subgoal)` yields `(action, regressed subgoal)` pairs.
+    Returns the node of that subgoal; its path, reversed, is the plan.
+    """
+    initial_h = estimate(goal)
+    if initial_h is None:
+        return None
+    root = Node(goal, h=initial_h)
+    if not budget.spend(root, forward=False):
+        return None
+
+    counter = 0
+    open_set = [(weight * initial_h, initial_h, counter, root)]
+    closed_set = set()
+    peak_open = 1
 
-        for action in domain.actions:
-            # Create a temporary interpreter to avoid modifying the global state
-            temp_interpreter = AALInterpreter()
-            next_state = temp_interpreter.get_next_state(current_node.state, action, domain)
+    try:
+        while open_set:
+            current_node = heapq.heappop(open_set)[-1]
+            subgoal = current_node.state
 
-            if frozenset(next_state) in closed_set:
+            if subgoal in closed_set:
+                stats.duplicates += 1
                 continue
+            closed_set.add(subgoal)
+
+            if start & subgoal == subgoal:
+                return current_node
 
+            stats.expanded += 1
             g = current_node.g + 1
-            h = calculate_heuristic(next_state, goal_fluents)
-            new_node = Node(next_state, parent=current_node, action=action, g=g, h=h)
+            for action, regressed in expand(subgoal):
+                if regressed in closed_set:
+                    stats.duplicates += 1
+                    continue
+                h = estimate(regressed)
+                if h is None:
+                    continue
+                node = Node(regressed, current_node, action, g, h)
+                if not budget.spend(node, forward=False):
+                    return None
+                counter += 1
+                heapq.heappush(open_set, (g + weight * h, h, counter, node))
+            if len(open_set) > peak_open:
+                peak_open = len(open_set)
+        return None
+    finally:
+        stats.peak_open = peak_open
+
+
+def _bidirectional(expand, regress, start: int, goal: int, budget: _Budget,
+                   stats: SearchStats) -> Optional[List[str]]:
+    """
+    Breadth-first search forward from `start` (with `expand`) and backward
+    from `goal` (with `regress`), expanding the smaller frontier a layer at a
+    time, until a forward state contains a backward subgoal. Plans are not
+    guaranteed to be shortest.
+
+    Meets are found through indexes rather than by scanning the other side.
+    States are filed under every fluent they hold, so a new subgoal only
+    checks the states holding its least common fluent. Each subgoal is filed
+    under that one fluent, so a new state only checks the subgoals filed
+    under fluents it holds.
+    """
+    forward_root, backward_root = Node(start), Node(goal)
+    if not (budget.spend(forward_root) and budget.spend(backward_root, forward=False)):
+        return None
+    forward_nodes = {start: forward_root}
+    backward_nodes = {goal: backward_root}
+    forward_frontier, backward_frontier = [forward_root], [backward_root]
+    # fluent index -> the forward nodes holding it / the backward nodes filed under it
+    holding: Dict[int, List[Node]] = {}
+    filed: Dict[int, List[Node]] = {}
+
+    def joined(forward_node, backward_node):
+        return forward_node.plan() + list(reversed(backward_node.plan()))
+
+    if start & goal == goal:
+        return []
+    for i in bit_indices(start):
+        holding[i] = [forward_root]
+    filed[min(bit_indices(goal), key=lambda i: len(holding.get(i, ())))] = [backward_root]
+
+    while forward_frontier and backward_frontier:
+        stats.peak_open = max(stats.peak_open, len(forward_frontier) + len(backward_frontier))
+        if len(forward_frontier) <= len(backward_frontier):
+            layer, forward_frontier = forward_frontier, []
+            for parent in layer:
+                stats.expanded += 1
+                for action, state in expand(parent.state):
+                    if state in forward_nodes:
+                        stats.duplicates += 1
+                        continue
+                    node = Node(state, parent, action, parent.g + 1)
+                    if not budget.spend(node):
+                        return None
+                    forward_nodes[state] = node
+                    forward_frontier.append(node)
+                    fluents = bit_indices(state)
+                    for i in fluents:
+                        for backward_node in filed.get(i, ()):
+                            subgoal = backward_node.state
+                            if state & subgoal == subgoal:
+                                return joined(node, backward_node)
+                    for i in fluents:
+                        holding.setdefault(i, []).append(node)
+        else:
+            layer, backward_frontier = backward_frontier, []
+            for parent in layer:
+                stats.expanded += 1
+                for action, subgoal in regress(parent.state):
+                    if subgoal in backward_nodes:
+                        stats.duplicates += 1
+                        continue
+                    node = Node(subgoal, parent, action, parent.g + 1)
+                    if not budget.spend(node, forward=False):
+                        return None
+                    backward_nodes[subgoal] = node
+                    backward_frontier.append(node)
+                    if not subgoal:  # Holds in every state.
+                        return joined(forward_root, node)
+                    rarest = min(bit_indices(subgoal), key=lambda i: len(holding.get(i, ())))
+                    for forward_node in holding.get(rarest, ()):
+                        if forward_node.state & subgoal == subgoal:
+                            return joined(forward_node, node)
+                    filed.setdefault(rarest, []).append(node)
+    return None
+
+
+def _branching_factors(expand, regress, start: int, goal: int, samples: int = 8):
+    """
+    Estimates the forward and backward branching factors: the average number
+    of new states (or subgoals) per node over the root and up to `samples`
+    of its children.
+    """
+    def average(root, successors):
+        counts = []
+        frontier = [root]
+        for node in frontier:
+            children = {child for _, child in successors(node)} - {node}
+            counts.append(len(children))
+            if len(frontier) <= samples:
+                frontier.extend(sorted(children)[:samples + 1 - len(frontier)])
+        return sum(counts) / len(counts)
+
+    return average(start, expand), average(goal, regress)
+
+
+def choose_direction(forward_branching: float, backward_branching: float, informed: bool = False) -> str:
+    """
+    Picks a search direction from branching factor estimates: whichever
+    direction branches at most half as much as the other. When they are close,
+    bidirectional search halves the depth each side explores, unless an
+    `informed` heuristic is available to guide forward A* instead.
+    """
+    if backward_branching * 2 <= forward_branching:
+        return "backward"
+    if forward_branching * 2 <= backward_branching or informed:
+        return "forward"
+    return "bidirectional"
+
+
+def _search(compiled, start_state, goal_fluents, heuristic, algorithm, weight, max_nodes, time_limit,
+            direction="forward", stats: SearchStats = None) -> SearchResult:
+    """
+    Runs one search. If `stats` is given it is filled in, including the
+    heuristic and successor timings, and attached to the result.
+
+    A heuristic name is turned into a heuristic once, after the direction is
+    chosen: `get_heuristic` for forward search, `regression_heuristic` for
+    the others.
+    """
+    goal = compiled.encode(goal_fluents)
+    start = compiled.encode(start_state)
+    tables = [(action, compiled.mask_transitions.get(action, ())) for action in compiled.actions]
+    budget = _Budget(max_nodes, time_limit)
+    expand = functools.partial(_successors, tables)
+    if direction != "forward":
+        regress = regression_tables(compiled).predecessors
+        if direction == "auto":
+            informed = heuristic != "goal_count"
+            direction = choose_direction(*_branching_factors(expand, regress, start, goal), informed)
+
+    collected = stats if stats is not None else SearchStats()
+    collected.algorithm, collected.direction = algorithm, direction
+    if direction == "forward":
+        if isinstance(heuristic, str):
+            heuristic = get_heuristic(heuristic, compiled)
+    else:
+        heuristic = regression_heuristic(heuristic, compiled, start)
+        if stats is not None:
+            regress = stats.timed_expand(regress)
+    if stats is not None:
+        heuristic = stats.timed_heuristic(heuristic)
+        expand = stats.timed_expand(expand)
 
-            heapq.heappush(open_set, new_node)
+    plan = None
+    if direction == "forward":
+        run = _astar if algorithm == "astar" else _idastar
+        node = run(expand, start, goal, heuristic, weight, budget, collected)
+        if node is not None:
+            plan = node.plan()
+    elif direction == "backward":
+        node = _backward_astar(regress, start, goal, heuristic, weight, budget, collected)
+        if node is not None:
+            plan = list(reversed(node.plan()))
+    else:
+        plan = _bidirectional(expand, regress, start, goal, budget, collected)
 
-    return None # No plan found
+    if plan is not None:
+        status = SOLVED
+    elif budget.exhausted:
+        status = BUDGET_EXHAUSTED
+        plan = budget.best.plan() if budget.best is not None else []
+    else:
+        status = NO_PLAN
+    collected.generated = budget.nodes
+    return SearchResult(status, plan, budget.nodes, direction, stats)
+
+
+def _note_source(stats: Optional[SearchStats], source: str) -> None:
+    if stats is not None:
+        stats.source = source
+        stats.direction = None
+
+
+class PlanningSession:
+    """
+    A domain, its compiled transition tables and a current world state.
+
+    Each session is independent, and its methods hold the session's lock, so
+    sessions can be used from several threads. All sessions share the
+    module-level `plan_cache` unless given their own.
+    """
+
+    def __init__(self, domain: Domain = None, plan_cache: PlanCache = None, logger=None):
+        # `domain` may be replaced at any time; `compiled` follows it.
+        self.domain = domain
+        self.current_state: Set[Fluent] = set()
+        self._compiled: Optional[CompiledDomain] = None
+        self._plan_cache = plan_cache
+        # The reachable state graph, once `materialize` has built it.
+        self.state_space: Optional[StateSpace] = None
+        # A `utils.logger.Logger`; when set, every search collects and logs its stats.
+        self.logger = logger
+        # The `SearchStats` of the most recent search that collected them.
+        self.last_stats: Optional[SearchStats] = None
+        self._lock = threading.RLock()
+
+    @property
+    def compiled(self) -> CompiledDomain:
+        """The transition tables of the current domain, compiled on first use."""
+        with self._lock:
+            if self.domain is None:
+                return None
+            if self._compiled is None or self._compiled.domain is not self.domain:
+                self._compiled = self.domain.compile()
+            return self._compiled
+
+    @property
+    def plan_cache(self) -> PlanCache:
+        return self._plan_cache if self._plan_cache is not None else plan_cache
+
+    def load_domain(self, filepath: str) -> None:
+        """
+        Loads an AAL domain from a file.
+
+        If the domain cache is turned on (see `configure_domain_cache`), an
+        unchanged file is loaded from its cached compiled form instead of
+        being parsed. If the file's
+        contents changed since it was last loaded, the plan cache entries for
+        its old contents are dropped.
+        """
+        try:
+            if domain_cache is not None:
+                compiled = domain_cache.load(filepath, parse_aal)
+                new_domain = compiled.domain
+            else:
+                with open(filepath, 'r') as f:
+                    aal_string = f.read()
+                new_domain = parse_aal(aal_string)
+                compiled = new_domain.compile()
+        except FileNotFoundError:
+            raise PlanningError(f"AAL domain file not found: {filepath}")
+        except Exception as e:
+            raise PlanningError(f"Failed to parse AAL domain: {e}")
+        with self._lock:
+            self.domain, self._compiled = new_domain, compiled
+        self.plan_cache.note_domain(os.path.abspath(filepath), compiled.fingerprint)
+
+    def create_state(self, initial_facts: List[str]) -> Set[Fluent]:
+        """Initializes the current world state from a list of fluent names."""
+        with self._lock:
+            if self.domain is None:
+                raise PlanningError("Cannot create state before loading a domain.")
+
+            # Validate that the initial facts are defined as fluents in the domain
+            domain_fluent_names = {f.name for f in self.domain.fluents}
+            for fact in initial_facts:
+                if fact not in domain_fluent_names:
+                    raise PlanningError(f"Initial fact '{fact}' is not a declared fluent in the domain.")
+
+            self.current_state = {Fluent(name=fact) for fact in initial_facts}
+            return self.current_state
+
+    def apply_action(self, action_name: str) -> Set[Fluent]:
+        """Applies an action to the current state and updates the current state."""
+        with self._lock:
+            if self.domain is None:
+                raise PlanningError("Cannot apply action before loading a domain.")
+
+            compiled = self.compiled
+            action_to_apply = compiled.actions_by_name.get(action_name)
+            if action_to_apply is None:
+                raise PlanningError(f"Action '{action_name}' not found in the AAL domain.")
+
+            self.current_state = compiled.next_state(self.current_state, action_to_apply)
+            return self.current_state
+
+    def is_goal(self, goal_conditions: List[str]) -> bool:
+        """Checks if the current state satisfies a set of goal conditions."""
+        with self._lock:
+            if self.domain is None:
+                raise PlanningError("Cannot check goal before loading a domain.")
+
+            goal_fluents = {Fluent(name=cond) for cond in goal_conditions}
+            return goal_fluents.issubset(self.current_state)
+
+    def get_current_state(self) -> List[str]:
+        """Returns the names of the fluents in the current state."""
+        return [fluent.name for fluent in sorted(self.current_state, key=lambda f: f.name)]
+
+    def materialize(self, max_states: int = 100_000) -> StateSpace:
+        """
+        Enumerates the states reachable from the current state into an
+        explicit graph. Later searches from states in the graph, or from
+        states whose reachable states still fit within `max_states`, are
+        answered with shortest plans from distance tables instead of by
+        search. Raises PlanningError if there are more than `max_states`
+        reachable states.
+        """
+        with self._lock:
+            if self.domain is None:
+                raise PlanningError("Cannot materialize a state space before loading a domain.")
+            compiled = self.compiled
+            space = StateSpace(compiled, max_states)
+            try:
+                space.explore([compiled.encode(self.current_state)])
+            except StateSpaceTooLarge as e:
+                raise PlanningError(str(e))
+            self.state_space = space
+            return space
+
+    def save_state_space(self, path: str) -> None:
+        with self._lock:
+            if self.state_space is None:
+                raise PlanningError("No state space has been materialized.")
+            self.state_space.save(path)
+
+    def load_state_space(self, path: str, max_states: int = 100_000) -> StateSpace:
+        """
+        Loads a state space saved for the current domain by `save_state_space`.
+        Raises PlanningError if it has more than `max_states` states.
+        """
+        with self._lock:
+            if self.domain is None:
+                raise PlanningError("Cannot load a state space before loading a domain.")
+            try:
+                self.state_space = StateSpace.load(path, self.compiled, max_states)
+            except (OSError, ValueError, EOFError, StateSpaceTooLarge) as e:
+                raise PlanningError(f"Failed to load state space: {e}")
+            return self.state_space
+
+    def _state_space_plan(self, compiled, start_state, goal_fluents) -> Optional[SearchResult]:
+        """Answers a query from the materialized state space, if it can."""
+        with self._lock:
+            space = self.state_space
+            if space is None or space.compiled is not compiled:
+                return None
+            start = compiled.encode(start_state)
+            if start not in space:
+                try:
+                    space.explore([start])
+                except StateSpaceTooLarge:
+                    return None
+            plan = space.shortest_plan(start, compiled.encode(goal_fluents))
+        return SearchResult(SOLVED, plan) if plan is not None else SearchResult(NO_PLAN)
+
+    def search(
+        self,
+        goal_conditions: List[str],
+        heuristic: Union[str, Heuristic] = "goal_count",
+        algorithm: str = "astar",
+        weight: float = 1.0,
+        max_nodes: int = None,
+        time_limit: float = None,
+        use_cache: bool = True,
+        direction: str = "forward",
+        stats: bool = False,
+    ) -> SearchResult:
+        """
+        Searches for a sequence of actions that achieves a goal from the current state.
+
+        States are searched as bitsets, so expanding a node, testing the goal and
+        detecting duplicates are integer operations. If the session has a
+        materialized state space, queries it covers are answered with a
+        shortest plan from it and the search options are not used.
+
+        Args:
+            goal_conditions: The names of the fluents the plan must make true.
+            heuristic: The name of one of `tooling.aal.heuristics.HEURISTICS`
+                ("goal_count", "h_max", "h_add" or "h_ff") or a function of the
+                state and goal bitsets returning an estimate, or None for a dead
+                end. Only "h_max" is admissible, so only it guarantees shortest
+                plans.
+            algorithm: "astar", or "idastar" to keep only the current path in
+                memory at the cost of re-expanding nodes.
+            weight: Multiplies the heuristic in the node ordering. Weights above
+                1 trade plan length for fewer expansions.
+            max_nodes: Stop after generating this many nodes. A* keeps every
+                generated node, so this also bounds its memory.
+            time_limit: Stop after roughly this many seconds.
+            use_cache: Look the problem up in, and record its result in, the plan
+                cache. Searches with a heuristic function rather than a name are
+                never cached.
+            direction: "forward" searches states from the current state.
+                "backward" regresses the goal through the causal laws (see
+                `tooling.aal.regression`) with A* until a subgoal holds in the
+                current state; it pays off when few actions can produce the
+                goal fluents. "bidirectional" runs breadth-first searches from
+                both ends until they meet, ignoring the heuristic. "auto" picks
+                one of the three from estimates of the forward and backward
+                branching factors. Only forward search supports "idastar".
+            stats: Collect a `SearchStats` for the call, available as the
+                result's `stats` and the session's `last_stats`. Stats are
+                always collected, and logged, when the session has a `logger`.
+        """
+        if algorithm not in SEARCH_ALGORITHMS:
+            raise PlanningError(
+                f"Unknown search algorithm '{algorithm}'. Expected one of {', '.join(SEARCH_ALGORITHMS)}."
+            )
+        if direction not in SEARCH_DIRECTIONS:
+            raise PlanningError(
+                f"Unknown search direction '{direction}'. Expected one of {', '.join(SEARCH_DIRECTIONS)}."
+            )
+        if direction != "forward" and algorithm != "astar":
+            raise PlanningError(f"The '{algorithm}' algorithm only searches forward.")
+        if weight < 1:
+            raise PlanningError("The heuristic weight must be at least 1.")
+
+        if not (stats or self.logger is not None):
+            return self._search(
+                goal_conditions, heuristic, algorithm, weight, max_nodes, time_limit, use_cache, direction, None
+            )
+
+        collected = SearchStats(algorithm, direction)
+        started = time.perf_counter()
+        result = self._search(
+            goal_conditions, heuristic, algorithm, weight, max_nodes, time_limit, use_cache, direction, collected
+        )
+        collected.total_time = time.perf_counter() - started
+        collected.status = result.status
+        collected.plan_length = None if result.plan is None else len(result.plan)
+        result.stats = collected
+        self.last_stats = collected
+        if self.logger is not None:
+            collected.log(self.logger)
+        return result
+
+    def _search(self, goal_conditions, heuristic, algorithm, weight, max_nodes, time_limit, use_cache, direction,
+                stats: Optional[SearchStats]) -> SearchResult:
+        with self._lock:
+            if self.domain is None:
+                raise PlanningError("Cannot find plan before loading a domain.")
+            compiled = self.compiled
+            start_state = self.current_state
+
+        goal_fluents = {Fluent(name=cond) for cond in goal_conditions}
+        if goal_fluents.issubset(start_state):
+            _note_source(stats, "goal")
+            return SearchResult(SOLVED, [])  # Goal is already satisfied
+        if not compiled.knows(goal_fluents):
+            _note_source(stats, "unknown_fluent")
+            return SearchResult(NO_PLAN)  # No successor state can contain an unknown fluent
+
+        result = self._state_space_plan(compiled, start_state, goal_fluents)
+        if result is not None:
+            _note_source(stats, "state_space")
+            return result
+
+        cache = self.plan_cache
+        key = None
+        if use_cache and isinstance(heuristic, str):
+            key = plan_key(
+                compiled.fingerprint,
+                [f.name for f in start_state],
+                goal_conditions,
+                (heuristic, algorithm, weight, direction),
+            )
+            cached = cache.get(key)
+            if cached is not None:
+                _note_source(stats, "cache")
+                return SearchResult(*cached)
+
+        # Checked by name: `_search` builds the heuristic once, for the direction it searches in.
+        if isinstance(heuristic, str) and heuristic not in HEURISTICS:
+            raise PlanningError(f"Unknown heuristic '{heuristic}'. Expected one of {', '.join(HEURISTICS)}.")
+        result = _search(
+            compiled, start_state, goal_fluents, heuristic, algorithm, weight, max_nodes, time_limit, direction,
+            stats,
+        )
+        if key is not None and result.status != BUDGET_EXHAUSTED:
+            cache.put(key, compiled.fingerprint, result.status, result.plan)
+        return result
+
+    def find_plan(self, goal_conditions: List[str], partial: bool = False, **options) -> List[str]:
+        """
+        Finds a sequence of actions to achieve a goal using A* Search.
+
+        Takes the same options as `search`. Returns None if there is no plan or
+        the budget runs out first; with `partial=True` the best partial plan is
+        returned in the latter case instead.
+        """
+        result = self.search(goal_conditions, **options)
+        if result.complete or (partial and result.status == BUDGET_EXHAUSTED):
+            return result.plan
+        return None
+
+
+# --- Default-session facade ---
+
+_default_session = PlanningSession()
+
+
+def _session() -> PlanningSession:
+    """The default session, brought in line with the module-level globals."""
+    _default_session.domain = domain
+    _default_session.current_state = current_state
+    return _default_session
+
+
+def _publish(session: PlanningSession) -> None:
+    """Copies the default session's domain and state back to the globals."""
+    global domain, compiled_domain, current_state
+    domain = session.domain
+    compiled_domain = session.compiled
+    current_state = session.current_state
+
+
+def default_session() -> PlanningSession:
+    """Returns the session that the module-level functions operate on."""
+    return _session()
+
+
+def load_domain(filepath: str) -> None:
+    """
+    Loads an AAL domain from a file.
+
+    If the file's contents changed since it was last loaded, the plan cache
+    entries for its old contents are dropped.
+    """
+    session = _session()
+    session.load_domain(filepath)
+    _publish(session)
+
+def create_state(initial_facts: List[str]) -> Set[Fluent]:
+    """Initializes the current world state from a list of fluent names."""
+    session = _session()
+    state = session.create_state(initial_facts)
+    _publish(session)
+    return state
+
+def apply_action(action_name: str) -> Set[Fluent]:
+    """
+    Applies an action to the current state using the compiled transition
+    tables and updates the current state.
+    """
+    session = _session()
+    state = session.apply_action(action_name)
+    _publish(session)
+    return state
+
+def is_goal(goal_conditions: List[str]) -> bool:
+    """Checks if the current state satisfies a set of goal conditions."""
+    return _session().is_goal(goal_conditions)
+
+def get_current_state() -> List[str]:
+    """Returns the names of the fluents in the current state."""
+    return _session().get_current_state()
+
+
+def search(
+    goal_conditions: List[str],
+    heuristic: Union[str, Heuristic] = "goal_count",
+    algorithm: str = "astar",
+    weight: float = 1.0,
+    max_nodes: int = None,
+    time_limit: float = None,
+    use_cache: bool = True,
+    direction: str = "forward",
+    stats: bool = False,
+) -> SearchResult:
+    """`PlanningSession.search` on the default session."""
+    session = _session()
+    result = session.search(
+        goal_conditions, heuristic, algorithm, weight, max_nodes, time_limit, use_cache, direction, stats
+    )
+    _publish(session)
+    return result
+
+
+def find_plan(
+    goal_conditions: List[str],
+    heuristic: Union[str, Heuristic] = "goal_count",
+    algorithm: str = "astar",
+    weight: float = 1.0,
+    max_nodes: int = None,
+    time_limit: float = None,
+    partial: bool = False,
+    direction: str = "forward",
+    stats: bool = False,
+) -> List[str]:
+    """
+    Finds a sequence of actions to achieve a goal using A* Search.
+
+    Takes the same options as `search`. Returns None if there is no plan or
+    the budget runs out first; with `partial=True` the best partial plan is
+    returned in the latter case instead. With `stats=True` the search's
+    `SearchStats` are available from `last_search_stats` afterwards.
+    """
+    result = search(
+        goal_conditions, heuristic, algorithm, weight, max_nodes, time_limit, direction=direction, stats=stats
+    )
+    if result.complete or (partial and result.status == BUDGET_EXHAUSTED):
+        return result.plan
+    return None
+
+
+def last_search_stats() -> Optional[SearchStats]:
+    """The `SearchStats` of the default session's most recent search that collected them."""
+    return _default_session.last_stats
+
+
+def materialize_state_space(max_states: int = 100_000) -> StateSpace:
+    """`PlanningSession.materialize` on the default session."""
+    return _session().materialize(max_states)
+
+def save_state_space(path: str) -> None:
+    _session().save_state_space(path)
+
+def load_state_space(path: str, max_states: int = 100_000) -> StateSpace:
+    return _session().load_state_space(path, max_states)
+
+
+# --- Batch planning ---
+
+class PlanningProblem(NamedTuple):
+    """An independent planning problem for `solve_batch`."""
+
+    domain: Union[str, Domain]  # A path to an AAL file, or a parsed domain.
+    initial_state: List[str]
+    goal: List[str]
+
+
+def _solve_problem(problem: PlanningProblem, options: dict) -> SearchResult:
+    session = PlanningSession()
+    if isinstance(problem.domain, Domain):
+        session.domain = problem.domain
+    else:
+        session.load_domain(problem.domain)
+    session.create_state(problem.initial_state)
+    return session.search(problem.goal, **options)
+
+
+def solve_batch(
+    problems: Sequence[PlanningProblem], processes: int = None, **options
+) -> List[SearchResult]:
+    """
+    Solves independent planning problems in parallel worker processes.
+
+    Each problem gets a fresh session in a worker; `options` are passed to
+    `PlanningSession.search`, so they must be picklable (heuristics are given
+    by name). Results come back in the order of `problems`. With
+    `processes=1` the problems are solved in this process.
+    """
+    problems = [PlanningProblem(*problem) for problem in problems]
+    if processes == 1 or len(problems) <= 1:
+        return [_solve_problem(problem, options) for problem in problems]
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        return list(executor.map(_solve_problem, problems, [options] * len(problems)))
+
+
+def parse_search_options(options: List[str]) -> dict:
+    """
+    Parses `find_plan` keyword arguments written as "name=value" strings, as
+    passed by APPL programs, e.g. ["algorithm=idastar", "max_nodes=500"].
+    "stats=true" collects the search's `SearchStats`.
+    """
+    flag = lambda v: v.lower() in ("1", "true", "yes")
+    converters = {
+        "heuristic": str,
+        "algorithm": str,
+        "weight": float,
+        "max_nodes": int,
+        "time_limit": float,
+        "direction": str,
+        "partial": flag,
+        "stats": flag,
+    }
+    parsed = {}
+    for option in options:
+        name, sep, value = option.partition("=")
+        name = name.strip()
+        if not sep or name not in converters:
+            raise PlanningError(f"Invalid search option '{option}'.")
+        try:
+            parsed[name] = converters[name](value.strip())
+        except ValueError:
+            raise PlanningError(f"Invalid value for search option '{name}': {value!r}")
+    return parsed
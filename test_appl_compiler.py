@@ -0,0 +1,129 @@
+import unittest
+import os
+from appl_ast import (
+    Int,
+    String,
+    Bool,
+    Unit,
+    Var,
+    Fun,
+    App,
+    Pair,
+    LetPair,
+    Let,
+    Inl,
+    Inr,
+    Case,
+    Promote,
+    LetBang,
+    Cons,
+    Nil,
+    TInt,
+    TString,
+)
+from appl_compiler import compile_term, compile_and_run, CompiledClosure
+from interpreter import interpret, InterpError
+from planning import configure_domain_cache
+
+
+class TestAPPLCompiler(unittest.TestCase):
+    def setUp(self):
+        """Create a dummy AAL file for testing."""
+        configure_domain_cache(enabled=False)
+        self.aal_filepath = "tests/test_compiler.aal"
+        with open(self.aal_filepath, "w") as f:
+            f.write("fluent at_A\n")
+            f.write("fluent at_B\n")
+            f.write("action move\n")
+            f.write("move causes at_B if at_A\n")
+
+    def tearDown(self):
+        """Clean up the dummy AAL file."""
+        if os.path.exists(self.aal_filepath):
+            os.remove(self.aal_filepath)
+
+    def test_literals(self):
+        self.assertEqual(compile_and_run(Int(1)), Int(1))
+        self.assertEqual(compile_and_run(String("hello")), String("hello"))
+        self.assertEqual(compile_and_run(Bool(True)), Bool(True))
+        self.assertEqual(compile_and_run(Unit()), Unit())
+
+    def test_global_var(self):
+        self.assertEqual(compile_and_run(Var('x'), {'x': Int(1)}), Int(1))
+
+    def test_var_not_found(self):
+        with self.assertRaises(InterpError):
+            compile_and_run(Var('x'))
+
+    def test_fun(self):
+        self.assertIsInstance(compile_and_run(Fun('x', TInt(), Var('x'))), CompiledClosure)
+
+    def test_app(self):
+        app = App(Fun('x', TInt(), Var('x')), Int(1))
+        self.assertEqual(compile_and_run(app), Int(1))
+
+    def test_app_non_function(self):
+        with self.assertRaises(InterpError):
+            compile_and_run(App(Int(1), Int(2)))
+
+    def test_lexical_scoping(self):
+        # The inner function must see the `x` bound where it was defined.
+        program = Let(
+            "x", Int(1),
+            Let(
+                "f", Fun("y", TInt(), Pair(Var("x"), Var("y"))),
+                Let("x", Int(2), App(Var("f"), Var("x")))
+            )
+        )
+        self.assertEqual(compile_and_run(program), Pair(Int(1), Int(2)))
+        self.assertEqual(compile_and_run(program), interpret(program))
+
+    def test_let_pair(self):
+        program = LetPair("x", "y", Pair(Int(1), Int(2)), Pair(Var("y"), Var("x")))
+        self.assertEqual(compile_and_run(program), Pair(Int(2), Int(1)))
+
+    def test_case(self):
+        inl = Case(Inl(Int(1), TString()), "x", Var("x"), "y", Int(0))
+        inr = Case(Inr(String("a"), TInt()), "x", Int(0), "y", Var("y"))
+        self.assertEqual(compile_and_run(inl), Int(1))
+        self.assertEqual(compile_and_run(inr), String("a"))
+
+    def test_let_bang(self):
+        program = LetBang("x", Promote(Int(1)), Pair(Var("x"), Var("x")))
+        self.assertEqual(compile_and_run(program), Pair(Int(1), Int(1)))
+
+    def test_deep_variable_access(self):
+        program = Var("a")
+        for name in reversed("abcdef"):
+            program = Let(name, String(name), program)
+        self.assertEqual(compile_and_run(program), String("a"))
+
+    def test_cons(self):
+        program = Cons(Int(1), Cons(Int(2), Nil(TInt())))
+        self.assertEqual(compile_and_run(program), program)
+
+    def test_compiled_program_is_reusable(self):
+        program = compile_term(App(Fun("x", TInt(), Pair(Var("x"), Var("g"))), Int(1)))
+        self.assertEqual(program.run({"g": Int(2)}), Pair(Int(1), Int(2)))
+        self.assertEqual(program.run({"g": Int(3)}), Pair(Int(1), Int(3)))
+
+    def test_aal_integration(self):
+        program = Let(
+            "!domain", App(Var("load_domain"), String(self.aal_filepath)),
+            Let(
+                "!state1", App(Var("create_state"), Cons(String("at_A"), Nil(TString()))),
+                Let(
+                    "!state2", App(Var("apply_action"), String("move")),
+                    App(Var("is_goal"), Cons(String("at_B"), Nil(TString())))
+                )
+            )
+        )
+        self.assertEqual(compile_and_run(program), Bool(True))
+
+    def test_homoiconicity(self):
+        program = App(Var("eval"), App(Var("parse"), String('"hello"')))
+        self.assertEqual(compile_and_run(program), String("hello"))
+
+
+if __name__ == '__main__':
+    unittest.main()
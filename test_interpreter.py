@@ -20,14 +20,17 @@ from appl_ast import (
     Nil,
     TInt,
     TString,
+    ListValue,
+    list_value,
 )
-from interpreter import interpret, InterpError, Closure
-from planning import PlanningError
+from interpreter import interpret, InterpError, Closure, Environment, Primitive, PRELUDE, _appl_list_to_python_list, _python_list_to_appl_list
+from planning import PlanningError, configure_domain_cache, configure_plan_cache, default_session
 
 
 class TestInterpreter(unittest.TestCase):
     def setUp(self):
         """Create a dummy AAL file for testing."""
+        configure_domain_cache(enabled=False)
         self.aal_filepath = "tests/test.aal"
         with open(self.aal_filepath, "w") as f:
             f.write("fluent at_A\n")
@@ -117,5 +120,176 @@ class TestInterpreter(unittest.TestCase):
         program = App(Var("eval"), App(Var("parse"), String('"hello"')))
         self.assertEqual(interpret(program), String("hello"))
 
+    def test_let_shadowing(self):
+        program = Let("x", Int(1), Let("x", Int(2), Var("x")))
+        self.assertEqual(interpret(program), Int(2))
+
+    def test_closure_shares_environment(self):
+        # The closure captures the environment frame rather than a copy of it.
+        program = Let("x", Int(1), Fun("y", TInt(), Var("x")))
+        closure = interpret(program)
+        self.assertIsInstance(closure.env, Environment)
+        self.assertEqual(closure.env.name, "x")
+        self.assertEqual(closure.env.lookup("x"), Int(1))
+
+    def test_long_let_chain(self):
+        program = Var("x499")
+        for i in reversed(range(500)):
+            value = Int(0) if i == 0 else Var(f"x{i - 1}")
+            program = Let(f"x{i}", value, program)
+        self.assertEqual(interpret(program), Int(0))
+
+    def test_environment_extend_is_persistent(self):
+        base = Environment(bindings={"x": Int(1)})
+        extended = base.extend("x", Int(2))
+        self.assertEqual(base.lookup("x"), Int(1))
+        self.assertEqual(extended.lookup("x"), Int(2))
+        self.assertNotIn("y", extended)
+
+    def test_partial_application_is_shared(self):
+        env = {'add': Primitive(lambda a, b: Int(a + b), 2)}
+        program = Let("inc", App(Var("add"), Int(1)),
+                      Pair(App(Var("inc"), Int(2)), App(Var("inc"), Int(3))))
+        self.assertEqual(interpret(program, env), Pair(Int(3), Int(4)))
+        # The primitive in the caller's environment is left untouched.
+        self.assertEqual(env['add'].args, ())
+
+    def test_primitive_reuse(self):
+        program = Pair(App(Var("unparse"), Int(1)), App(Var("unparse"), Int(2)))
+        self.assertEqual(interpret(program), Pair(String("1"), String("2")))
+
+    def test_prelude_is_read_only(self):
+        with self.assertRaises(TypeError):
+            PRELUDE['parse'] = None
+        interpret(App(Var("eval"), App(Var("parse"), String("1"))))
+        self.assertIn('eval', PRELUDE)
+
+    def test_eval_uses_caller_environment(self):
+        program = App(Var("eval"), App(Var("parse"), String("x")))
+        self.assertEqual(interpret(program, {'x': Int(5)}), Int(5))
+
+    def test_list_value_matches_cons_chain(self):
+        chain = Cons(String("a"), Cons(String("b"), Nil(TString())))
+        value = list_value(["a", "b"], TString())
+        self.assertIsInstance(value, ListValue)
+        self.assertEqual(len(value), 2)
+        self.assertEqual(value, chain)
+        self.assertEqual(chain, value)
+        self.assertEqual(repr(value), repr(chain))
+        self.assertEqual(value.head, String("a"))
+        self.assertEqual(value.tail.tail, Nil(TString()))
+        self.assertEqual(list_value([], TString()), Nil(TString()))
+
+    def test_list_value_crosses_primitive_boundary(self):
+        value = _python_list_to_appl_list(["a", "b", "c"])
+        self.assertIsInstance(value, ListValue)
+        self.assertEqual(_appl_list_to_python_list(value), ["a", "b", "c"])
+        # A Cons cell in front of an array-backed tail is converted too.
+        self.assertEqual(_appl_list_to_python_list(Cons(String("z"), value.tail)), ["z", "b", "c"])
+
+    def test_list_value_is_a_value(self):
+        value = list_value(["a"], TString())
+        self.assertIs(interpret(Var("l"), {"l": value}), value)
+        self.assertIs(interpret(Let("x", Var("l"), Var("x")), {"l": value}, stack_safe=True), value)
+
+    def test_find_plan_returns_list_value(self):
+        program = Let(
+            "!domain", App(Var("load_domain"), String(self.aal_filepath)),
+            Let(
+                "!state", App(Var("create_state"), Cons(String("at_A"), Nil(TString()))),
+                App(Var("find_plan"), Cons(String("at_B"), Nil(TString())))
+            )
+        )
+        result = interpret(program)
+        self.assertIsInstance(result, ListValue)
+        self.assertEqual(result, Cons(String("move"), Nil(TString())))
+
+    def test_find_plan_with_options(self):
+        options = Cons(String("algorithm=idastar"), Cons(String("max_nodes=100"), Nil(TString())))
+        program = Let(
+            "!domain", App(Var("load_domain"), String(self.aal_filepath)),
+            Let(
+                "!state", App(Var("create_state"), Cons(String("at_A"), Nil(TString()))),
+                App(App(Var("find_plan_with"), options), Cons(String("at_B"), Nil(TString())))
+            )
+        )
+        self.assertEqual(interpret(program), Cons(String("move"), Nil(TString())))
+
+        bad_options = Cons(String("depth=3"), Nil(TString()))
+        with self.assertRaises(PlanningError):
+            interpret(App(App(Var("find_plan_with"), bad_options), Nil(TString())))
+
+    def test_plan_stats(self):
+        def program(find_plan):
+            return Let(
+                "!domain", App(Var("load_domain"), String(self.aal_filepath)),
+                Let(
+                    "!state", App(Var("create_state"), Cons(String("at_A"), Nil(TString()))),
+                    Let(
+                        "!plan", App(find_plan, Cons(String("at_B"), Nil(TString()))),
+                        App(Var("plan_stats"), Unit()),
+                    ),
+                ),
+            )
+
+        # Plain find_plan does not collect stats.
+        configure_plan_cache()  # Earlier tests may have cached this plan.
+        default_session().last_stats = None
+        self.assertEqual(_appl_list_to_python_list(interpret(program(Var("find_plan")))), [])
+
+        configure_plan_cache()
+        with_stats = App(Var("find_plan_with"), Cons(String("stats=true"), Nil(TString())))
+        stats = dict(s.split("=", 1) for s in _appl_list_to_python_list(interpret(program(with_stats))))
+        self.assertEqual(stats["status"], "solved")
+        self.assertEqual(stats["plan_length"], "1")
+        self.assertEqual(stats["source"], "search")
+        self.assertGreaterEqual(int(stats["generated"]), 2)
+
+
+class TestStackSafeInterpreter(unittest.TestCase):
+    DEPTH = 10 ** 5
+
+    def test_matches_recursive_interpreter(self):
+        programs = [
+            App(Fun('x', TInt(), Var('x')), Int(1)),
+            LetPair("x", "y", Pair(Int(1), Int(2)), Pair(Var("y"), Var("x"))),
+            Case(Inr(String("a"), TInt()), "x", Int(0), "y", Var("y")),
+            LetBang("x", Promote(Int(1)), Pair(Var("x"), Var("x"))),
+            Cons(Int(1), Cons(Int(2), Nil(TInt()))),
+            App(Var("eval"), App(Var("parse"), String('"hello"'))),
+        ]
+        for program in programs:
+            self.assertEqual(interpret(program, stack_safe=True), interpret(program))
+
+    def test_errors(self):
+        with self.assertRaises(InterpError):
+            interpret(Var('x'), stack_safe=True)
+        with self.assertRaises(InterpError):
+            interpret(App(Int(1), Int(2)), stack_safe=True)
+
+    def test_deep_cons_chain(self):
+        program = Nil(TInt())
+        for i in range(self.DEPTH):
+            program = Cons(Int(i), program)
+        result = interpret(program, stack_safe=True)
+        values = _appl_list_to_python_list(result)
+        self.assertEqual(len(values), self.DEPTH)
+        self.assertEqual(values[0], self.DEPTH - 1)
+        self.assertEqual(result, program)
+
+    def test_deep_let_nest(self):
+        program = Var(f"x{self.DEPTH - 1}")
+        for i in reversed(range(self.DEPTH)):
+            value = Int(0) if i == 0 else Var(f"x{i - 1}")
+            program = Let(f"x{i}", value, program)
+        self.assertEqual(interpret(program, stack_safe=True), Int(0))
+
+    def test_deep_nested_application(self):
+        identity = Fun('x', TInt(), Var('x'))
+        program = Int(7)
+        for _ in range(self.DEPTH):
+            program = App(identity, program)
+        self.assertEqual(interpret(program, stack_safe=True), Int(7))
+
 if __name__ == '__main__':
     unittest.main()
@@ -19,7 +19,7 @@ from appl_ast import (
     TInt,
     TString,
 )
-from parser import parse
+from parser import parse, tokenize, Token, parse_cache_info, INT, STRING, NAME, SYMBOL
 
 
 class TestParser(unittest.TestCase):
@@ -93,5 +93,42 @@ class TestParser(unittest.TestCase):
         self.assertEqual(parse("1 :: 2 :: Nil(Int)"), Cons(Int(1), Cons(Int(2), Nil(TInt()))))
 
 
+    def test_tokenize_positions(self):
+        tokens = list(tokenize('let x = 1 in\n  "a b" // comment\n'))
+        self.assertEqual(tokens, [
+            Token(NAME, 'let', 1, 1),
+            Token(NAME, 'x', 1, 5),
+            Token(SYMBOL, '=', 1, 7),
+            Token(INT, '1', 1, 9),
+            Token(NAME, 'in', 1, 11),
+            Token(STRING, '"a b"', 2, 3),
+        ])
+
+    def test_comment_markers_inside_strings(self):
+        self.assertEqual(parse('"http://example.org"'), String("http://example.org"))
+
+    def test_unexpected_character(self):
+        with self.assertRaisesRegex(ValueError, r"Unexpected character '\?' at line 2, column 3"):
+            parse("f\nx ?")
+
+    def test_parse_error_reports_line(self):
+        with self.assertRaisesRegex(ValueError, r"\(line 2, column 1\)"):
+            parse("let x = 1\nlet y = x in y")
+
+    def test_parse_cache(self):
+        source = "fn cached : Int => cached"
+        first = parse(source)
+        hits = parse_cache_info().hits
+        self.assertIs(parse(source), first)
+        self.assertEqual(parse_cache_info().hits, hits + 1)
+
+    def test_cached_terms_are_immutable(self):
+        term = parse("fn shared : Int => shared")
+        with self.assertRaises(AttributeError):
+            term.body = Int(1)
+        with self.assertRaises(AttributeError):
+            del term.var
+        self.assertEqual(parse("fn shared : Int => shared"), Fun("shared", TInt(), Var("shared")))
+
 if __name__ == '__main__':
     unittest.main()
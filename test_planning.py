@@ -1,3 +1,5 @@
+import os
+import tempfile
 import unittest
 import planning
 from tooling.aal.domain import Domain, Fluent, Action, CausalLaw
@@ -8,6 +10,8 @@ class TestPlanning(unittest.TestCase):
         # Reset the global state in the planning module for each test
         planning.domain = None
         planning.current_state = set()
+        planning.configure_plan_cache()
+        planning.configure_domain_cache(enabled=False)
 
     def _setup_simple_domain(self):
         """Helper to create a simple AAL domain for testing."""
@@ -75,5 +79,627 @@ class TestPlanning(unittest.TestCase):
         plan = planning.find_plan(["c"])
         self.assertEqual(plan, ["a_to_b", "b_to_c"])
 
+    def test_compiled_domain_groups_laws_by_action(self):
+        self._setup_simple_domain()
+        compiled = planning.domain.compile()
+        move = Action("move_to_b")
+        self.assertEqual(
+            compiled.transitions[move],
+            ((frozenset([Fluent("at_a")]), frozenset([Fluent("at_b")])),),
+        )
+        self.assertEqual(compiled.next_state({Fluent("at_a")}, move), {Fluent("at_b")})
+        self.assertEqual(compiled.next_state({Fluent("at_c")}, move), set())
+
+    def test_compiled_domain_matches_interpreter(self):
+        from tooling.aal.interpreter import Interpreter
+        from tooling.aal.parser import parse_aal
+        with open("tests/test_domain.aal") as f:
+            test_domain = parse_aal(f.read())
+        compiled = test_domain.compile()
+        interpreter = Interpreter()
+        states = [set(), {Fluent("light_on")}, {Fluent("light_off")},
+                  {Fluent("light_on"), Fluent("light_off")}]
+        for state in states:
+            for action in test_domain.actions:
+                self.assertEqual(
+                    interpreter.get_next_state(state, action, compiled),
+                    interpreter.get_next_state(state, action, test_domain),
+                )
+
+    def test_apply_action_recompiles_replaced_domain(self):
+        self._setup_simple_domain()
+        planning.create_state(["at_a"])
+        self.assertEqual(planning.apply_action("move_to_b"), {Fluent("at_b")})
+
+        self._setup_simple_domain()
+        planning.domain.causal_laws.add(
+            CausalLaw(Action("move_to_b"), Fluent("at_c"), frozenset([Fluent("at_b")]))
+        )
+        self.assertEqual(planning.apply_action("move_to_b"), {Fluent("at_c")})
+
+    def test_bitset_encoding_round_trips(self):
+        self._setup_simple_domain()
+        compiled = planning.domain.compile()
+        state = {Fluent("at_a"), Fluent("at_c")}
+        mask = compiled.encode(state)
+        self.assertEqual(bin(mask).count("1"), 2)
+        self.assertEqual(compiled.decode(mask), state)
+        self.assertEqual(compiled.encode({Fluent("elsewhere")}), 0)
+        self.assertEqual(
+            compiled.next_mask(mask, Action("move_to_b")),
+            compiled.encode({Fluent("at_b")}),
+        )
+
+    def test_find_plan_unknown_goal_fluent(self):
+        self._setup_simple_domain()
+        planning.create_state(["at_a"])
+        self.assertIsNone(planning.find_plan(["at_b", "elsewhere"]))
+
+    def test_find_plan_wide_domain(self):
+        # More fluents than fit in a machine word.
+        test_domain = Domain()
+        n = 100
+        fluents = [Fluent(f"p{i}") for i in range(n + 1)]
+        test_domain.fluents.update(fluents)
+        for i in range(n):
+            action = Action(f"step{i}")
+            test_domain.actions.add(action)
+            test_domain.causal_laws.add(
+                CausalLaw(action=action, effect=fluents[i + 1], conditions=frozenset([fluents[i]]))
+            )
+        planning.domain = test_domain
+        planning.create_state(["p0"])
+        plan = planning.find_plan([f"p{n}"])
+        self.assertEqual(plan, [f"step{i}" for i in range(n)])
+
+    def _setup_ladder_domain(self, n=4, distractors=3):
+        from benchmarks.bench_planner import ladder_domain
+        from tooling.aal.parser import parse_aal
+        planning.domain = parse_aal(ladder_domain(n, distractors))
+
+    def test_relaxed_heuristics(self):
+        from tooling.aal.heuristics import get_heuristic
+        self._setup_ladder_domain(n=4)
+        compiled = planning.domain.compile()
+        state = compiled.encode({Fluent("p1"), Fluent("d0")})
+        goal = compiled.encode({Fluent("p4"), Fluent("d1")})
+        self.assertEqual(get_heuristic("goal_count", compiled)(state, goal), 2)
+        self.assertEqual(get_heuristic("h_max", compiled)(state, goal), 3)
+        self.assertEqual(get_heuristic("h_add", compiled)(state, goal), 3 + 1)
+        self.assertEqual(get_heuristic("h_ff", compiled)(state, goal), 4)
+        self.assertEqual(get_heuristic("h_ff", compiled)(goal, goal), 0)
+
+    def test_relaxed_heuristics_detect_dead_ends(self):
+        from tooling.aal.heuristics import get_heuristic
+        self._setup_simple_domain()
+        compiled = planning.domain.compile()
+        goal = compiled.encode({Fluent("at_c")})
+        for name in ("h_max", "h_add", "h_ff"):
+            self.assertIsNone(get_heuristic(name, compiled)(compiled.encode({Fluent("at_a")}), goal))
+
+    def test_find_plan_with_each_heuristic(self):
+        from tooling.aal.heuristics import HEURISTICS
+        self._setup_ladder_domain()
+        for name in HEURISTICS:
+            planning.create_state(["p0"])
+            self.assertEqual(
+                planning.find_plan(["p4"], heuristic=name),
+                ["step0", "step1", "step2", "step3"],
+            )
+        self._setup_simple_domain()
+        planning.create_state(["at_a"])
+        self.assertIsNone(planning.find_plan(["at_c"], heuristic="h_ff"))
+
+    def test_find_plan_unknown_heuristic(self):
+        self._setup_simple_domain()
+        planning.create_state(["at_a"])
+        for direction in planning.SEARCH_DIRECTIONS:
+            with self.assertRaises(planning.PlanningError):
+                planning.find_plan(["at_b"], heuristic="h_magic", direction=direction)
+
+    def test_heuristic_is_built_once_per_search(self):
+        self._setup_ladder_domain()
+        planning.create_state(["p0"])
+        calls = []
+        get_heuristic = planning.get_heuristic
+        planning.get_heuristic = lambda name, compiled: calls.append(name) or get_heuristic(name, compiled)
+        try:
+            planning.search(["p4"], heuristic="h_max", use_cache=False)
+        finally:
+            planning.get_heuristic = get_heuristic
+        self.assertEqual(calls, ["h_max"])
+
+    def test_weighted_astar_and_idastar(self):
+        self._setup_ladder_domain()
+        expected = ["step0", "step1", "step2", "step3"]
+        for options in (
+            {"weight": 3.0},
+            {"algorithm": "idastar"},
+            {"algorithm": "idastar", "heuristic": "h_max"},
+            {"algorithm": "idastar", "weight": 2.0, "heuristic": "h_ff"},
+        ):
+            planning.create_state(["p0"])
+            self.assertEqual(planning.find_plan(["p4"], **options), expected, options)
+
+    def test_idastar_no_plan(self):
+        self._setup_simple_domain()
+        planning.create_state(["at_a"])
+        self.assertIsNone(planning.find_plan(["at_c"], algorithm="idastar"))
+
+    def test_node_budget_returns_best_partial_plan(self):
+        self._setup_ladder_domain(n=6)
+        planning.create_state(["p0"])
+        result = planning.search(["p6"], heuristic="h_add", max_nodes=10)
+        self.assertEqual(result.status, planning.BUDGET_EXHAUSTED)
+        self.assertFalse(result.complete)
+        self.assertEqual(result.nodes, 10)
+        # The best node so far is on the way up the ladder.
+        self.assertTrue(result.plan)
+        self.assertTrue(all(action.startswith("step") for action in result.plan))
+
+        planning.create_state(["p0"])
+        self.assertIsNone(planning.find_plan(["p6"], heuristic="h_add", max_nodes=10))
+        planning.create_state(["p0"])
+        self.assertEqual(
+            planning.find_plan(["p6"], heuristic="h_add", max_nodes=10, partial=True),
+            result.plan,
+        )
+
+    def test_search_reports_status(self):
+        self._setup_simple_domain()
+        planning.create_state(["at_a"])
+        self.assertEqual(planning.search(["at_b"]).status, planning.SOLVED)
+        self.assertEqual(planning.search(["at_c"]).status, planning.NO_PLAN)
+        self.assertEqual(planning.search(["at_a"]).plan, [])
+
+    def test_invalid_search_options(self):
+        self._setup_simple_domain()
+        planning.create_state(["at_a"])
+        with self.assertRaises(planning.PlanningError):
+            planning.find_plan(["at_b"], algorithm="dfs")
+        with self.assertRaises(planning.PlanningError):
+            planning.find_plan(["at_b"], weight=0.5)
+
+    def test_parse_search_options(self):
+        self.assertEqual(
+            planning.parse_search_options(["weight=2", "max_nodes = 10", "partial=true", "heuristic=h_ff", "stats=no"]),
+            {"weight": 2.0, "max_nodes": 10, "partial": True, "heuristic": "h_ff", "stats": False},
+        )
+        for bad in (["weight"], ["depth=3"], ["max_nodes=many"]):
+            with self.assertRaises(planning.PlanningError):
+                planning.parse_search_options(bad)
+
+    def test_goal_regression(self):
+        from tooling.aal.regression import regression_tables
+        self._setup_ladder_domain()
+        compiled = planning.domain.compile()
+        tables = regression_tables(compiled)
+        self.assertIs(regression_tables(compiled), tables)
+        p1, p2, d0 = (compiled.bits[Fluent(name)] for name in ("p1", "p2", "d0"))
+        step1 = compiled.actions.index(Action("step1"))
+        # step1 makes p2 true if p1 held, or keeps it true through its frame law.
+        self.assertEqual(tables.regress(p2, step1), {p1, p2})
+        self.assertEqual(tables.regress(p2 | d0, step1), {p1 | d0, p2 | d0})
+        toggle0 = compiled.actions.index(Action("toggle0"))
+        self.assertEqual(tables.regress(d0, toggle0), {0})
+
+    def _replay(self, initial, plan, goal):
+        planning.create_state(initial)
+        for action in plan:
+            planning.apply_action(action)
+        return planning.is_goal(goal)
+
+    def test_backward_and_bidirectional_search(self):
+        from benchmarks.bench_planner import chains_domain
+        from tooling.aal.parser import parse_aal
+        self._setup_ladder_domain()
+        for direction in ("backward", "bidirectional", "auto"):
+            for heuristic in ("goal_count", "h_max", "h_ff"):
+                planning.create_state(["p0"])
+                result = planning.search(["p4", "d1"], heuristic=heuristic, direction=direction)
+                self.assertEqual(result.status, planning.SOLVED)
+                self.assertEqual(len(result.plan), 5)
+                self.assertTrue(self._replay(["p0"], result.plan, ["p4", "d1"]))
+
+        planning.domain = parse_aal(chains_domain(2, 3))
+        initial, goal = ["c0_0", "c1_0"], ["c0_3", "c1_3"]
+        for direction in ("backward", "bidirectional"):
+            planning.create_state(initial)
+            plan = planning.find_plan(goal, heuristic="h_add", direction=direction)
+            self.assertEqual(len(plan), 6)
+            self.assertTrue(self._replay(initial, plan, goal))
+
+        self._setup_simple_domain()
+        for direction in ("backward", "bidirectional", "auto"):
+            planning.create_state(["at_a"])
+            self.assertEqual(planning.find_plan(["at_b"], direction=direction), ["move_to_b"])
+            planning.create_state(["at_a"])
+            self.assertIsNone(planning.find_plan(["at_c"], direction=direction))
+
+        # An unconditional law regresses the goal to the empty subgoal.
+        planning.domain = parse_aal("fluent a\nfluent b\naction go\ngo causes b\ngo causes a if a\n")
+        for direction in ("backward", "bidirectional"):
+            planning.create_state([])
+            self.assertEqual(planning.find_plan(["b"], direction=direction), ["go"])
+
+    def test_search_direction_choice(self):
+        self.assertEqual(planning.choose_direction(8.0, 1.0), "backward")
+        self.assertEqual(planning.choose_direction(1.0, 8.0), "forward")
+        self.assertEqual(planning.choose_direction(3.0, 3.0), "bidirectional")
+        self.assertEqual(planning.choose_direction(3.0, 3.0, informed=True), "forward")
+        # Few actions produce the top of the ladder, so the goal is regressed.
+        self._setup_ladder_domain(n=6, distractors=6)
+        planning.create_state(["p0"])
+        result = planning.search(["p6"], direction="auto")
+        self.assertEqual(result.direction, "backward")
+        self.assertEqual(len(result.plan), 6)
+
+    def test_backward_search_budget(self):
+        self._setup_ladder_domain(n=6)
+        for direction in ("backward", "bidirectional"):
+            planning.create_state(["p0"])
+            result = planning.search(["p6"], direction=direction, max_nodes=3)
+            self.assertEqual(result.status, planning.BUDGET_EXHAUSTED)
+            self.assertEqual(result.nodes, 3)
+            # Partial plans are always prefixes from the current state.
+            self.assertTrue(self._replay(["p0"], result.plan, []))
+
+    def test_invalid_search_direction(self):
+        self._setup_simple_domain()
+        planning.create_state(["at_a"])
+        with self.assertRaises(planning.PlanningError):
+            planning.find_plan(["at_b"], direction="sideways")
+        with self.assertRaises(planning.PlanningError):
+            planning.find_plan(["at_b"], direction="backward", algorithm="idastar")
+        self.assertEqual(planning.parse_search_options(["direction=auto"]), {"direction": "auto"})
+
+    def test_search_stats(self):
+        self._setup_ladder_domain()
+        planning.create_state(["p0"])
+        self.assertIsNone(planning.search(["p4"]).stats)
+
+        for options in (
+            {},
+            {"heuristic": "h_add"},
+            {"algorithm": "idastar"},
+            {"direction": "backward"},
+            {"direction": "bidirectional"},
+        ):
+            planning.create_state(["p0"])
+            result = planning.search(["p4"], use_cache=False, stats=True, **options)
+            stats = result.stats
+            self.assertIs(planning.last_search_stats(), stats)
+            self.assertEqual((stats.source, stats.status, stats.plan_length), ("search", planning.SOLVED, 4))
+            self.assertEqual(stats.generated, result.nodes)
+            self.assertGreater(stats.expanded, 0, options)
+            self.assertGreater(stats.peak_open, 0, options)
+            self.assertGreater(stats.successor_time, 0, options)
+            self.assertGreaterEqual(stats.total_time, stats.heuristic_time + stats.successor_time)
+            if options.get("direction") != "bidirectional":
+                self.assertGreater(stats.heuristic_calls, 0, options)
+
+        # The ladder's toggles lead back to states that were already expanded.
+        planning.create_state(["p0"])
+        self.assertGreater(planning.search(["p4"], use_cache=False, stats=True).stats.duplicates, 0)
+
+        planning.create_state(["p0"])
+        planning.search(["p4"], stats=True)
+        planning.create_state(["p0"])
+        self.assertEqual(planning.search(["p4"], stats=True).stats.source, "cache")
+        self.assertEqual(planning.search(["p0"], stats=True).stats.source, "goal")
+
+    def test_search_stats_are_logged(self):
+        class RecordingLogger:
+            def __init__(self):
+                self.entries = []
+
+            def log(self, phase, task_id, plan_step, action_type, action_details, outcome_status, **kwargs):
+                self.entries.append((action_type, action_details, outcome_status))
+
+        from benchmarks.bench_planner import ladder_domain
+        from tooling.aal.parser import parse_aal
+        logger = RecordingLogger()
+        session = planning.PlanningSession(parse_aal(ladder_domain(4, 3)), logger=logger)
+        session.create_state(["p0"])
+        result = session.search(["p4"])
+        self.assertIs(session.last_stats, result.stats)
+        [(action_type, details, status)] = logger.entries
+        self.assertEqual((action_type, status), ("INFO", "SUCCESS"))
+        self.assertEqual(details["planner_stats"], result.stats.as_dict())
+
+    def test_domain_fingerprint_ignores_order(self):
+        self._setup_ladder_domain()
+        first = planning.domain
+        self._setup_ladder_domain()
+        self.assertIsNot(first, planning.domain)
+        self.assertEqual(first.fingerprint(), planning.domain.fingerprint())
+        planning.domain.fluents.add(Fluent("extra"))
+        self.assertNotEqual(first.fingerprint(), planning.domain.fingerprint())
+
+    def test_plan_cache_hits_and_misses(self):
+        cache = planning.configure_plan_cache(capacity=8)
+        self._setup_ladder_domain()
+        planning.create_state(["p0"])
+        first = planning.search(["p4"])
+        self.assertEqual(cache.stats()["misses"], 1)
+        planning.create_state(["p0"])
+        second = planning.search(["p4"])
+        self.assertEqual(second.plan, first.plan)
+        self.assertEqual(second.nodes, 0)
+        self.assertEqual(cache.stats()["hits"], 1)
+
+        # Changing a returned plan does not change the cached one.
+        expected = list(first.plan)
+        first.plan.append("bogus")
+        second.plan.append("bogus")
+        planning.create_state(["p0"])
+        self.assertEqual(planning.find_plan(["p4"]), expected)
+        self.assertEqual(cache.stats()["hits"], 2)
+
+        # Other goals, heuristics and budget-limited searches are not hits.
+        planning.search(["p3"])
+        planning.search(["p4"], heuristic="h_add")
+        planning.search(["p4"], heuristic="h_add", algorithm="idastar", max_nodes=1)
+        planning.search(["p4"], use_cache=False)
+        self.assertEqual(cache.stats()["hits"], 2)
+        self.assertEqual(cache.stats()["size"], 3)
+
+    def test_plan_cache_is_an_lru(self):
+        from tooling.aal.plan_cache import PlanCache
+        cache = PlanCache(capacity=2)
+        for key in "abc":
+            cache.put(key, "fp", planning.SOLVED, [key])
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get("c"), (planning.SOLVED, ["c"]))
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_plan_cache_persists_and_invalidates_changed_domains(self):
+        with tempfile.TemporaryDirectory() as workdir:
+            domain_path = os.path.join(workdir, "domain.aal")
+            cache_path = os.path.join(workdir, "plans.sqlite")
+            with open(domain_path, "w") as f:
+                f.write("fluent a\nfluent b\naction go\ngo causes b if a\n")
+
+            planning.configure_plan_cache(path=cache_path)
+            planning.load_domain(domain_path)
+            planning.create_state(["a"])
+            self.assertEqual(planning.find_plan(["b"]), ["go"])
+
+            # A new cache over the same file answers from disk.
+            cache = planning.configure_plan_cache(path=cache_path)
+            planning.load_domain(domain_path)
+            planning.create_state(["a"])
+            self.assertEqual(planning.find_plan(["b"]), ["go"])
+            self.assertEqual(cache.stats()["disk_hits"], 1)
+
+            # Changing the file drops the old plans.
+            with open(domain_path, "w") as f:
+                f.write("fluent a\nfluent b\naction jump\njump causes b if a\n")
+            planning.load_domain(domain_path)
+            self.assertEqual(cache.stats()["invalidations"], 1)
+            self.assertEqual(cache.stats()["size"], 0)
+            planning.create_state(["a"])
+            self.assertEqual(planning.find_plan(["b"]), ["jump"])
+            planning.configure_plan_cache()
+
+    def test_sessions_are_independent(self):
+        from tooling.aal.parser import parse_aal
+        from benchmarks.bench_planner import ladder_domain
+        first = planning.PlanningSession(parse_aal(ladder_domain(3, 1)))
+        second = planning.PlanningSession(parse_aal(ladder_domain(5, 1)))
+        first.create_state(["p0"])
+        second.create_state(["p0"])
+        second.apply_action("step0")
+        self.assertEqual(first.get_current_state(), ["p0"])
+        self.assertEqual(second.get_current_state(), ["p0", "p1"])
+        self.assertEqual(first.find_plan(["p3"]), ["step0", "step1", "step2"])
+        self.assertEqual(second.find_plan(["p5"]), ["step1", "step2", "step3", "step4"])
+        # The module-level default session is untouched.
+        self.assertIsNone(planning.domain)
+
+    def test_sessions_on_threads(self):
+        from concurrent.futures import ThreadPoolExecutor
+        from tooling.aal.parser import parse_aal
+        from benchmarks.bench_planner import ladder_domain
+
+        def solve(n):
+            session = planning.PlanningSession(parse_aal(ladder_domain(n, 2)))
+            session.create_state(["p0"])
+            return session.find_plan([f"p{n}"], use_cache=False)
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            plans = list(executor.map(solve, range(1, 9)))
+        self.assertEqual(plans, [[f"step{i}" for i in range(n)] for n in range(1, 9)])
+
+    def test_module_functions_follow_default_session(self):
+        self._setup_simple_domain()
+        planning.create_state(["at_a"])
+        session = planning.default_session()
+        self.assertIs(session.domain, planning.domain)
+        session.apply_action("move_to_b")
+        self.assertEqual(session.current_state, {Fluent("at_b")})
+        # Module globals are copied into the session on the next call.
+        planning.current_state = {Fluent("at_a")}
+        self.assertEqual(planning.apply_action("move_to_b"), {Fluent("at_b")})
+        self.assertIs(planning.compiled_domain, session.compiled)
+
+    def test_solve_batch(self):
+        from benchmarks.bench_planner import ladder_domain
+        from tooling.aal.parser import parse_aal
+        with tempfile.TemporaryDirectory() as workdir:
+            domain_path = os.path.join(workdir, "ladder.aal")
+            with open(domain_path, "w") as f:
+                f.write(ladder_domain(4, 2))
+            problems = [
+                (domain_path, ["p0"], ["p4"]),
+                planning.PlanningProblem(domain_path, ["p2"], ["p4"]),
+                (parse_aal(ladder_domain(2, 0)), ["p0"], ["p2"]),
+                (domain_path, ["p0"], ["missing"]),
+            ]
+            for processes in (1, 2):
+                results = planning.solve_batch(problems, processes=processes, heuristic="h_add")
+                self.assertEqual(
+                    [r.plan for r in results],
+                    [["step0", "step1", "step2", "step3"], ["step2", "step3"], ["step0", "step1"], None],
+                )
+                self.assertEqual(results[-1].status, planning.NO_PLAN)
+
+    def test_parse_aal_single_pass(self):
+        from tooling.aal.parser import parse_aal
+        parsed = parse_aal(
+            "  fluent a \n\naction go\r\ngo causes b if a , c\r\n"
+            "fluent\nstray\nthis line is ignored\ngo causes d\n"
+        )
+        self.assertEqual(parsed.fluents, {Fluent("a")})
+        self.assertEqual(parsed.actions, {Action("go")})
+        self.assertEqual(parsed.causal_laws, {
+            CausalLaw(Action("go"), Fluent("b"), frozenset([Fluent("a"), Fluent("c")])),
+            CausalLaw(Action("go"), Fluent("d"), frozenset()),
+        })
+
+    def test_domain_cache(self):
+        with tempfile.TemporaryDirectory() as workdir:
+            domain_path = os.path.join(workdir, "domain.aal")
+            with open(domain_path, "w") as f:
+                f.write("fluent a\nfluent b\naction go\ngo causes b if a\n")
+            cache = planning.configure_domain_cache(os.path.join(workdir, "cache"))
+            try:
+                planning.load_domain(domain_path)
+                first = planning.domain
+                planning.load_domain(domain_path)
+                self.assertEqual(cache.stats(), {"hits": 1, "rehashed_hits": 0, "misses": 1})
+                self.assertIsNot(planning.domain, first)
+                self.assertEqual(planning.domain.fingerprint(), first.fingerprint())
+
+                # Touching the file changes its mtime but not its contents.
+                stat = os.stat(domain_path)
+                os.utime(domain_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+                planning.load_domain(domain_path)
+                planning.load_domain(domain_path)
+                self.assertEqual(cache.stats(), {"hits": 2, "rehashed_hits": 1, "misses": 1})
+
+                with open(domain_path, "w") as f:
+                    f.write("fluent a\nfluent b\naction jump\njump causes b if a\n")
+                planning.load_domain(domain_path)
+                self.assertEqual(cache.stats()["misses"], 2)
+                planning.create_state(["a"])
+                self.assertEqual(planning.find_plan(["b"]), ["jump"])
+
+                # A corrupt cache file is ignored.
+                with open(cache.cache_path(domain_path), "r+b") as f:
+                    f.seek(-8, os.SEEK_END)
+                    f.write(b"garbage!")
+                planning.load_domain(domain_path)
+                self.assertEqual(cache.stats()["misses"], 3)
+            finally:
+                planning.configure_domain_cache(enabled=False)
+
+    def test_domain_cache_limits(self):
+        from tooling.aal.domain_cache import DomainCache
+        from tooling.aal.parser import parse_aal
+        self.assertIsNone(planning.domain_cache)  # Off until turned on.
+        with tempfile.TemporaryDirectory() as workdir:
+            cache = DomainCache(os.path.join(workdir, "cache"), max_entries=2)
+            paths = []
+            for i in range(3):
+                paths.append(os.path.join(workdir, f"domain{i}.aal"))
+                with open(paths[-1], "w") as f:
+                    f.write(f"fluent a{i}\naction go\n")
+                cache.load(paths[-1], parse_aal)
+                # Later loads must look more recently used on coarse clocks too.
+                os.utime(cache.cache_path(paths[-1]), ns=(i * 10 ** 9, i * 10 ** 9))
+            cache.load(paths[1], parse_aal)  # A hit keeps domain1 in the cache.
+            cache.load(paths[0], parse_aal)
+            self.assertEqual(cache.stats(), {"hits": 1, "rehashed_hits": 0, "misses": 4})
+            self.assertEqual(
+                sorted(os.listdir(cache.directory)),
+                sorted(os.path.basename(cache.cache_path(p)) for p in paths[:2]),
+            )
+
+            # Cache files in a directory others can write to are not read.
+            os.chmod(cache.directory, 0o777)
+            cache.load(paths[0], parse_aal)
+            self.assertEqual(cache.stats()["misses"], 5)
+
+    def test_load_domain_without_cache(self):
+        planning.configure_domain_cache(enabled=False)
+        try:
+            planning.load_domain("tests/test_domain.aal")
+            self.assertIn(Action("turn_on"), planning.domain.actions)
+            with self.assertRaises(planning.PlanningError):
+                planning.load_domain("tests/missing.aal")
+        finally:
+            planning.configure_domain_cache(enabled=False)
+
+    def test_materialized_state_space(self):
+        from tooling.aal.parser import parse_aal
+        from benchmarks.bench_planner import chains_domain
+        session = planning.PlanningSession(parse_aal(chains_domain(2, 3)))
+        session.create_state(["c0_0", "c1_0"])
+        expected = session.find_plan(["c0_3", "c1_2"], heuristic="h_max", use_cache=False)
+
+        space = session.materialize()
+        self.assertEqual(len(space), 16)  # 4 positions on each of two chains
+        result = session.search(["c0_3", "c1_2"])
+        self.assertEqual(result.status, planning.SOLVED)
+        self.assertEqual(len(result.plan), len(expected))
+        self.assertEqual(result.nodes, 0)
+        self.assertIsNone(session.find_plan(["c0_0", "c0_1", "c0_3", "missing"]))
+
+        # A start state outside the graph is explored on demand.
+        session.create_state(["c0_2"])
+        self.assertEqual(session.find_plan(["c0_3"]), ["advance0_2"])
+        self.assertEqual(len(space), 16 + 2)
+
+    def test_state_space_limits(self):
+        from tooling.aal.parser import parse_aal
+        from benchmarks.bench_planner import ladder_domain
+        session = planning.PlanningSession(parse_aal(ladder_domain(3, 4)))
+        session.create_state(["p0"])
+        with self.assertRaises(planning.PlanningError):
+            session.materialize(max_states=10)
+
+        session.create_state(["p3"])
+        space = session.materialize(max_states=20)
+        self.assertEqual(len(space), 16)
+        # Too many states from here: fall back to search and keep the graph.
+        session.create_state(["p0"])
+        self.assertEqual(session.find_plan(["p3"]), ["step0", "step1", "step2"])
+        self.assertEqual(len(space), 16)
+        self.assertEqual(len(space.targets), 16 * len(session.compiled.actions))
+
+    def test_state_space_persistence(self):
+        from tooling.aal.parser import parse_aal
+        from benchmarks.bench_planner import ladder_domain
+        with tempfile.TemporaryDirectory() as workdir:
+            path = os.path.join(workdir, "ladder.states")
+            session = planning.PlanningSession(parse_aal(ladder_domain(4, 2)))
+            session.create_state(["p0"])
+            saved = session.materialize()
+            session.save_state_space(path)
+
+            other = planning.PlanningSession(parse_aal(ladder_domain(4, 2)))
+            other.create_state(["p0"])
+            loaded = other.load_state_space(path)
+            self.assertEqual(loaded.states, saved.states)
+            self.assertEqual(loaded.targets, saved.targets)
+            self.assertEqual(other.find_plan(["p4", "d1"]), session.find_plan(["p4", "d1"]))
+            self.assertEqual(len(other.find_plan(["p4", "d1"])), 5)
+
+            different = planning.PlanningSession(parse_aal(ladder_domain(4, 3)))
+            with self.assertRaises(planning.PlanningError):
+                different.load_state_space(path)
+
+            # A saved space larger than the limit is rejected, not loaded.
+            with self.assertRaises(planning.PlanningError):
+                other.load_state_space(path, max_states=len(saved) - 1)
+            self.assertIs(other.state_space, loaded)
+            self.assertEqual(len(other.load_state_space(path, max_states=len(saved))), len(saved))
+
+    def test_apply_unknown_action(self):
+        self._setup_simple_domain()
+        with self.assertRaises(planning.PlanningError):
+            planning.apply_action("fly")
+
 if __name__ == '__main__':
     unittest.main()
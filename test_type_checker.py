@@ -1,4 +1,6 @@
+import gc
 import unittest
+import weakref
 from appl_ast import (
     Int,
     String,
@@ -22,8 +24,41 @@ from appl_ast import (
     TExponential,
     TProd,
     TSum,
+    TList,
+    Let,
 )
-from type_checker import type_check, TypeCheckError
+from type_checker import type_check, TypeCheckError, IncrementalTypeChecker, check_incremental
+
+
+# (term, unrestricted context, linear context), including terms that fail to check.
+TYPE_CHECKER_CORPUS = [
+    (Int(1), None, None),
+    (String("hello"), None, None),
+    (Unit(), None, None),
+    (Var('x'), {'x': TInt()}, None),
+    (Var('x'), None, {'x': TInt()}),
+    (Var('x'), None, None),
+    (Fun('x', TInt(), Var('x')), None, None),
+    (Fun('x', TExponential(TInt()), Pair(Var('x'), Var('x'))), None, None),
+    (App(Fun('x', TInt(), Var('x')), Int(1)), None, None),
+    (App(Fun('x', TInt(), Var('x')), String("hello")), None, None),
+    (Pair(Int(1), String("hello")), None, None),
+    (LetPair('x', 'y', Pair(Int(1), String("hello")), Pair(Var('x'), Var('y'))), None, None),
+    (Inl(Int(1), TString()), None, None),
+    (Case(Inl(Int(1), TInt()), 'x', Var('x'), 'y', Var('y')), None, None),
+    (Case(Inl(Int(1), TString()), 'x', Var('x'), 'y', Var('y')), None, None),
+    (Case(Inl(Int(1), TInt()), 'x', Pair(Var('x'), Var('z')), 'y', Pair(Var('y'), Var('z'))), None, {'z': TInt()}),
+    (Promote(Int(1)), None, None),
+    (Promote(Var('x')), None, {'x': TInt()}),
+    (LetBang('x', Promote(Int(1)), Var('x')), None, None),
+    (Int(1), None, {'x': TInt()}),
+    (Let('x', Int(1), Pair(Var('x'), Var('x'))), None, None),
+    (Let('x', Int(1), Int(2)), None, None),
+    # Bindings outlive their scope in `TypeChecker`, and the incremental checker follows it.
+    (Pair(LetBang('x', Promote(Int(1)), Int(2)), Var('x')), None, None),
+    (Pair(Promote(Fun('x', TExponential(TInt()), Int(1))), Pair(Var('x'), Var('x'))), None, None),
+    (App(Var('parse'), String("1")), None, None),
+]
 
 
 class TestTypeChecker(unittest.TestCase):
@@ -106,5 +141,119 @@ class TestTypeChecker(unittest.TestCase):
             type_check(Int(1), linear_context={'x': TInt()})
 
 
+    def test_types_are_interned(self):
+        self.assertIs(TInt(), TInt())
+        self.assertIs(TFun(TList(TInt()), TProd(TString(), TBool())),
+                      TFun(TList(TInt()), TProd(TString(), TBool())))
+        self.assertIsNot(TSum(TInt(), TString()), TSum(TString(), TInt()))
+        self.assertEqual(hash(TExponential(TInt())), hash(TExponential(TInt())))
+
+    def test_unused_types_are_collected(self):
+        unused = TFun(TExponential(TSum(TUnit(), TBool())), TList(TList(TUnit())))
+        ref = weakref.ref(unused)
+        del unused
+        gc.collect()
+        self.assertIsNone(ref())
+
+    def test_types_are_immutable(self):
+        with self.assertRaises(AttributeError):
+            TList(TInt()).t = TString()
+
+    def test_type_check_returns_canonical_types(self):
+        pair = Pair(Int(1), Pair(String("a"), Bool(True)))
+        self.assertIs(type_check(pair), TProd(TInt(), TProd(TString(), TBool())))
+
+
+class TestIncrementalTypeChecker(unittest.TestCase):
+    def test_agrees_with_type_check(self):
+        terms = [
+            Int(1),
+            Fun('x', TInt(), Var('x')),
+            Fun('x', TExponential(TInt()), Pair(Var('x'), Var('x'))),
+            App(Fun('x', TInt(), Var('x')), Int(1)),
+            LetPair('x', 'y', Pair(Int(1), String("hello")), Pair(Var('x'), Var('y'))),
+            Case(Inl(Int(1), TInt()), 'x', Var('x'), 'y', Var('y')),
+            LetBang('x', Promote(Int(1)), Var('x')),
+            App(Var('parse'), String("1")),
+        ]
+        for term in terms:
+            self.assertIs(IncrementalTypeChecker().check(term), type_check(term))
+
+    def test_errors(self):
+        with self.assertRaises(TypeCheckError):
+            IncrementalTypeChecker().check(Var('x'))
+        with self.assertRaisesRegex(TypeCheckError, "Unused linear variables: x"):
+            IncrementalTypeChecker().check(Let('x', Int(1), Int(2)))
+        with self.assertRaisesRegex(TypeCheckError, "Variable 'x' not found"):
+            IncrementalTypeChecker().check(Let('x', Int(1), Pair(Var('x'), Var('x'))))
+        with self.assertRaises(TypeCheckError):
+            IncrementalTypeChecker(linear_context={'x': TInt()}).check(Promote(Var('x')))
+
+    def test_agrees_with_type_checker_on_corpus(self):
+        def outcome(check):
+            try:
+                return check()
+            except TypeCheckError as error:
+                return str(error)
+
+        checker = IncrementalTypeChecker()
+        for term, unrestricted, linear in TYPE_CHECKER_CORPUS:
+            expected = outcome(lambda: type_check(term, unrestricted, linear))
+            incremental = IncrementalTypeChecker(unrestricted, linear)
+            self.assertEqual(outcome(lambda: incremental.check(term)), expected, term)
+            # A second check is answered from the cache.
+            self.assertEqual(outcome(lambda: incremental.check(term)), expected, term)
+            if not unrestricted and not linear:
+                self.assertEqual(outcome(lambda: checker.check(term)), expected, term)
+
+    def test_shadowing_does_not_reuse_stale_results(self):
+        checker = IncrementalTypeChecker()
+        body = Var('x')
+        self.assertIs(checker.check(Let('x', Int(1), body)), TInt())
+        self.assertIs(checker.check(Let('x', String("a"), body)), TString())
+
+    def test_only_edited_spine_is_rechecked(self):
+        leaves = [Let(f'v{i}', Int(i), Var(f'v{i}')) for i in range(8)]
+        old_left = Pair(Pair(leaves[0], leaves[1]), Pair(leaves[2], leaves[3]))
+        right = Pair(Pair(leaves[4], leaves[5]), Pair(leaves[6], leaves[7]))
+        old_term = Pair(old_left, right)
+
+        checker = IncrementalTypeChecker()
+        checker.check(old_term)
+        misses = checker.misses
+
+        edited_leaf = String("edited")
+        new_term = Pair(Pair(Pair(edited_leaf, leaves[1]), old_left.e2), right)
+        result = checker.check_incremental(old_term, new_term)
+
+        self.assertIs(result.t1.t1.t1, TString())
+        # Only the three rebuilt Pair nodes and the new leaf are checked.
+        self.assertEqual(checker.misses - misses, 4)
+
+    def test_cache_hits_replay_bindings(self):
+        # `TypeChecker` keeps `x` bound after the `let!`, so the sibling can use it.
+        binder = LetBang('x', Promote(Int(1)), Int(2))
+        checker = IncrementalTypeChecker()
+        self.assertIs(checker.check(Pair(binder, Var('x'))), TProd(TInt(), TInt()))
+        hits = checker.hits
+        self.assertIs(checker.check(Pair(binder, Pair(Var('x'), Var('x')))),
+                      TProd(TInt(), TProd(TInt(), TInt())))
+        self.assertEqual(checker.hits, hits + 1)
+        with self.assertRaisesRegex(TypeCheckError, "Variable 'x' not found"):
+            checker.check(Pair(Int(2), Var('x')))
+
+    def test_fixing_an_ill_typed_term(self):
+        old_term = Pair(Var('undefined'), Let('v', Int(1), Var('v')))
+        new_term = Pair(Int(2), old_term.e2)
+        checker = IncrementalTypeChecker()
+        self.assertIs(checker.check_incremental(old_term, new_term), TProd(TInt(), TInt()))
+        with self.assertRaisesRegex(TypeCheckError, "Variable 'undefined' not found"):
+            checker.check_incremental(new_term, old_term)
+
+    def test_module_level_check_incremental(self):
+        old_term = Pair(Int(1), Int(2))
+        new_term = Pair(old_term.e1, String("b"))
+        self.assertIs(check_incremental(old_term, new_term), TProd(TInt(), TString()))
+
 if __name__ == '__main__':
     unittest.main()
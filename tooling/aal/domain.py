@@ -1,7 +1,18 @@
 # tooling/aal/domain.py
 
+import hashlib
 from dataclasses import dataclass
-from typing import Set, FrozenSet
+from typing import Dict, List, Set, FrozenSet, Tuple
+
+
+def bit_indices(mask: int) -> List[int]:
+    """The positions of the set bits of `mask`, lowest first."""
+    indices = []
+    while mask:
+        low = mask & -mask
+        indices.append(low.bit_length() - 1)
+        mask ^= low
+    return indices
 
 
 @dataclass(frozen=True)
@@ -39,3 +50,107 @@ class Domain:
         self.fluents = set()
         self.actions = set()
         self.causal_laws = set()
+
+    def compile(self) -> "CompiledDomain":
+        """Groups the causal laws by action into successor tables."""
+        return CompiledDomain(self)
+
+    def fingerprint(self) -> str:
+        """A SHA-256 hash of the domain's contents, independent of their order."""
+        lines = sorted(f"fluent {f.name}" for f in self.fluents)
+        lines += sorted(f"action {a.name}" for a in self.actions)
+        lines += sorted(
+            f"{law.action.name} causes {law.effect.name} if "
+            + ", ".join(sorted(c.name for c in law.conditions))
+            for law in self.causal_laws
+        )
+        return hashlib.sha256("\n".join(lines).encode("utf-8")).hexdigest()
+
+
+class CompiledDomain:
+    """
+    A domain whose causal laws are grouped into per-action transition tables.
+
+    `transitions[action]` is a tuple of `(conditions, effects)` pairs, one per
+    distinct condition set of that action's laws, so computing a successor
+    only looks at the laws of the action being applied. A compiled domain is
+    a snapshot: recompile after changing the domain it was built from.
+
+    Every fluent that appears in the domain is also given a bit index, so a
+    state can be encoded as an int. `mask_transitions[action]` holds the same
+    tables as `(condition mask, effect mask)` pairs, which makes successor
+    generation, goal tests and duplicate detection integer operations.
+    """
+
+    def __init__(self, domain: Domain):
+        self.domain = domain
+        self._fingerprint = None
+        grouped: Dict[Action, Dict[FrozenSet[Fluent], Set[Fluent]]] = {}
+        for law in domain.causal_laws:
+            by_conditions = grouped.setdefault(law.action, {})
+            by_conditions.setdefault(law.conditions, set()).add(law.effect)
+        self.transitions: Dict[Action, Tuple[Tuple[FrozenSet[Fluent], FrozenSet[Fluent]], ...]] = {
+            action: tuple(
+                (conditions, frozenset(effects))
+                for conditions, effects in by_conditions.items()
+            )
+            for action, by_conditions in grouped.items()
+        }
+        # Sorted so that searches expand actions in a reproducible order.
+        self.actions: Tuple[Action, ...] = tuple(
+            sorted(domain.actions, key=lambda a: a.name)
+        )
+        self.actions_by_name: Dict[str, Action] = {a.name: a for a in self.actions}
+
+        fluents = set(domain.fluents)
+        for law in domain.causal_laws:
+            fluents.add(law.effect)
+            fluents.update(law.conditions)
+        self.fluents: Tuple[Fluent, ...] = tuple(sorted(fluents, key=lambda f: f.name))
+        self.bits: Dict[Fluent, int] = {f: 1 << i for i, f in enumerate(self.fluents)}
+        self.mask_transitions: Dict[Action, Tuple[Tuple[int, int], ...]] = {
+            action: tuple(
+                (self.encode(conditions), self.encode(effects))
+                for conditions, effects in table
+            )
+            for action, table in self.transitions.items()
+        }
+
+    @property
+    def fingerprint(self) -> str:
+        """`Domain.fingerprint` of the compiled domain, computed on first use."""
+        if self._fingerprint is None:
+            self._fingerprint = self.domain.fingerprint()
+        return self._fingerprint
+
+    def encode(self, fluents) -> int:
+        """Returns the bitset of `fluents`, ignoring fluents the domain never mentions."""
+        bits = self.bits
+        mask = 0
+        for fluent in fluents:
+            mask |= bits.get(fluent, 0)
+        return mask
+
+    def decode(self, mask: int) -> Set[Fluent]:
+        """Returns the fluents whose bits are set in `mask`."""
+        return {f for i, f in enumerate(self.fluents) if mask >> i & 1}
+
+    def knows(self, fluents) -> bool:
+        """Whether every one of `fluents` has a bit index in this domain."""
+        return all(fluent in self.bits for fluent in fluents)
+
+    def next_mask(self, state: int, action: Action) -> int:
+        """`next_state` on bitset-encoded states."""
+        next_state = 0
+        for conditions, effects in self.mask_transitions.get(action, ()):
+            if state & conditions == conditions:
+                next_state |= effects
+        return next_state
+
+    def next_state(self, state: Set[Fluent], action: Action) -> Set[Fluent]:
+        """Returns the effects of every law of `action` whose conditions hold."""
+        next_state = set()
+        for conditions, effects in self.transitions.get(action, ()):
+            if conditions <= state:
+                next_state |= effects
+        return next_state
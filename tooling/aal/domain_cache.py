@@ -0,0 +1,182 @@
+# tooling/aal/domain_cache.py
+
+"""
+An on-disk cache of compiled AAL domains.
+
+`DomainCache.load(path)` returns the `CompiledDomain` of an AAL file. The
+first load parses and compiles the file and writes the result to a binary
+cache file. A cache file starts with a header recording the source's path,
+size, modification time and SHA-256 content hash, followed by the pickled
+compiled domain:
+
+- If the source's size and mtime match the header, the compiled domain is
+  unpickled from the cache file without reading the source. This still
+  costs a full unpickle, but skips reading, parsing and compiling the source.
+- If they differ but the content hash still matches (the file was touched
+  or copied), the cached domain is used and the header is refreshed.
+- Otherwise the source is parsed again and the cache file rewritten.
+
+The cache keeps at most `max_entries` files; writing a new one removes the
+least recently used beyond that. Cache files are pickles, so the cache
+directory must only be writable by the user: it is created with mode 0700,
+and a directory owned by someone else or writable by others is not read.
+Any problem reading or writing the cache falls back to parsing the source.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+from typing import Callable, Optional
+
+from tooling.aal.domain import CompiledDomain, Domain
+
+MAGIC = b"AALC1\n"
+SUFFIX = ".aalc"
+DEFAULT_MAX_ENTRIES = 64
+
+
+def default_cache_dir() -> str:
+    """`$AAL_CACHE_DIR`, or `aal` under the user's cache directory."""
+    directory = os.environ.get("AAL_CACHE_DIR")
+    if directory:
+        return directory
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "aal")
+
+
+def _content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class DomainCache:
+    """Compiled AAL domains cached in `directory`, keyed by source path."""
+
+    def __init__(self, directory: str = None, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.directory = directory or default_cache_dir()
+        self.max_entries = max_entries
+        self.hits = 0
+        self.rehashed_hits = 0
+        self.misses = 0
+
+    def cache_path(self, path: str) -> str:
+        """The cache file used for the AAL file at `path`."""
+        key = hashlib.sha256(os.path.abspath(path).encode("utf-8")).hexdigest()[:32]
+        return os.path.join(self.directory, key + SUFFIX)
+
+    def load(self, path: str, parse: Callable[[str], Domain]) -> CompiledDomain:
+        """
+        Returns the compiled domain of the AAL file at `path`, using `parse`
+        to turn its text into a `Domain` when the cache cannot be used.
+
+        Raises FileNotFoundError if `path` does not exist.
+        """
+        stat = os.stat(path)
+        cache_path = self.cache_path(path)
+        header, payload_offset = self._read_header(cache_path) if self._trusted() else (None, 0)
+
+        source = None
+        if header is not None:
+            if header["size"] == stat.st_size and header["mtime_ns"] == stat.st_mtime_ns:
+                compiled = self._read_payload(cache_path, payload_offset)
+                if compiled is not None:
+                    self.hits += 1
+                    self._touch(cache_path)
+                    return compiled
+            else:
+                with open(path, "rb") as f:
+                    source = f.read()
+                if header["sha256"] == _content_hash(source):
+                    compiled = self._read_payload(cache_path, payload_offset)
+                    if compiled is not None:
+                        self.rehashed_hits += 1
+                        self._write(cache_path, path, stat, source, compiled)
+                        return compiled
+
+        if source is None:
+            with open(path, "rb") as f:
+                source = f.read()
+        self.misses += 1
+        compiled = parse(source.decode("utf-8")).compile()
+        compiled.fingerprint  # Computed now so that it is stored with the domain.
+        self._write(cache_path, path, stat, source, compiled)
+        return compiled
+
+    def _trusted(self) -> bool:
+        """Whether the cache directory is the user's own and not writable by others."""
+        try:
+            stat = os.stat(self.directory)
+        except OSError:
+            return False
+        if hasattr(os, "getuid") and stat.st_uid != os.getuid():
+            return False
+        return not stat.st_mode & 0o022
+
+    def _read_header(self, cache_path: str):
+        try:
+            with open(cache_path, "rb") as f:
+                if f.readline() != MAGIC:
+                    return None, 0
+                header = json.loads(f.readline())
+                return header, f.tell()
+        except (OSError, ValueError):
+            return None, 0
+
+    def _read_payload(self, cache_path: str, offset: int) -> Optional[CompiledDomain]:
+        try:
+            with open(cache_path, "rb") as f:
+                f.seek(offset)
+                compiled = pickle.load(f)
+        except Exception:
+            return None
+        return compiled if isinstance(compiled, CompiledDomain) else None
+
+    def _write(self, cache_path: str, path: str, stat, source: bytes, compiled: CompiledDomain) -> None:
+        header = {
+            "path": os.path.abspath(path),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": _content_hash(source),
+        }
+        try:
+            os.makedirs(self.directory, mode=0o700, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(MAGIC)
+                    f.write(json.dumps(header).encode("utf-8") + b"\n")
+                    pickle.dump(compiled, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, cache_path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+            self._evict()
+        except OSError:
+            pass  # The cache is an optimization; an unwritable directory is not an error.
+
+    def _touch(self, cache_path: str) -> None:
+        """Marks a cache file as recently used, for `_evict`."""
+        try:
+            os.utime(cache_path)
+        except OSError:
+            pass
+
+    def _evict(self) -> None:
+        """Removes the least recently used cache files beyond `max_entries`."""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(SUFFIX):
+                try:
+                    entries.append((entry.stat().st_mtime_ns, entry.path))
+                except OSError:
+                    continue
+        entries.sort(reverse=True)
+        for _, stale in entries[self.max_entries:]:
+            try:
+                os.unlink(stale)
+            except OSError:
+                pass
+
+    def stats(self):
+        return {"hits": self.hits, "rehashed_hits": self.rehashed_hits, "misses": self.misses}
@@ -0,0 +1,187 @@
+# tooling/aal/heuristics.py
+
+"""
+Relaxed-planning-graph heuristics for AAL planning.
+
+The relaxation lets fluents accumulate: a state's relaxed closure contains
+every fluent it holds plus the effects of any law whose conditions are in the
+closure. Every state reachable from `s` is contained in the closure of `s`,
+so a goal fluent outside it means the goal is unreachable and the heuristics
+return None (a dead end). Otherwise each fluent gets a cost, which is the
+number of law applications needed to reach it:
+
+- `h_max`: a law costs 1 + the most expensive of its conditions. Admissible.
+- `h_add`: a law costs 1 + the sum of its conditions' costs. More informed,
+  not admissible.
+- `h_ff`: the number of laws in a relaxed plan extracted from the `h_add`
+  best supporters. Not admissible.
+
+States and goals are bitsets, as produced by `CompiledDomain.encode`.
+"""
+
+import heapq
+import weakref
+from typing import Callable, Dict, List, Optional, Tuple
+
+from tooling.aal.domain import CompiledDomain, bit_indices
+
+Heuristic = Callable[[int, int], Optional[int]]
+
+
+class RelaxedPlanningGraph:
+    """The causal laws of a compiled domain, indexed for relaxed reachability."""
+
+    def __init__(self, compiled: CompiledDomain):
+        self.fluent_count = len(compiled.fluents)
+        # One entry per (action, condition set): (conditions, effects).
+        self.laws: List[Tuple[Tuple[int, ...], Tuple[int, ...]]] = []
+        self.by_condition: List[List[int]] = [[] for _ in range(self.fluent_count)]
+        self.unconditional: List[int] = []
+        for action in compiled.actions:
+            for conditions, effects in compiled.mask_transitions.get(action, ()):
+                law = len(self.laws)
+                condition_indices = tuple(bit_indices(conditions))
+                self.laws.append((condition_indices, tuple(bit_indices(effects))))
+                if condition_indices:
+                    for i in condition_indices:
+                        self.by_condition[i].append(law)
+                else:
+                    self.unconditional.append(law)
+
+    def costs(self, state: int, goal: int, additive: bool):
+        """
+        Runs a generalized Dijkstra search over the relaxed graph from `state`.
+
+        Returns `(cost, supporter)` dicts keyed by fluent index: the cost of
+        reaching the fluent and the law that reaches it most cheaply (absent
+        for fluents already in `state`). Stops as soon as every goal fluent
+        has its final cost.
+        """
+        cost: Dict[int, int] = {}
+        supporter: Dict[int, int] = {}
+        goals_left = goal & ~state
+        if not goals_left:
+            return {i: 0 for i in bit_indices(state)}, supporter
+
+        heap = [(0, i, -1) for i in bit_indices(state)]
+        heap += [(1, i, law) for law in self.unconditional for i in self.laws[law][1]]
+        heapq.heapify(heap)
+
+        remaining = [len(conditions) for conditions, _ in self.laws]
+        law_cost = [0] * len(self.laws)
+        laws = self.laws
+        by_condition = self.by_condition
+
+        while heap:
+            c, fluent, law = heapq.heappop(heap)
+            if fluent in cost:
+                continue
+            cost[fluent] = c
+            if law >= 0:
+                supporter[fluent] = law
+            goals_left &= ~(1 << fluent)
+            if not goals_left:
+                break
+            for dependent in by_condition[fluent]:
+                law_cost[dependent] = (
+                    law_cost[dependent] + c if additive else max(law_cost[dependent], c)
+                )
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    reach = law_cost[dependent] + 1
+                    for effect in laws[dependent][1]:
+                        if effect not in cost:
+                            heapq.heappush(heap, (reach, effect, dependent))
+        return cost, supporter
+
+    def h_max(self, state: int, goal: int) -> Optional[int]:
+        cost, _ = self.costs(state, goal, additive=False)
+        goal_costs = [cost.get(i) for i in bit_indices(goal)]
+        if None in goal_costs:
+            return None
+        return max(goal_costs, default=0)
+
+    def h_add(self, state: int, goal: int) -> Optional[int]:
+        cost, _ = self.costs(state, goal, additive=True)
+        goal_costs = [cost.get(i) for i in bit_indices(goal)]
+        if None in goal_costs:
+            return None
+        return sum(goal_costs)
+
+    def h_ff(self, state: int, goal: int) -> Optional[int]:
+        cost, supporter = self.costs(state, goal, additive=True)
+        pending = bit_indices(goal)
+        if any(i not in cost for i in pending):
+            return None
+        relaxed_plan = set()
+        seen = set(pending)
+        while pending:
+            law = supporter.get(pending.pop())
+            if law is None or law in relaxed_plan:
+                continue
+            relaxed_plan.add(law)
+            for condition in self.laws[law][0]:
+                if condition not in seen:
+                    seen.add(condition)
+                    pending.append(condition)
+        return len(relaxed_plan)
+
+
+def goal_count(state: int, goal: int) -> int:
+    """The number of goal fluents missing from `state`."""
+    return (goal & ~state).bit_count()
+
+
+_GRAPHS: "weakref.WeakKeyDictionary[CompiledDomain, RelaxedPlanningGraph]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def relaxed_planning_graph(compiled: CompiledDomain) -> RelaxedPlanningGraph:
+    """Returns the relaxed planning graph of `compiled`, building it once."""
+    graph = _GRAPHS.get(compiled)
+    if graph is None:
+        graph = _GRAPHS[compiled] = RelaxedPlanningGraph(compiled)
+    return graph
+
+
+HEURISTICS = ("goal_count", "h_max", "h_add", "h_ff")
+
+
+def get_heuristic(name: str, compiled: CompiledDomain) -> Heuristic:
+    """Returns the heuristic called `name` (one of `HEURISTICS`) for `compiled`."""
+    if name == "goal_count":
+        return goal_count
+    if name in ("h_max", "h_add", "h_ff"):
+        return getattr(relaxed_planning_graph(compiled), name)
+    raise ValueError(f"Unknown heuristic '{name}'. Expected one of {', '.join(HEURISTICS)}.")
+
+
+def regression_heuristic(heuristic, compiled: CompiledDomain, start: int) -> Callable[[int], Optional[int]]:
+    """
+    Returns a heuristic for backward search from the goal to `start`: an
+    estimate of the cost of reaching a subgoal from `start`.
+
+    For "h_max" and "h_add" the fluent costs from `start` are computed once
+    and shared by every subgoal; "h_ff" uses the `h_add` costs. Other
+    heuristics are called as `heuristic(start, subgoal)`.
+    """
+    if heuristic in ("h_max", "h_add", "h_ff"):
+        graph = relaxed_planning_graph(compiled)
+        everything = (1 << graph.fluent_count) - 1
+        additive = heuristic != "h_max"
+        cost, _ = graph.costs(start, everything, additive)
+
+        def estimate(subgoal: int) -> Optional[int]:
+            costs = []
+            for i in bit_indices(subgoal):
+                c = cost.get(i)
+                if c is None:
+                    return None
+                costs.append(c)
+            return sum(costs) if additive else max(costs, default=0)
+        return estimate
+
+    if isinstance(heuristic, str):
+        heuristic = get_heuristic(heuristic, compiled)
+    return lambda subgoal: heuristic(start, subgoal)
@@ -1,20 +1,27 @@
 # tooling/aal/interpreter.py
 
-from typing import Set
-from tooling.aal.domain import Domain, Action, Fluent
+from typing import Set, Union
+from tooling.aal.domain import CompiledDomain, Domain, Action, Fluent
 
 
 class Interpreter:
     """The AAL interpreter, responsible for state transitions."""
 
     def get_next_state(
-        self, current_state: Set[Fluent], action: Action, domain: Domain
+        self,
+        current_state: Set[Fluent],
+        action: Action,
+        domain: Union[Domain, CompiledDomain],
     ) -> Set[Fluent]:
         """
         Calculates the next state based on the current state, an action, and the domain's causal laws.
         A fluent is in the next state if there is a causal law 'a causes f if C' where a is the action
         and C is a subset of the current state.
+
+        Passing a `CompiledDomain` only consults the laws of `action`.
         """
+        if isinstance(domain, CompiledDomain):
+            return domain.next_state(current_state, action)
         next_state = set()
         for law in domain.causal_laws:
             if law.action == action and law.conditions.issubset(current_state):
@@ -3,53 +3,60 @@
 import re
 from tooling.aal.domain import Domain, Fluent, Action, CausalLaw
 
+# One pass over the whole text: each match is a declaration or a causal law
+# at the start of a line. Whitespace inside a statement may not span lines.
+_STATEMENT_RE = re.compile(
+    r"^[^\S\n]*(?:"
+    r"fluent[^\S\n]+(?P<fluent>\w+)"
+    r"|action[^\S\n]+(?P<action>\w+)"
+    r"|(?P<law_action>\w+)[^\S\n]+causes[^\S\n]+(?P<effect>\w+)"
+    r"(?:[^\S\n]+if[^\S\n]+(?P<conditions>.*))?"
+    r")",
+    re.MULTILINE,
+)
+
 
 def parse_aal(aal_string: str) -> Domain:
-    """Parses an AAL string and returns a Domain object."""
-    domain = Domain()
-    # Correctly split by newline characters.
-    lines = aal_string.strip().split("\n")
-
-    # Correctly match whitespace.
-    fluent_pattern = re.compile(r"fluent\s+(\w+)")
-    action_pattern = re.compile(r"action\s+(\w+)")
-    causal_law_pattern = re.compile(r"(\w+)\s+causes\s+(\w+)(?:\s+if\s+(.*))?")
-
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-
-        # Try to match each pattern
-        fluent_match = fluent_pattern.match(line)
-        if fluent_match:
-            fluent_name = fluent_match.group(1)
-            domain.fluents.add(Fluent(name=fluent_name))
-            continue
-
-        action_match = action_pattern.match(line)
-        if action_match:
-            action_name = action_match.group(1)
-            domain.actions.add(Action(name=action_name))
-            continue
-
-        causal_law_match = causal_law_pattern.match(line)
-        if causal_law_match:
-            action_name = causal_law_match.group(1)
-            effect_name = causal_law_match.group(2)
-            conditions_str = causal_law_match.group(3)
-
-            action = Action(name=action_name)
-            effect = Fluent(name=effect_name)
+    """
+    Parses an AAL string and returns a Domain object.
 
+    Each line holds one statement: `fluent f`, `action a` or
+    `a causes f [if p1, ..., pn]`. Lines that match none of these are ignored.
+    Equal fluents and actions are shared rather than created per mention.
+    """
+    domain = Domain()
+    fluents = {}
+    actions = {}
+
+    def fluent(name):
+        f = fluents.get(name)
+        if f is None:
+            f = fluents[name] = Fluent(name=name)
+        return f
+
+    def action(name):
+        a = actions.get(name)
+        if a is None:
+            a = actions[name] = Action(name=name)
+        return a
+
+    conditions_cache = {}
+    for match in _STATEMENT_RE.finditer(aal_string):
+        fluent_name, action_name, law_action, effect_name, conditions_str = match.groups()
+        if fluent_name is not None:
+            domain.fluents.add(fluent(fluent_name))
+        elif action_name is not None:
+            domain.actions.add(action(action_name))
+        else:
             conditions = frozenset()
             if conditions_str:
-                condition_names = [c.strip() for c in conditions_str.split(",")]
-                conditions = frozenset(Fluent(name=name) for name in condition_names)
-
+                conditions = conditions_cache.get(conditions_str)
+                if conditions is None:
+                    conditions = conditions_cache[conditions_str] = frozenset(
+                        fluent(c.strip()) for c in conditions_str.split(",")
+                    )
             domain.causal_laws.add(
-                CausalLaw(action=action, effect=effect, conditions=conditions)
+                CausalLaw(action=action(law_action), effect=fluent(effect_name), conditions=conditions)
             )
-            continue
 
     return domain
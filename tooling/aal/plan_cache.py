@@ -0,0 +1,178 @@
+# tooling/aal/plan_cache.py
+
+"""
+A two-level cache of planner results.
+
+Entries are keyed by `plan_key`, a hash of the domain fingerprint (see
+`Domain.fingerprint`), the start state, the goal and the search options that
+change which plan is found. The first level is an in-memory LRU; the optional
+second level is a SQLite file, so plans survive across processes. Only
+definitive results are meant to be stored: a plan, or the knowledge that no
+plan exists.
+
+Because keys include the domain fingerprint, a changed domain never sees
+stale plans. `note_domain` additionally drops the entries of a domain file's
+previous contents, so the cache does not fill up with plans nobody can ask
+for again.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# A cached result: (status, plan).
+Entry = Tuple[str, Optional[List[str]]]
+
+
+def _copy(entry: Entry) -> Entry:
+    status, plan = entry
+    return status, None if plan is None else list(plan)
+
+
+def plan_key(fingerprint: str, start: Iterable[str], goal: Iterable[str], options: Tuple = ()) -> str:
+    """Returns the cache key of a planning problem."""
+    payload = json.dumps([fingerprint, sorted(start), sorted(goal), list(options)])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class PlanCache:
+    """An LRU of planner results, optionally backed by a SQLite file."""
+
+    def __init__(self, capacity: int = 1024, path: str = None):
+        self.capacity = capacity
+        self.path = path
+        self._entries: "OrderedDict[str, Tuple[str, Entry]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if path is not None:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS plans (
+                    key TEXT PRIMARY KEY,
+                    fingerprint TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    plan TEXT
+                );
+                CREATE INDEX IF NOT EXISTS plans_by_fingerprint ON plans (fingerprint);
+                CREATE TABLE IF NOT EXISTS domains (
+                    path TEXT PRIMARY KEY,
+                    fingerprint TEXT NOT NULL
+                );
+                """
+            )
+            self._db.commit()
+        self._domains: Dict[str, str] = {}
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: str) -> Optional[Entry]:
+        """The cached `(status, plan)` for `key`, with a plan list the caller may change."""
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return _copy(cached[1])
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT fingerprint, status, plan FROM plans WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    fingerprint, status, plan = row
+                    entry = (status, None if plan is None else json.loads(plan))
+                    self._remember(key, fingerprint, entry)
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return _copy(entry)
+            self.misses += 1
+            return None
+
+    def put(self, key: str, fingerprint: str, status: str, plan: Optional[List[str]]) -> None:
+        entry = (status, None if plan is None else list(plan))
+        with self._lock:
+            self._remember(key, fingerprint, entry)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO plans VALUES (?, ?, ?, ?)",
+                    (key, fingerprint, status, None if plan is None else json.dumps(plan)),
+                )
+                self._db.commit()
+
+    def _remember(self, key: str, fingerprint: str, entry: Entry) -> None:
+        self._entries[key] = (fingerprint, entry)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, fingerprint: str) -> int:
+        """Drops every entry of the domain with `fingerprint`; returns how many were in memory."""
+        with self._lock:
+            stale = [k for k, (fp, _) in self._entries.items() if fp == fingerprint]
+            for key in stale:
+                del self._entries[key]
+            if self._db is not None:
+                self._db.execute("DELETE FROM plans WHERE fingerprint = ?", (fingerprint,))
+                self._db.commit()
+            self.invalidations += 1
+            return len(stale)
+
+    def note_domain(self, path: str, fingerprint: str) -> bool:
+        """
+        Records that the domain file at `path` now has `fingerprint`.
+
+        If the file previously had different contents, the entries for those
+        contents are invalidated and True is returned.
+        """
+        with self._lock:
+            previous = self._domains.get(path)
+            if previous is None and self._db is not None:
+                row = self._db.execute(
+                    "SELECT fingerprint FROM domains WHERE path = ?", (path,)
+                ).fetchone()
+                previous = row[0] if row else None
+            self._domains[path] = fingerprint
+            if self._db is not None and previous != fingerprint:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO domains VALUES (?, ?)", (path, fingerprint)
+                )
+                self._db.commit()
+        if previous is not None and previous != fingerprint:
+            self.invalidate(previous)
+            return True
+        return False
+
+    def clear(self) -> None:
+        """Empties both levels and resets the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._domains.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM plans")
+                self._db.execute("DELETE FROM domains")
+                self._db.commit()
+            self.hits = self.disk_hits = self.misses = 0
+            self.evictions = self.invalidations = 0
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def stats(self) -> Dict[str, int]:
+        """The cache counters, for scraping."""
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "size": len(self._entries),
+        }
@@ -0,0 +1,85 @@
+# tooling/aal/regression.py
+
+"""
+Goal regression over AAL causal laws.
+
+After action `a`, a state contains exactly the effects of `a`'s laws whose
+conditions held before. So a state reached by `a` contains every fluent of a
+subgoal `G` if and only if, for each `g` in `G`, some law `a causes g if C`
+had `C` satisfied. Regressing `G` through `a` therefore yields one subgoal
+per way of choosing such a law for each fluent: the union of the chosen
+conditions. Actions with no law for some fluent of `G` cannot lead to `G` at
+all. Subgoals and states are bitsets, as produced by `CompiledDomain.encode`.
+"""
+
+import weakref
+from typing import Dict, List, Set, Tuple
+
+from tooling.aal.domain import Action, CompiledDomain, bit_indices
+
+
+def _minimal(masks: Set[int]) -> Set[int]:
+    """Drops every mask that is a superset of another: it is a harder subgoal."""
+    ordered = sorted(masks, key=lambda m: m.bit_count())
+    kept = []
+    for mask in ordered:
+        if not any(k & mask == k for k in kept):
+            kept.append(mask)
+    return set(kept)
+
+
+class RegressionTables:
+    """For each action, the conditions under which it produces each fluent."""
+
+    def __init__(self, compiled: CompiledDomain):
+        self.actions: Tuple[Action, ...] = compiled.actions
+        # achievers[a][i]: the condition masks of action a's laws with fluent i as an effect.
+        self.achievers: List[Dict[int, Tuple[int, ...]]] = []
+        # produces[a]: every fluent that action a can make true.
+        self.produces: List[int] = []
+        for action in self.actions:
+            achievers: Dict[int, List[int]] = {}
+            produces = 0
+            for conditions, effects in compiled.mask_transitions.get(action, ()):
+                produces |= effects
+                for i in bit_indices(effects):
+                    achievers.setdefault(i, []).append(conditions)
+            self.achievers.append({i: tuple(_minimal(set(c))) for i, c in achievers.items()})
+            self.produces.append(produces)
+
+    def regress(self, subgoal: int, a: int) -> Set[int]:
+        """
+        Returns the minimal subgoals from which the `a`-th action reaches a
+        state containing `subgoal`; empty if it cannot.
+        """
+        if subgoal & ~self.produces[a]:
+            return set()
+        achievers = self.achievers[a]
+        results = {0}
+        for i in bit_indices(subgoal):
+            options = achievers[i]
+            if len(options) == 1:
+                condition = options[0]
+                results = {r | condition for r in results}
+            else:
+                results = _minimal({r | c for r in results for c in options})
+        return results
+
+    def predecessors(self, subgoal: int):
+        """Yields `(action, regressed subgoal)` for every relevant action."""
+        for a, action in enumerate(self.actions):
+            for regressed in self.regress(subgoal, a):
+                yield action, regressed
+
+
+_TABLES: "weakref.WeakKeyDictionary[CompiledDomain, RegressionTables]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def regression_tables(compiled: CompiledDomain) -> RegressionTables:
+    """Returns the regression tables of `compiled`, building them once."""
+    tables = _TABLES.get(compiled)
+    if tables is None:
+        tables = _TABLES[compiled] = RegressionTables(compiled)
+    return tables
@@ -0,0 +1,211 @@
+# tooling/aal/state_space.py
+
+"""
+Explicit reachable state graphs for small AAL domains.
+
+Every AAL action applies in every state (laws whose conditions fail simply
+contribute nothing), so each state has exactly one successor per action.
+`StateSpace` numbers the reachable states as they are found by breadth-first
+search and stores the graph as one flat array: the successor of state `i`
+under the `a`-th action of `CompiledDomain.actions` is
+`targets[i * len(actions) + a]`.
+
+Plan queries are answered from goal-indexed distance tables: for a goal,
+a backward breadth-first search from every state that satisfies it gives
+each state's distance to the goal, and a shortest plan follows edges along
+which the distance drops by one. Tables are built on first use and kept for
+later queries with the same goal.
+"""
+
+import json
+from array import array
+from collections import OrderedDict, deque
+from typing import Dict, Iterable, List, Optional
+
+from tooling.aal.domain import CompiledDomain
+
+MAGIC = b"AALS1\n"
+
+
+class StateSpaceTooLarge(Exception):
+    """Raised when enumeration would exceed the state limit."""
+
+
+class StateSpace:
+    """The reachable states of a compiled domain and their transitions."""
+
+    def __init__(self, compiled: CompiledDomain, max_states: int = None, max_tables: int = 64):
+        self.compiled = compiled
+        self.max_states = max_states
+        self.max_tables = max_tables
+        self.action_count = len(compiled.actions)
+        self.states: List[int] = []
+        self.index: Dict[int, int] = {}
+        self.targets = array("q")
+        self._predecessors: Optional[List[array]] = None
+        self._tables: "OrderedDict[int, array]" = OrderedDict()
+
+    def __len__(self):
+        return len(self.states)
+
+    def __contains__(self, state: int) -> bool:
+        return state in self.index
+
+    def _add(self, state: int) -> int:
+        if self.max_states is not None and len(self.states) >= self.max_states:
+            raise StateSpaceTooLarge(
+                f"The reachable state space has more than {self.max_states} states."
+            )
+        i = self.index[state] = len(self.states)
+        self.states.append(state)
+        return i
+
+    def explore(self, roots: Iterable[int]) -> None:
+        """Adds every state reachable from `roots` to the graph."""
+        tables = [self.compiled.mask_transitions.get(a, ()) for a in self.compiled.actions]
+        queue = deque()
+        states_before, targets_before = len(self.states), len(self.targets)
+        try:
+            for root in roots:
+                if root not in self.index:
+                    queue.append(self._add(root))
+            if not queue:
+                return
+            # New states invalidate the backward indexes.
+            self._predecessors = None
+            self._tables.clear()
+            self._explore(queue, tables)
+        except StateSpaceTooLarge:
+            # Undo this exploration so the graph stays closed under transitions.
+            for state in self.states[states_before:]:
+                del self.index[state]
+            del self.states[states_before:]
+            del self.targets[targets_before:]
+            raise
+
+    def _explore(self, queue: deque, tables) -> None:
+        index, states, targets = self.index, self.states, self.targets
+        while queue:
+            i = queue.popleft()
+            state = states[i]
+            # States are numbered in discovery order, so the targets of state
+            # i are appended exactly when it is dequeued.
+            for table in tables:
+                next_state = 0
+                for conditions, effects in table:
+                    if state & conditions == conditions:
+                        next_state |= effects
+                j = index.get(next_state)
+                if j is None:
+                    j = self._add(next_state)
+                    queue.append(j)
+                targets.append(j)
+
+    def _predecessor_lists(self) -> List[array]:
+        if self._predecessors is None:
+            predecessors = [array("q") for _ in self.states]
+            n = self.action_count
+            for k, j in enumerate(self.targets):
+                predecessors[j].append(k // n)
+            self._predecessors = predecessors
+        return self._predecessors
+
+    def distances(self, goal: int) -> array:
+        """
+        Returns each state's distance to the nearest state satisfying `goal`,
+        or -1 where the goal is unreachable.
+        """
+        table = self._tables.get(goal)
+        if table is not None:
+            self._tables.move_to_end(goal)
+            return table
+
+        predecessors = self._predecessor_lists()
+        table = array("q", [-1]) * len(self.states)
+        queue = deque()
+        for i, state in enumerate(self.states):
+            if state & goal == goal:
+                table[i] = 0
+                queue.append(i)
+        while queue:
+            j = queue.popleft()
+            d = table[j] + 1
+            for i in predecessors[j]:
+                if table[i] < 0:
+                    table[i] = d
+                    queue.append(i)
+
+        self._tables[goal] = table
+        if len(self._tables) > self.max_tables:
+            self._tables.popitem(last=False)
+        return table
+
+    def shortest_plan(self, start: int, goal: int) -> Optional[List[str]]:
+        """
+        Returns a shortest plan from `start` to a state satisfying `goal`, or
+        None if there is none. `start` must already be in the graph.
+        """
+        table = self.distances(goal)
+        i = self.index[start]
+        if table[i] < 0:
+            return None
+        actions, targets, n = self.compiled.actions, self.targets, self.action_count
+        plan = []
+        while table[i] > 0:
+            for a in range(n):
+                j = targets[i * n + a]
+                if table[j] == table[i] - 1:
+                    plan.append(actions[a].name)
+                    i = j
+                    break
+        return plan
+
+    # --- Persistence ---
+
+    def save(self, path: str) -> None:
+        """Writes the graph to `path`, tagged with the domain's fingerprint."""
+        width = max(1, (len(self.compiled.fluents) + 7) // 8)
+        header = {
+            "fingerprint": self.compiled.fingerprint,
+            "actions": [a.name for a in self.compiled.actions],
+            "fluents": [f.name for f in self.compiled.fluents],
+            "states": len(self.states),
+            "width": width,
+        }
+        with open(path, "wb") as f:
+            f.write(MAGIC)
+            f.write(json.dumps(header).encode("utf-8") + b"\n")
+            for state in self.states:
+                f.write(state.to_bytes(width, "little"))
+            self.targets.tofile(f)
+
+    @classmethod
+    def load(cls, path: str, compiled: CompiledDomain, max_states: int = None) -> "StateSpace":
+        """
+        Reads a graph written by `save`. Raises ValueError if the file was
+        written for a different domain, and StateSpaceTooLarge if it holds
+        more than `max_states` states.
+        """
+        with open(path, "rb") as f:
+            if f.readline() != MAGIC:
+                raise ValueError(f"{path} is not a saved AAL state space.")
+            header = json.loads(f.readline())
+            if (
+                header["fingerprint"] != compiled.fingerprint
+                or header["actions"] != [a.name for a in compiled.actions]
+                or header["fluents"] != [fl.name for fl in compiled.fluents]
+            ):
+                raise ValueError(f"{path} was saved for a different domain.")
+            width, count = header["width"], header["states"]
+            if max_states is not None and count > max_states:
+                raise StateSpaceTooLarge(
+                    f"{path} has {count} states, more than the limit of {max_states}."
+                )
+            space = cls(compiled, max_states)
+            data = f.read(width * count)
+            for i in range(count):
+                state = int.from_bytes(data[i * width:(i + 1) * width], "little")
+                space.index[state] = i
+                space.states.append(state)
+            space.targets.fromfile(f, count * space.action_count)
+        return space
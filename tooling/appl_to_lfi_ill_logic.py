@@ -1,5 +1,6 @@
 import appl_ast
 import lfi_ill
+from lfi_ill.bytecode import assemble, CodeObject
 
 
 class ApplToLfiIllCompiler:
@@ -16,8 +17,14 @@ class ApplToLfiIllCompiler:
         elif isinstance(appl_node, appl_ast.Int):
             return lfi_ill.Int(appl_node.value)
 
+        elif isinstance(appl_node, appl_ast.String):
+            return lfi_ill.String(appl_node.value)
+
+        elif isinstance(appl_node, appl_ast.Bool):
+            return lfi_ill.Bool(appl_node.value)
+
         elif isinstance(appl_node, appl_ast.Fun):
-            var = self.compile(appl_node.var)
+            var = self.compile_binder(appl_node.var)
             type_ = self.compile_type(appl_node.type)
             body = self.compile(appl_node.body)
             return lfi_ill.Fun(var, type_, body)
@@ -33,8 +40,8 @@ class ApplToLfiIllCompiler:
             return lfi_ill.TensorPair(e1, e2)
 
         elif isinstance(appl_node, appl_ast.LetPair):
-            v1 = self.compile(appl_node.v1)
-            v2 = self.compile(appl_node.v2)
+            v1 = self.compile_binder(appl_node.v1)
+            v2 = self.compile_binder(appl_node.v2)
             e1 = self.compile(appl_node.e1)
             e2 = self.compile(appl_node.e2)
             return lfi_ill.LetTensor(v1, v2, e1, e2)
@@ -44,7 +51,7 @@ class ApplToLfiIllCompiler:
             return lfi_ill.Promotion(e)
 
         elif isinstance(appl_node, appl_ast.LetBang):
-            v = self.compile(appl_node.v)
+            v = self.compile_binder(appl_node.v)
             e1 = self.compile(appl_node.e1)
             e2 = self.compile(appl_node.e2)
             return lfi_ill.Dereliction(v, e1, e2)
@@ -57,9 +64,9 @@ class ApplToLfiIllCompiler:
 
         elif isinstance(appl_node, appl_ast.Case):
             e = self.compile(appl_node.e)
-            v1 = self.compile(appl_node.v1)
+            v1 = self.compile_binder(appl_node.v1)
             e1 = self.compile(appl_node.e1)
-            v2 = self.compile(appl_node.v2)
+            v2 = self.compile_binder(appl_node.v2)
             e2 = self.compile(appl_node.e2)
             return lfi_ill.Case(e, v1, e1, v2, e2)
 
@@ -79,8 +86,23 @@ class ApplToLfiIllCompiler:
                 f"APPL node type not yet supported: {type(appl_node)}"
             )
 
+    def compile_binder(self, var):
+        """
+        Translates a binding occurrence, given either as a name or as a Var.
+        """
+        if isinstance(var, appl_ast.Var):
+            return lfi_ill.Var(var.name)
+        return lfi_ill.Var(var)
+
     def compile_type(self, type_):
         """
         Translates APPL types to LFI ILL types.
         """
         return str(type_)
+
+    def compile_to_bytecode(self, appl_node) -> CodeObject:
+        """
+        Translates the APPL AST to LFI ILL and assembles it into bytecode for
+        `lfi_ill.bytecode.VM`.
+        """
+        return assemble(self.compile(appl_node))
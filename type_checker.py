@@ -121,32 +121,238 @@ class TypeChecker:
         else:
             raise NotImplementedError(f"Type checking not implemented for {type(term).__name__}")
 
+# Types of the primitives that `interpreter.interpret` provides.
+PRIMITIVE_TYPES = {
+    'load_domain': TFun(TString(), TExponential(TUnit())),
+    'create_state': TFun(TList(TString()), TExponential(TState())),
+    'apply_action': TFun(TString(), TExponential(TState())),
+    'is_goal': TFun(TList(TString()), TBool()),
+    'get_current_state': TFun(TUnit(), TList(TString())),
+    'find_plan': TFun(TList(TString()), TList(TString())),
+    'find_plan_with': TFun(TList(TString()), TFun(TList(TString()), TList(TString()))),
+    'plan_stats': TFun(TUnit(), TList(TString())),
+    'parse': TFun(TString(), TTerm()),
+    'unparse': TFun(TTerm(), TString()),
+    'eval': TFun(TTerm(), TTerm()), # This is a simplification
+}
+
+def _initial_unrestricted_context(unrestricted_context: dict = None) -> dict:
+    """The primitives' types, overridden by `unrestricted_context`."""
+    context = dict(PRIMITIVE_TYPES)
+    if unrestricted_context:
+        context.update(unrestricted_context)
+    return context
+
+
 def type_check(term: Term, unrestricted_context: dict = None, linear_context: dict = None) -> Type:
     """
     Type-checks the given term in the provided contexts.
     """
     checker = TypeChecker()
-
-    default_unrestricted_context = {
-        'load_domain': TFun(TString(), TExponential(TUnit())),
-        'create_state': TFun(TList(TString()), TExponential(TState())),
-        'apply_action': TFun(TString(), TExponential(TState())),
-        'is_goal': TFun(TList(TString()), TBool()),
-        'get_current_state': TFun(TUnit(), TList(TString())),
-        'find_plan': TFun(TList(TString()), TList(TString())),
-        'parse': TFun(TString(), TTerm()),
-        'unparse': TFun(TTerm(), TString()),
-        'eval': TFun(TTerm(), TTerm()), # This is a simplification
-    }
-
-    if unrestricted_context:
-        default_unrestricted_context.update(unrestricted_context)
-
-    checker.unrestricted_context = default_unrestricted_context
+    checker.unrestricted_context = _initial_unrestricted_context(unrestricted_context)
     if linear_context:
         checker.linear_context = linear_context.copy()
 
     result = checker.type_check(term)
     if checker.linear_context:
         raise TypeCheckError(f"Unused linear variables: {', '.join(checker.linear_context.keys())}")
-    return result
\ No newline at end of file
+    return result
+
+
+# The value of a context entry that is not there, in the write log.
+_MISSING = object()
+
+
+class _Context(dict):
+    """A context dict that reports every write to its `IncrementalTypeChecker`."""
+
+    def __init__(self, checker, entries=()):
+        super().__init__(entries)
+        self.checker = checker
+
+    def __setitem__(self, name, value):
+        self.checker._record(self, name, value)
+        dict.__setitem__(self, name, value)
+
+    def pop(self, name, *default):
+        if name in self:
+            self.checker._record(self, name, _MISSING)
+        return dict.pop(self, name, *default)
+
+
+class IncrementalTypeChecker(TypeChecker):
+    """
+    A `TypeChecker` that memoizes the result of checking each sub-term.
+
+    The rules are `TypeChecker`'s own; only `type_check` is wrapped. Checking
+    a sub-term depends on nothing but the sub-term and the current contents
+    of the two contexts, so results are keyed by the identity of the sub-term
+    and by one state token per context, an interned id for its contents.
+    A cache hit replays the sub-term's effect on the contexts instead of
+    re-checking it.
+
+    The linear context's token is canonical across sub-terms: a result
+    records the linear entries the sub-term left changed, and one that left
+    them as it found them, such as a `let` that consumes its own variable,
+    keeps the token it started with. The unrestricted context only ever
+    gains bindings, so its token is the interned history of those bindings
+    and a hit replays the ones the sub-term made. Either way, when a program
+    is edited by rebuilding only the path from the root to the changed node,
+    the sub-terms beside that path see the same tokens as before and
+    re-checking visits only the path. Cached results keep their terms alive
+    until `clear()`.
+    """
+
+    def __init__(self, unrestricted_context: dict = None, linear_context: dict = None):
+        self._initial = (_initial_unrestricted_context(unrestricted_context), dict(linear_context or {}))
+        # Linear writes since the start of each sub-term being checked, with
+        # the value each entry had before.
+        self._log = []
+        self._linear_state = 0
+        self._linear_states = {}
+        self._unrestricted_state = 0
+        # (previous state, name, type) -> state, and state -> that triple.
+        self._unrestricted_states = {}
+        self._bindings = [None]
+        self._results = {}
+        self.hits = 0
+        self.misses = 0
+        super().__init__()
+
+    # `Promote` swaps in a fresh linear context and later restores the old
+    # one; both count as changes to the linear state.
+    @property
+    def linear_context(self):
+        return self._linear_context
+
+    @linear_context.setter
+    def linear_context(self, context):
+        if not isinstance(context, _Context):
+            context = _Context(self, context)
+            self._advance_linear(("fresh", tuple(context.items())))
+        elif hasattr(self, "_linear_context"):
+            self._advance_linear(("restore",))
+        self._linear_context = context
+
+    def clear(self) -> None:
+        """Drops all cached results."""
+        self._results.clear()
+        self._linear_states.clear()
+        self._unrestricted_states.clear()
+        del self._bindings[1:]
+
+    def check(self, term: Term) -> Type:
+        """Type-checks `term`, reusing any results cached by earlier calls."""
+        unrestricted, linear = self._initial
+        self.unrestricted_context = _Context(self, unrestricted)
+        self._linear_context = _Context(self, linear)
+        self._log.clear()
+        self._linear_state = self._unrestricted_state = 0
+        result = self.type_check(term)
+        if self.linear_context:
+            raise TypeCheckError(f"Unused linear variables: {', '.join(self.linear_context.keys())}")
+        return result
+
+    def check_incremental(self, old_term: Term, new_term: Term) -> Type:
+        """
+        Type-checks `new_term`, an edit of `old_term`.
+
+        Sub-terms that `new_term` shares with `old_term` (by identity) are not
+        re-checked. If `old_term` has not been checked yet it is checked first
+        to warm the cache; only `new_term` decides the result, so an edit that
+        fixes an ill-typed `old_term` is accepted.
+        """
+        try:
+            self.check(old_term)
+        except TypeCheckError:
+            pass  # The well-typed sub-terms of `old_term` are still cached.
+        return self.check(new_term)
+
+    def _advance_linear(self, change) -> None:
+        key = (self._linear_state, change)
+        state = self._linear_states.get(key)
+        if state is None:
+            state = self._linear_states[key] = len(self._linear_states) + 1
+        self._linear_state = state
+
+    def _record(self, context: _Context, name: str, value) -> None:
+        if context is self.unrestricted_context:
+            key = (self._unrestricted_state, name, value)
+            state = self._unrestricted_states.get(key)
+            if state is None:
+                state = self._unrestricted_states[key] = len(self._bindings)
+                self._bindings.append(key)
+            self._unrestricted_state = state
+        else:
+            self._log.append((context, name, dict.get(context, name, _MISSING)))
+            self._advance_linear((name, value))
+
+    def _replay(self, effect: tuple, unrestricted_state: int) -> None:
+        """Applies a cached result's effect to the contexts."""
+        context = self._linear_context
+        for name, value in effect:
+            self._log.append((context, name, dict.get(context, name, _MISSING)))
+            if value is _MISSING:
+                dict.pop(context, name, None)
+            else:
+                dict.__setitem__(context, name, value)
+
+        bindings = []
+        state = unrestricted_state
+        while state != self._unrestricted_state:
+            state, name, t = self._bindings[state]
+            bindings.append((name, t))
+        for name, t in reversed(bindings):
+            dict.__setitem__(self.unrestricted_context, name, t)
+        self._unrestricted_state = unrestricted_state
+
+    def type_check(self, term: Term) -> Type:
+        start = self._linear_state
+        key = (id(term), start, self._unrestricted_state)
+        entry = self._results.get(key)
+        if entry is not None:
+            self.hits += 1
+            _, t, effect, linear_state, unrestricted_state = entry
+            self._replay(effect, unrestricted_state)
+            self._linear_state = linear_state
+            return t
+
+        self.misses += 1
+        mark = len(self._log)
+        t = super().type_check(term)
+
+        # Keep only the linear entries whose value changed, in the log and in the effect.
+        first = {}
+        for write in self._log[mark:]:
+            first.setdefault((id(write[0]), write[1]), write)
+        context = self._linear_context
+        changed, effect = [], []
+        for written, name, previous in first.values():
+            if written is not context:
+                continue  # a linear context that `Promote` has since discarded
+            value = dict.get(context, name, _MISSING)
+            if value is not previous:
+                changed.append((context, name, previous))
+                effect.append((name, value))
+        del self._log[mark:]
+        self._log.extend(changed)
+
+        # The linear state depends only on where the sub-term started and what it changed.
+        effect = tuple(sorted(effect, key=lambda change: change[0]))
+        self._linear_state = start
+        if effect:
+            self._advance_linear(effect)
+        self._results[key] = (term, t, effect, self._linear_state, self._unrestricted_state)
+        return t
+
+
+def check_incremental(old_term: Term, new_term: Term, checker: IncrementalTypeChecker = None) -> Type:
+    """
+    Type-checks `new_term` as an edit of `old_term`.
+
+    Pass the same `checker` across successive edits to reuse its results;
+    without one, a fresh checker is used and both terms are checked in full.
+    """
+    if checker is None:
+        checker = IncrementalTypeChecker()
+    return checker.check_incremental(old_term, new_term)